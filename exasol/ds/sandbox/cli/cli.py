@@ -1,8 +1,44 @@
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
 import click
 import os
 
+from exasol.ds.sandbox.cli import commands
+
+
+class LazyGroup(click.Group):
+    """
+    Click group importing the module of a subcommand only when the
+    subcommand is resolved, e.g. for invoking it or for printing its help.
+
+    lazy_subcommands maps the name of each subcommand to a function
+    returning the click command, e.g. by importing its module. Importing
+    the module registers the command at the group.
+    """
+
+    def __init__(
+            self,
+            *args,
+            lazy_subcommands: Optional[Dict[str, Callable[[], click.Command]]] = None,
+            **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            self.add_command(self.lazy_subcommands[cmd_name](), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands={
+    name.replace("_", "-"): partial(commands.load_command, name)
+    for name in commands.command_names()
+})
 def cli():
     pass
 
@@ -1,12 +1,51 @@
-from .start_ec2 import start_ec2
-from .install_dependencies import install_dependencies
-from .reset_password import reset_password
-from .export_vm import export_vm
-from .create_vm import create_vm
-from .show_aws_assets import show_aws_assets
-from .start_release_build import start_release_build
-from .release_workflow import release  # noqa: F401
-from .make_ami_public import make_ami_public
-from .create_docker_image import create_docker_image
-from .setup_s3_bucket import setup_s3_bucket
-from .setup_waf import setup_waf
+"""
+The command modules are imported on first access, see
+exasol.ds.sandbox.cli.cli.LazyGroup.
+"""
+import importlib
+from typing import List
+
+# Maps the name of each click command to the module defining it. The name
+# of the CLI command is the name of the click command with dashes instead
+# of underscores.
+_COMMAND_MODULES = {
+    "start_ec2": "start_ec2",
+    "install_dependencies": "install_dependencies",
+    "reset_password": "reset_password",
+    "export_vm": "export_vm",
+    "create_vm": "create_vm",
+    "show_aws_assets": "show_aws_assets",
+    "start_release_build": "start_release_build",
+    "release": "release_workflow",
+    "make_ami_public": "make_ami_public",
+    "create_docker_image": "create_docker_image",
+    "setup_s3_bucket": "setup_s3_bucket",
+    "setup_waf": "setup_waf",
+    "lock_jupyter_venv": "lock_jupyter_venv",
+    "precompile_templates": "precompile_templates",
+}
+
+
+def command_names() -> List[str]:
+    return list(_COMMAND_MODULES)
+
+
+def load_command(name: str):
+    """
+    Import the module of the click command with the given name and return
+    the command.
+
+    Importing a module binds its name in this package, hence the name is
+    bound to the command afterwards, even if the module has been imported
+    already, e.g. by the first access to its command.
+    """
+    module = importlib.import_module(f".{_COMMAND_MODULES[name]}", __name__)
+    command = getattr(module, name)
+    globals()[name] = command
+    return command
+
+
+def __getattr__(name: str):
+    if name not in _COMMAND_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return load_command(name)
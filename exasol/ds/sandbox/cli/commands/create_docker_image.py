@@ -7,8 +7,6 @@ from exasol.ds.sandbox.cli.common import add_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
 from exasol.ds.sandbox.lib.dss_docker import (
     DEFAULT_ORG_AND_REPOSITORY,
-    DssDockerImage,
-    DockerRegistry,
     USER_ENV,
     PASSWORD_ENV,
 )
@@ -45,6 +43,21 @@ from exasol.ds.sandbox.lib.logging import set_log_level
         "--keep-container", type=bool, is_flag=True,
         help="""Keep the Docker Container running after creating the image.
         Otherwise stop and remove the container."""),
+    click.option(
+        "--layered", type=bool, is_flag=True,
+        help="""Commit intermediate images after expensive build stages
+        tagged with a hash of their inputs and resume from the newest
+        intermediate image still matching its inputs."""),
+    click.option(
+        "--wheel-cache", type=bool, is_flag=True,
+        help="""Install the Python packages of the Jupyter venv from
+        wheels cached on the build host, building missing wheels once.
+        The cache is not included in the image."""),
+    click.option(
+        "--bytecode-optimization-level", type=click.IntRange(0, 2),
+        multiple=True,
+        help="""Optimization level for precompiling the bytecode of the
+        Jupyter venv, can be specified multiple times [default: 0]."""),
 ])
 @add_options(logging_options)
 def create_docker_image(
@@ -53,6 +66,9 @@ def create_docker_image(
         publish: bool,
         registry_user: str,
         keep_container: bool,
+        layered: bool,
+        wheel_cache: bool,
+        bytecode_optimization_level: tuple[int, ...],
         log_level: str,
 ):
     """
@@ -62,6 +78,11 @@ def create_docker_image(
     registry using the specified user name and reading the password from
     environment variable ``PASSWORD_ENV``.
     """
+    from exasol.ds.sandbox.lib.dss_docker import (
+        DssDockerImage,
+        DockerRegistry,
+        Wheelhouse,
+    )
 
     def registry_password():
         if registry_user is None:
@@ -69,7 +90,10 @@ def create_docker_image(
         return os.environ.get(PASSWORD_ENV, None)
 
     set_log_level(log_level)
-    creator = DssDockerImage(repository, version, keep_container)
+    creator = DssDockerImage(repository, version, keep_container, layered)
     if publish:
         creator.registry = DockerRegistry(registry_user, registry_password())
+    if wheel_cache:
+        creator.wheelhouse = Wheelhouse()
+    creator.bytecode_optimization_levels = list(bytecode_optimization_level)
     creator.create()
@@ -24,6 +24,15 @@ from exasol.ds.sandbox.lib.config import default_config_object
               help="The new (temporary) default password.")
 @click.option('--make-ami-public/--no-make-ami-public', default=False,
               help="If true, the newly created AMI will be publicly available.")
+@click.option('--resume/--no-resume', default=False,
+              help="""Skip the stages completed by a previous run for the same asset id
+              whose outputs still exist in AWS, i.e. the AMI, the export image tasks,
+              and the renamed VM images. The EC2 instance is always set up again if
+              there is no AMI.""")
+@click.option('--base-ami-cache/--no-base-ami-cache', default=False,
+              help="""Launch the EC2 instance from a base AMI with the system packages, the
+              Jupyter venv and Docker already installed, creating the base AMI if there
+              is none for the current Ansible roles and requirements files.""")
 @add_options(vm_options)
 @add_options(id_options)
 def create_vm(
@@ -37,6 +46,8 @@ def create_vm(
     no_vm: bool,
     asset_id: str,
     make_ami_public: bool,
+    resume: bool,
+    base_ami_cache: bool,
     log_level: str,
 ):
     """
@@ -56,4 +67,6 @@ def create_vm(
         configuration=default_config_object,
         user_name=os.getenv("AWS_USER_NAME"),
         make_ami_public=make_ami_public,
+        resume=resume,
+        base_ami_cache=base_ami_cache,
     )
@@ -9,9 +9,7 @@ from exasol.ds.sandbox.cli.options.id_options import id_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
 from exasol.ds.sandbox.cli.options.vm_options import vm_options
 from exasol.ds.sandbox.lib.asset_id import AssetId
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.config import default_config_object
-from exasol.ds.sandbox.lib.export_vm.run_export_vm import run_export_vm
 from exasol.ds.sandbox.lib.logging import set_log_level
 
 
@@ -33,6 +31,9 @@ def export_vm(
     """
     Developer command creating a new VM image from a running EC2-Instance.
     """
+    from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+    from exasol.ds.sandbox.lib.export_vm.run_export_vm import run_export_vm
+
     current_vm_image_formats = tuple() if no_vm else vm_image_format
     set_log_level(log_level)
     run_export_vm(AwsAccess(aws_profile), stack_name, current_vm_image_formats,
@@ -1,4 +1,3 @@
-import exasol.ansible as ansible
 import exasol.ds.sandbox.lib.cli_api as cli_api
 from exasol.ds.sandbox.cli.cli import cli
 from exasol.ds.sandbox.cli.common import add_options
@@ -16,6 +15,8 @@ def install_dependencies(
     """
     Developer command installing dependencies via ansible onto an EC-2 instance.
     """
+    import exasol.ansible as ansible
+
     cli_api.set_log_level(log_level)
     cli_api.run_install_dependencies(
         default_config_object,
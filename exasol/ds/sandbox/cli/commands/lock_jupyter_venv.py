@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import click
+
+from exasol.ds.sandbox.cli.cli import cli
+from exasol.ds.sandbox.cli.common import add_options
+from exasol.ds.sandbox.cli.options.logging import logging_options
+from exasol.ds.sandbox.lib.config import AI_LAB_VERSION
+from exasol.ds.sandbox.lib.logging import set_log_level
+
+
+@cli.command()
+@add_options(logging_options)
+@click.option(
+    "--target-dir", type=click.Path(file_okay=False, path_type=Path),
+    help="""Directory to write the lock files to [defaults to the files
+    of Ansible role jupyter].""")
+def lock_jupyter_venv(target_dir: Path | None, log_level: str):
+    """
+    Developer command resolving the requirements of the Jupyter venv and
+    writing lock files with pinned versions and hashes. Ansible installs the
+    packages of the Jupyter venv from the lock files as long as the
+    requirements files are unchanged.
+
+    Uses uv if available, otherwise pip.
+    """
+    from exasol.ds.sandbox.lib.setup_ec2.jupyter_venv_lock import generate_lock_files
+
+    set_log_level(log_level)
+    generate_lock_files(AI_LAB_VERSION, target_dir)
@@ -4,8 +4,6 @@ from exasol.ds.sandbox.cli.options.aws_options import aws_options
 from exasol.ds.sandbox.cli.options.id_options import id_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
 from exasol.ds.sandbox.lib.asset_id import AssetId
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
-from exasol.ds.sandbox.lib.export_vm.run_make_ami_public import run_make_ami_public
 from exasol.ds.sandbox.lib.logging import set_log_level
 
 
@@ -20,5 +18,8 @@ def make_ami_public(
     """
     Developer command making an existing AMI public.
     """
+    from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+    from exasol.ds.sandbox.lib.export_vm.run_make_ami_public import run_make_ami_public
+
     set_log_level(log_level)
     run_make_ami_public(AwsAccess(aws_profile), AssetId(asset_id))
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import click
+
+from exasol.ds.sandbox.cli.cli import cli
+from exasol.ds.sandbox.cli.common import add_options
+from exasol.ds.sandbox.cli.options.logging import logging_options
+from exasol.ds.sandbox.lib.logging import set_log_level
+
+
+@cli.command()
+@add_options(logging_options)
+@click.option(
+    "--bytecode-cache-dir", type=click.Path(file_okay=False, path_type=Path),
+    envvar="AI_LAB_TEMPLATE_BYTECODE_CACHE", show_envvar=True,
+    help="""Directory to store the bytecode of the compiled templates in, to
+    be reused by later commands.""")
+def precompile_templates(bytecode_cache_dir: Path | None, log_level: str):
+    """
+    Developer command validating and compiling all Jinja2 templates of the
+    AI Lab, e.g. the CloudFormation templates, without accessing AWS.
+    """
+    from exasol.ds.sandbox.lib import render_template
+
+    set_log_level(log_level)
+    env = render_template.create_environment(bytecode_cache_dir)
+    names = render_template.precompile_templates(env)
+    click.echo(f"Compiled {len(names)} templates.")
@@ -1,8 +1,9 @@
 from exasol.ds.sandbox.cli.cli import cli
-from exasol.ds.sandbox.lib import release_workflow as release_workflow_lib
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.logging import set_log_level
 
+# The release workflow depends on GitPython and boto3, hence the commands
+# import it only when being invoked.
+
 
 @cli.group(name="release")
 def release() -> None:
@@ -11,12 +12,17 @@ def release() -> None:
 
 @release.command()
 def check() -> None:
+    from exasol.ds.sandbox.lib import release_workflow as release_workflow_lib
+
     context = release_workflow_lib.load_context()
     release_workflow_lib.run_check(context)
 
 
 @release.command()
 def build() -> None:
+    from exasol.ds.sandbox.lib import release_workflow as release_workflow_lib
+    from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+
     # Release builds are long-running; surface progress by default.
     set_log_level("info")
     context = release_workflow_lib.load_context()
@@ -25,12 +31,16 @@ def build() -> None:
 
 @release.command()
 def notes() -> None:
+    from exasol.ds.sandbox.lib import release_workflow as release_workflow_lib
+
     context = release_workflow_lib.load_context()
     release_workflow_lib.run_notes(context)
 
 
 @release.command()
 def publish() -> None:
+    from exasol.ds.sandbox.lib import release_workflow as release_workflow_lib
+
     context = release_workflow_lib.load_context()
     release_workflow_lib.run_publish(context)
 
@@ -1,6 +1,5 @@
 import click
 
-import exasol.ansible as ansible
 import exasol.ds.sandbox.lib.cli_api as cli_api
 from exasol.ds.sandbox.cli.cli import cli
 from exasol.ds.sandbox.cli.common import add_options
@@ -22,5 +21,7 @@ def reset_password(
     Developer command resetting the password on a remote EC-2-instance via
     Ansible.
     """
+    import exasol.ansible as ansible
+
     cli_api.set_log_level(log_level)
     cli_api.run_reset_password(default_password, (ansible.Host(host_name, ssh_private_key),))
@@ -3,14 +3,8 @@ from exasol.ds.sandbox.cli.cli import cli
 from exasol.ds.sandbox.cli.common import add_options
 from exasol.ds.sandbox.cli.options.aws_options import aws_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.config import default_config_object
 from exasol.ds.sandbox.lib.logging import set_log_level
-from exasol.ds.sandbox.lib.cloudformation_templates import (
-    VmBucketCfTemplate,
-    ExampleDataCfTemplate,
-    ExampleDataS3CfTemplate,
-)
 
 
 @cli.command()
@@ -29,6 +23,13 @@ def setup_s3_bucket(aws_profile: str, log_level: str, purpose: str):
     * vm: S3 bucket for virtual machine images\n
     * example-data-http: S3 bucket for Example-Data to be accessed via HTTP
     """
+    from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+    from exasol.ds.sandbox.lib.cloudformation_templates import (
+        VmBucketCfTemplate,
+        ExampleDataCfTemplate,
+        ExampleDataS3CfTemplate,
+    )
+
     set_log_level(log_level)
     aws = AwsAccess(aws_profile)
     config = default_config_object
@@ -4,13 +4,8 @@ from exasol.ds.sandbox.cli.cli import cli
 from exasol.ds.sandbox.cli.common import add_options
 from exasol.ds.sandbox.cli.options.aws_options import aws_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.config import default_config_object
 from exasol.ds.sandbox.lib.logging import set_log_level
-from exasol.ds.sandbox.lib.cloudformation_templates import (
-    VmBucketCfTemplate,
-    ExampleDataCfTemplate,
-)
 
 
 @cli.command()
@@ -32,6 +27,12 @@ def setup_waf(aws_profile: str, allowed_ip: str, log_level: str, purpose: str):
     * vm: WAF for S3 bucket for virtual machine images\n
     * example-data-http: WAF for S3 bucket for Example-Data
     """
+    from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+    from exasol.ds.sandbox.lib.cloudformation_templates import (
+        VmBucketCfTemplate,
+        ExampleDataCfTemplate,
+    )
+
     set_log_level(log_level)
     aws = AwsAccess(aws_profile)
     config = default_config_object
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Tuple, Optional
 
 import click
@@ -8,12 +9,14 @@ from exasol.ds.sandbox.cli.common import add_options
 from exasol.ds.sandbox.cli.options.aws_options import aws_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
 from exasol.ds.sandbox.lib.asset_id import AssetId
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
-from exasol.ds.sandbox.lib.asset_printing.print_assets import (
+from exasol.ds.sandbox.lib.asset_printing.asset_types import (
     aws_asset_type_names,
-    print_assets,
     AssetTypes,
 )
+from exasol.ds.sandbox.lib.config import (
+    default_config_object,
+    DEFAULT_INVENTORY_FILE,
+)
 from exasol.ds.sandbox.lib.logging import set_log_level
 
 
@@ -37,21 +40,42 @@ def optional_write_to(path: str):
               help="The asset types to print. Can be declared multiple times.")
 @click.option('--out-file', default=None, type=click.Path(exists=False, file_okay=True, dir_okay=False),
               help="If given, writes the AWS assets to this file in markdown format.")
+@click.option('--refresh', is_flag=True, default=False,
+              help="Retrieve all assets from AWS, ignoring the local asset inventory.")
+@click.option('--inventory-file', default=str(DEFAULT_INVENTORY_FILE),
+              type=click.Path(exists=False, file_okay=True, dir_okay=False), show_default=True,
+              help="SQLite file of the local asset inventory.")
 def show_aws_assets(
             aws_profile: str,
             asset_id: Optional[str],
             asset_type: Tuple[str, ...],
             out_file: Optional[str],
+            refresh: bool,
+            inventory_file: str,
             log_level: str):
     """
     Developer commands showing all AWS assets.
+
+    The assets are read from a local inventory, which is refreshed from AWS
+    after a TTL, while assets still changing their state are refreshed each
+    time.
     """
+    from exasol.ds.sandbox.lib.aws_access.asset_inventory import (
+        AssetInventory,
+        CachedAwsAccess,
+    )
+    from exasol.ds.sandbox.lib.asset_printing.print_assets import print_assets
+
     set_log_level(log_level)
     _asset_id = AssetId(asset_id) if asset_id is not None else None
     asset_types = tuple(AssetTypes.from_name(n) for n in asset_type)
     with optional_write_to(out_file) as handle:
         print_assets(
-            AwsAccess(aws_profile=aws_profile),
+            CachedAwsAccess(
+                aws_profile=aws_profile,
+                inventory=AssetInventory(Path(inventory_file), default_config_object.asset_inventory_ttl),
+                refresh=refresh,
+            ),
             asset_id=_asset_id,
             out_file_obj=handle,
             asset_types=asset_types,
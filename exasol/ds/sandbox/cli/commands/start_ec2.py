@@ -12,7 +12,6 @@ from exasol.ds.sandbox.cli.options.id_options import id_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
 from exasol.ds.sandbox.lib.asset_id import AssetId
 from exasol.ds.sandbox.lib.config import default_config_object
-from exasol.ds.sandbox.lib.setup_ec2.ansible_execution import AnsibleDependencyInstaller
 
 
 @cli.command()
@@ -39,6 +38,8 @@ def start_ec2(
     Developer command starting an EC-2 instance, optionally installing
     dependencies via ansible.
     """
+    from exasol.ds.sandbox.lib.setup_ec2.ansible_execution import AnsibleDependencyInstaller
+
     cli_api.set_log_level(log_level)
     dependency_installer = (
         AnsibleDependencyInstaller()
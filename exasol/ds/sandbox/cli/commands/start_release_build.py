@@ -3,11 +3,10 @@ import click
 from exasol.ds.sandbox.cli.cli import cli
 from exasol.ds.sandbox.cli.common import add_options
 from exasol.ds.sandbox.cli.options.logging import logging_options
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.config import default_config_object
 from exasol.ds.sandbox.lib.dss_docker import DEFAULT_ORG_AND_REPOSITORY
 from exasol.ds.sandbox.lib.logging import set_log_level
-from exasol.ds.sandbox.lib.release_build.run_release_build import run_start_release_build
+from exasol.ds.sandbox.lib.release_build.task_graph import FailurePolicy
 
 
 @cli.command()
@@ -30,15 +29,36 @@ from exasol.ds.sandbox.lib.release_build.run_release_build import run_start_rele
     default=None,
     help="Optional asset identifier used for the release images.",
 )
+@click.option(
+    "--failure-policy",
+    type=click.Choice([p.value for p in FailurePolicy]),
+    default=FailurePolicy.FAIL_FAST.value,
+    show_default=True,
+    help="""Whether to stop the other of the concurrent VM and Docker builds
+    before its next stage when the first one fails, or to let the other
+    build complete.""",
+)
+@click.option(
+    "--resume/--no-resume",
+    default=False,
+    help="""Skip the stages of the VM build completed by a previous run for
+    the same asset id whose outputs still exist in AWS, i.e. the AMI, the
+    export image tasks, and the renamed VM images.""",
+)
 def start_release_build(
         log_level: str,
         publish: bool,
         repository: str,
-        asset_id: str | None = None):
+        asset_id: str | None = None,
+        failure_policy: str = FailurePolicy.FAIL_FAST.value,
+        resume: bool = False):
     """
     Release command building the AI Lab release artifacts in the current
     environment.
     """
+    from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+    from exasol.ds.sandbox.lib.release_build.run_release_build import run_start_release_build
+
     set_log_level(log_level)
     run_start_release_build(
         default_config_object,
@@ -46,4 +66,6 @@ def start_release_build(
         publish=publish,
         repository=repository,
         asset_id=asset_id,
+        failure_policy=FailurePolicy(failure_policy),
+        resume=resume,
     )
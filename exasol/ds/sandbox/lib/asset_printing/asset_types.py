@@ -0,0 +1,27 @@
+from enum import Enum
+from typing import Tuple
+
+
+class AssetTypeNotFound(RuntimeError):
+    pass
+
+
+class AssetTypes(Enum):
+    DOCKER = "docker"
+    AMI = "ami"
+    SNAPSHOT = "snapshot"
+    EXPORT_IMAGE_TASK = "export-image-task"
+    VM_S3 = "s3-object"
+    CLOUDFORMATION = "cloudformation"
+    EC2_KEY_PAIR = "ec2-key-pair"
+
+    @staticmethod
+    def from_name(name: str):
+        try:
+            return next(a for a in AssetTypes if a.value == name)
+        except StopIteration:
+            raise AssetTypeNotFound(f'No asset type with name "{name}"')
+
+
+def aws_asset_type_names() -> Tuple[str, ...]:
+    return tuple(a.value for a in AssetTypes if a != AssetTypes.DOCKER)
@@ -2,12 +2,14 @@ import fnmatch
 import humanfriendly
 import urllib.parse
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
 from inspect import cleandoc
 from typing import Dict, List, Optional, TextIO, Tuple
 
 from exasol.ds.sandbox.lib.asset_id import AssetId
+from exasol.ds.sandbox.lib.asset_printing.asset_types import AssetTypes
 from exasol.ds.sandbox.lib.asset_printing.mark_down_printer import MarkdownPrintingFactory
 from exasol.ds.sandbox.lib.asset_printing.printing_factory import (
     PrintingFactory,
@@ -18,37 +20,20 @@ from exasol.ds.sandbox.lib.asset_printing.printing_factory import (
 )
 from exasol.ds.sandbox.lib.asset_printing.rich_console_printer import RichConsolePrintingFactory
 from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
-from enum import Enum
 
+from exasol.ds.sandbox.lib.aws_access.ami import Ami
 from exasol.ds.sandbox.lib.aws_access.cloudformation_stack import CloudformationStack
+from exasol.ds.sandbox.lib.aws_access.export_image_task import ExportImageTask
+from exasol.ds.sandbox.lib.aws_access.key_pair import KeyPair
+from exasol.ds.sandbox.lib.aws_access.s3_object import S3Object
+from exasol.ds.sandbox.lib.aws_access.snapshot import Snapshot
+from exasol.ds.sandbox.lib.aws_access.stack_resource import StackResource
 from exasol.ds.sandbox.lib.tags import DEFAULT_TAG_KEY
 from exasol.ds.sandbox.lib.cloudformation_templates import VmBucketCfTemplate
 from exasol.ds.sandbox.lib.dss_docker import DEFAULT_ORG_AND_REPOSITORY
 
 
-class AssetTypeNotFound(RuntimeError):
-    pass
-
-
-class AssetTypes(Enum):
-    DOCKER = "docker"
-    AMI = "ami"
-    SNAPSHOT = "snapshot"
-    EXPORT_IMAGE_TASK = "export-image-task"
-    VM_S3 = "s3-object"
-    CLOUDFORMATION = "cloudformation"
-    EC2_KEY_PAIR = "ec2-key-pair"
-
-    @staticmethod
-    def from_name(name: str):
-        try:
-            return next(a for a in AssetTypes if a.value == name)
-        except StopIteration:
-            raise AssetTypeNotFound(f'No asset type with name "{name}"')
-
-
-def aws_asset_type_names() -> Tuple[str, ...]:
-    return tuple(a.value for a in AssetTypes if a != AssetTypes.DOCKER)
+DEFAULT_MAX_CONCURRENCY = 10
 
 
 def find_default_tag_value_in_tags(tags: Optional[List[Dict[str,str]]]):
@@ -60,7 +45,15 @@ def find_default_tag_value_in_tags(tags: Optional[List[Dict[str,str]]]):
     return return_value
 
 
+def fetch_amis(aws_access: AwsAccess, filter_value: str) -> List[Ami]:
+    return list(aws_access.list_amis(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}]))
+
+
 def print_amis(aws_access: AwsAccess, filter_value: str, printing_factory: PrintingFactory):
+    render_amis(fetch_amis(aws_access, filter_value), filter_value, printing_factory)
+
+
+def render_amis(amis: List[Ami], filter_value: str, printing_factory: PrintingFactory):
     table_printer = printing_factory.create_table_printer(title=f"AMI Images (Filter={filter_value})")
 
     table_printer.add_column("Image ID", style="blue", no_wrap=True)
@@ -72,7 +65,6 @@ def print_amis(aws_access: AwsAccess, filter_value: str, printing_factory: Print
     table_printer.add_column("State", no_wrap=True)
     table_printer.add_column("Asset-Tag-Value", no_wrap=True)
 
-    amis = aws_access.list_amis(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}])
     for ami in amis:
         is_public = "yes" if ami.is_public else "no"
         table_printer.add_row(ami.id, ami.name, ami.description, is_public,
@@ -88,7 +80,15 @@ def print_amis(aws_access: AwsAccess, filter_value: str, printing_factory: Print
     text_print.print(tuple())
 
 
+def fetch_snapshots(aws_access: AwsAccess, filter_value: str) -> List[Snapshot]:
+    return list(aws_access.list_snapshots(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}]))
+
+
 def print_snapshots(aws_access: AwsAccess, filter_value: str, printing_factory: PrintingFactory):
+    render_snapshots(fetch_snapshots(aws_access, filter_value), filter_value, printing_factory)
+
+
+def render_snapshots(snapshots: List[Snapshot], filter_value: str, printing_factory: PrintingFactory):
     table_printer = printing_factory.create_table_printer(title=f"EC-2 Snapshots (Filter={filter_value})")
 
     table_printer.add_column("SnapshotId", style="blue", no_wrap=True)
@@ -99,7 +99,6 @@ def print_snapshots(aws_access: AwsAccess, filter_value: str, printing_factory:
     table_printer.add_column("State", no_wrap=True)
     table_printer.add_column("Asset-Tag-Value", no_wrap=True)
 
-    snapshots = aws_access.list_snapshots(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}])
     for snapshot in snapshots:
         table_printer.add_row(snapshot.id, snapshot.description, snapshot.progress,
                               snapshot.volume_id, snapshot.start_time.strftime("%Y-%m-%d, %H:%M"),
@@ -115,7 +114,16 @@ def print_snapshots(aws_access: AwsAccess, filter_value: str, printing_factory:
     text_print.print(tuple())
 
 
+def fetch_export_image_tasks(aws_access: AwsAccess, filter_value: str) -> List[ExportImageTask]:
+    return list(aws_access.list_export_image_tasks(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}]))
+
+
 def print_export_image_tasks(aws_access: AwsAccess, filter_value: str, printing_factory: PrintingFactory):
+    render_export_image_tasks(fetch_export_image_tasks(aws_access, filter_value), filter_value, printing_factory)
+
+
+def render_export_image_tasks(export_image_tasks: List[ExportImageTask], filter_value: str,
+                              printing_factory: PrintingFactory):
     table_printer = printing_factory.create_table_printer(title=f"Export Image Tasks (Filter={filter_value})")
 
     table_printer.add_column("ExportImageTaskId", style="blue", no_wrap=True)
@@ -127,9 +135,6 @@ def print_export_image_tasks(aws_access: AwsAccess, filter_value: str, printing_
     table_printer.add_column("StatusMessage", no_wrap=True)
     table_printer.add_column("Asset-Tag-Value", no_wrap=True)
 
-    export_image_tasks = \
-        aws_access.list_export_image_tasks(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}])
-
     for export_image_task in export_image_tasks:
         s3bucket = export_image_task.s3_bucket
         s3prefix = export_image_task.s3_prefix
@@ -147,45 +152,69 @@ def print_export_image_tasks(aws_access: AwsAccess, filter_value: str, printing_
     text_print.print(tuple())
 
 
-def print_s3_objects(aws_access: AwsAccess, asset_id: Optional[AssetId], printing_factory: PrintingFactory):
+@dataclass(frozen=True)
+class S3Objects:
+    prefix: str
+    url: str
+    objects: List[S3Object]
+
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Returns the part of the fnmatch pattern before the first wildcard.
+    """
+    positions = [pattern.find(c) for c in "*?[" if c in pattern]
+    return pattern[:min(positions)] if positions else pattern
+
+
+def fetch_s3_objects(aws_access: AwsAccess, asset_id: Optional[AssetId]) -> S3Objects:
     vm_s3_bucket = VmBucketCfTemplate(aws_access)
     if asset_id is not None:
         prefix = asset_id.bucket_prefix
     else:
         prefix = ""
 
-    table_printer = printing_factory.create_table_printer(title=f"VM Images, Prefix={prefix})")
+    # How the filtering works:
+    # 1. The VM are stored under following location in the S3 Bucket: $BUCKET_PREFIX/$AssetId/name.$VM_FORMAT
+    #    For example "ai_lab/6.0.0/export-ami-01be860e6a6a98bf8.vhd"
+    # 2. If no filter is given (asset_id == None), "prefix" will be empty, and we return all s3 objects
+    #    with the standard prefix (e.g. "ai_lab").
+    # 3. Otherwise, we need to ensure that the prefix ends with a wildcard, so that the matching works correctly.
+    #    => Assume that a filter is given  "6.0.0". Variable prefix would be "ai_lab/6.0.0" and pattern "ai_lab/6.0.0*".
+    # 4. S3 does not support wildcards. So we pass the literal part of the pattern before the first wildcard as
+    #    prefix to S3 (e.g. "ai_lab/6.0.0" or "ai_lab/6." for pattern "ai_lab/6.*"), and match the returned objects
+    #    against the pattern. This way S3 only returns the objects of the matching releases.
+    #    A delimiter does not help for further restricting the listing, because "*" also matches "/".
+
+    if len(prefix) == 0:
+        s3_objects = list(aws_access.list_s3_objects(bucket=vm_s3_bucket.id, prefix=AssetId.BUCKET_PREFIX))
+    else:
+        pattern = prefix if prefix[-1] == "*" else f"{prefix}*"
+        s3_objects = [
+            o for o in aws_access.list_s3_objects(bucket=vm_s3_bucket.id, prefix=literal_prefix(pattern))
+            if fnmatch.fnmatch(o.key, pattern)
+        ]
+    return S3Objects(prefix=prefix, url=vm_s3_bucket.url, objects=s3_objects)
+
+
+def print_s3_objects(aws_access: AwsAccess, asset_id: Optional[AssetId], printing_factory: PrintingFactory):
+    render_s3_objects(fetch_s3_objects(aws_access, asset_id), asset_id, printing_factory)
+
+
+def render_s3_objects(s3_objects: S3Objects, asset_id: Optional[AssetId], printing_factory: PrintingFactory):
+    table_printer = printing_factory.create_table_printer(title=f"VM Images, Prefix={s3_objects.prefix})")
 
     table_printer.add_column("Key", no_wrap=True)
     table_printer.add_column("Size", no_wrap=True)
     table_printer.add_column("URL", no_wrap=False)
 
-    # How the filtering works:
-    # 1. The VM are stored under following location in the S3 Bucket: $BUCKET_PREFIX/$AssetId/name.$VM_FORMAT
-    #    For example "ai_lab/6.0.0/export-ami-01be860e6a6a98bf8.vhd"
-    # 2. Because S3 list_s3_object does not support wildcards,
-    #    we need to implement our own wildcard implementation here.
-    #    We call list_s3_object with the standard prefix (e.g. "ai_lab"),
-    #    which returns ALL stored vm objects.
-    # 3. If no filter is given (asset_id == None), "prefix" will be empty, and we return all s3 objects
-    # 4. If the variable "prefix" is not empty, we need to ensure that it ends with a wildcard, so that the matching
-    #    works correctly.
-    # => Assume that a filter is given  "6.0.0". Variable prefix would be "ai_lab/6.0.0".
-
-    s3_objects = aws_access.list_s3_objects(bucket=vm_s3_bucket.id, prefix=AssetId.BUCKET_PREFIX)
-
-    if s3_objects is not None and len(prefix) > 0:
-        if prefix[-1] != "*":
-            prefix = f"{prefix}*"
-        s3_objects = [o for o in s3_objects if fnmatch.fnmatch(o.key, prefix)]
-    url_template = f"https://{vm_s3_bucket.url}/{{object}}"
-
-    if s3_objects is not None:
-        for s3_object in s3_objects:
-            obj_size = humanfriendly.format_size(s3_object.size)
-            key = s3_object.key
-            https_url = url_template.format(object=urllib.parse.quote(key))
-            table_printer.add_row(key, obj_size, https_url)
+    url_template = f"https://{s3_objects.url}/{{object}}"
+
+    for s3_object in s3_objects.objects:
+        obj_size = humanfriendly.format_size(s3_object.size)
+        key = s3_object.key
+        https_url = url_template.format(object=urllib.parse.quote(key))
+        table_printer.add_row(key, obj_size, https_url)
 
     table_printer.finish()
 
@@ -203,7 +232,40 @@ def cloudformation_stack_has_matching_tag(cloudformation_stack: CloudformationSt
     return False
 
 
+def fetch_cloudformation_stacks(
+        aws_access: AwsAccess,
+        filter_value: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> List[Tuple[CloudformationStack, List[StackResource]]]:
+    """
+    Returns the matching cloudformation stacks, each together with its stack resources.
+    The stack resources of all stacks are fetched in parallel.
+    """
+    cloudformation_stack = aws_access.describe_stacks()
+
+    relevant_stacks = [stack for stack in
+                       cloudformation_stack if cloudformation_stack_has_matching_tag(stack, filter_value)]
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        stack_resources = executor.map(
+            lambda stack: aws_access.get_all_stack_resources(stack_name=stack.name),
+            relevant_stacks,
+        )
+        return list(zip(relevant_stacks, stack_resources))
+
+
 def print_cloudformation_stacks(aws_access: AwsAccess, filter_value: str, printing_factory: PrintingFactory):
+    render_cloudformation_stacks(
+        fetch_cloudformation_stacks(aws_access, filter_value),
+        filter_value,
+        printing_factory,
+    )
+
+
+def render_cloudformation_stacks(
+        stacks: List[Tuple[CloudformationStack, List[StackResource]]],
+        filter_value: str,
+        printing_factory: PrintingFactory,
+):
     table_printer = printing_factory.create_table_printer(title=f"Cloudformation stacks (Filter={filter_value})")
 
     table_printer.add_column("Stack-Name", style="blue", no_wrap=True)
@@ -214,16 +276,11 @@ def print_cloudformation_stacks(aws_access: AwsAccess, filter_value: str, printi
     table_printer.add_column("ResourceType", no_wrap=True)
     table_printer.add_column("Asset-Tag-Value", no_wrap=True)
 
-    cloudformation_stack = aws_access.describe_stacks()
-
-    relevant_stacks = [stack for stack in
-                       cloudformation_stack if cloudformation_stack_has_matching_tag(stack, filter_value)]
-    for stack in relevant_stacks:
+    for stack, stack_resources in stacks:
         table_printer.add_row(stack.name,
                               stack.description, stack.status,
                               stack.creation_time.strftime("%Y-%m-%d, %H:%M"), "", "",
                               find_default_tag_value_in_tags(stack.tags))
-        stack_resources = aws_access.get_all_stack_resources(stack_name=stack.name)
         for stack_resource in stack_resources:
             table_printer.add_row("", "", "", "", stack_resource.physical_id,
                                   stack_resource.resource_type, "n/a")
@@ -237,7 +294,15 @@ def print_cloudformation_stacks(aws_access: AwsAccess, filter_value: str, printi
     text_print.print(tuple())
 
 
+def fetch_ec2_keys(aws_access: AwsAccess, filter_value: str) -> List[KeyPair]:
+    return list(aws_access.list_ec2_key_pairs(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}]))
+
+
 def print_ec2_keys(aws_access: AwsAccess, filter_value: str, printing_factory: PrintingFactory):
+    render_ec2_keys(fetch_ec2_keys(aws_access, filter_value), filter_value, printing_factory)
+
+
+def render_ec2_keys(key_pairs: List[KeyPair], filter_value: str, printing_factory: PrintingFactory):
     table_printer = printing_factory.create_table_printer(title=f"EC-2 Keys (Filter={filter_value})")
 
     table_printer.add_column("KeyPairId", style="blue", no_wrap=True)
@@ -245,7 +310,6 @@ def print_ec2_keys(aws_access: AwsAccess, filter_value: str, printing_factory: P
     table_printer.add_column("CreateTime", style="magenta", no_wrap=True)
     table_printer.add_column("Asset-Tag-Value", no_wrap=True)
 
-    key_pairs = aws_access.list_ec2_key_pairs(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [filter_value]}])
     for key_pair in key_pairs:
         table_printer.add_row(key_pair.id, key_pair.key_name,
                               key_pair.created_time.strftime("%Y-%m-%d, %H:%M"),
@@ -267,15 +331,35 @@ def print_with_printer(
         asset_types: Tuple[AssetTypes],
         filter_value: str,
         printing_factory: PrintingFactory,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
 ):
-    print_function = {
-        AssetTypes.DOCKER: print_docker_images,
-        AssetTypes.AMI: print_amis,
-        AssetTypes.SNAPSHOT: print_snapshots,
-        AssetTypes.EXPORT_IMAGE_TASK: print_export_image_tasks,
-        AssetTypes.VM_S3: print_s3_objects,
-        AssetTypes.CLOUDFORMATION: print_cloudformation_stacks,
-        AssetTypes.EC2_KEY_PAIR: print_ec2_keys,
+    """
+    Fetches all selected asset types from AWS in parallel, using at most
+    max_concurrency threads, and then prints them in the order of enum
+    AssetTypes.
+
+    Each fetch function returns a list with all pages of its asset type, as
+    the asset types are fetched in the background while the previous ones
+    are printed. The tables are printed only when complete anyway.
+    """
+    fetch_function = {
+        AssetTypes.DOCKER: lambda aws_access, asset_id: None,
+        AssetTypes.AMI: fetch_amis,
+        AssetTypes.SNAPSHOT: fetch_snapshots,
+        AssetTypes.EXPORT_IMAGE_TASK: fetch_export_image_tasks,
+        AssetTypes.VM_S3: fetch_s3_objects,
+        AssetTypes.CLOUDFORMATION: lambda aws_access, filter_value: \
+            fetch_cloudformation_stacks(aws_access, filter_value, max_concurrency),
+        AssetTypes.EC2_KEY_PAIR: fetch_ec2_keys,
+    }
+    render_function = {
+        AssetTypes.DOCKER: render_docker_images,
+        AssetTypes.AMI: render_amis,
+        AssetTypes.SNAPSHOT: render_snapshots,
+        AssetTypes.EXPORT_IMAGE_TASK: render_export_image_tasks,
+        AssetTypes.VM_S3: render_s3_objects,
+        AssetTypes.CLOUDFORMATION: render_cloudformation_stacks,
+        AssetTypes.EC2_KEY_PAIR: render_ec2_keys,
     }
 
     def second_arg(asset_type: AssetTypes):
@@ -283,16 +367,25 @@ def print_with_printer(
             return asset_id
         return filter_value
 
-    selected = (a for a in AssetTypes if a in asset_types)
-    for asset_type in selected:
-        print_function[asset_type](
-            aws_access,
-            second_arg(asset_type),
-            printing_factory,
-        )
+    selected = [a for a in AssetTypes if a in asset_types]
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        fetched = {
+            asset_type: executor.submit(fetch_function[asset_type], aws_access, second_arg(asset_type))
+            for asset_type in selected
+        }
+        for asset_type in selected:
+            render_function[asset_type](
+                fetched[asset_type].result(),
+                second_arg(asset_type),
+                printing_factory,
+            )
 
 
 def print_docker_images(aws_access: AwsAccess, asset_id: str, printing_factory: PrintingFactory):
+    render_docker_images(None, asset_id, printing_factory)
+
+
+def render_docker_images(_: None, asset_id: str, printing_factory: PrintingFactory):
     printer = printing_factory.create_text_printer()
     printer.print((
         TitleTextObject("Docker Images"),
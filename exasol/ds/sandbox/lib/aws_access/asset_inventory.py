@@ -0,0 +1,470 @@
+import fnmatch
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from exasol.ds.sandbox.lib.aws_access.ami import Ami
+from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+from exasol.ds.sandbox.lib.aws_access.cloudformation_stack import CloudformationStack
+from exasol.ds.sandbox.lib.aws_access.export_image_task import ExportImageTask
+from exasol.ds.sandbox.lib.aws_access.key_pair import KeyPair
+from exasol.ds.sandbox.lib.aws_access.s3_object import S3Object
+from exasol.ds.sandbox.lib.aws_access.snapshot import Snapshot
+from exasol.ds.sandbox.lib.aws_access.stack_resource import StackResource
+from exasol.ds.sandbox.lib.config import DEFAULT_INVENTORY_FILE
+from exasol.ds.sandbox.lib.logging import get_status_logger, LogType
+from exasol.ds.sandbox.lib.tags import DEFAULT_TAG_KEY
+
+LOG = get_status_logger(LogType.AWS_ACCESS)
+
+AMI = "ami"
+SNAPSHOT = "snapshot"
+EXPORT_IMAGE_TASK = "export-image-task"
+S3_OBJECT = "s3-object"
+CLOUDFORMATION = "cloudformation"
+STACK_RESOURCE = "stack-resource"
+EC2_KEY_PAIR = "ec2-key-pair"
+
+# Incremented whenever the tables change, as the inventory is only a cache
+# and hence the tables of an older version are simply dropped.
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    asset_id TEXT NOT NULL,
+    tag_value TEXT,
+    volatile INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account, region, asset_type, scope, asset_id)
+);
+CREATE TABLE IF NOT EXISTS refreshes (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    PRIMARY KEY (account, region, asset_type, scope)
+);
+"""
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(value: Dict[str, Any]) -> Any:
+    if value.keys() == {"$datetime"}:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+@dataclass(frozen=True)
+class InventoryPartition:
+    """
+    The AWS account and region the assets in the inventory belong to, as
+    the same inventory file is used for all AWS profiles.
+    """
+    account: str = ""
+    region: str = ""
+
+
+@dataclass(frozen=True)
+class InventoryEntry:
+    """
+    A single asset in the inventory.
+
+    asset_id: the id of the asset within its scope, e.g. the ImageId of an AMI.
+    tag_value: the value of tag DEFAULT_TAG_KEY, None if the asset is not tagged.
+    volatile: True if the state of the asset can still change, e.g. a pending AMI.
+    data: the object as returned by boto3.
+    """
+    asset_id: str
+    tag_value: Optional[str]
+    volatile: bool
+    data: Dict[str, Any]
+
+
+class AssetInventory:
+    """
+    On-disk index of AWS assets stored in an SQLite database.
+
+    The assets are grouped by partition, i.e. AWS account and region, asset
+    type and scope, e.g. the S3 objects with a specific prefix in a specific
+    bucket. Each group remembers when it was retrieved from AWS completely,
+    in order to invalidate it after ttl seconds.
+    """
+
+    def __init__(
+            self,
+            path: Path = DEFAULT_INVENTORY_FILE,
+            ttl: float = 600.0,
+            clock: Callable[[], float] = time.time,
+    ):
+        self._path = path
+        self._ttl = ttl
+        self._clock = clock
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                connection.executescript(
+                    "DROP TABLE IF EXISTS assets; DROP TABLE IF EXISTS refreshes;")
+            connection.executescript(_SCHEMA)
+            connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # A separate connection per operation, as sqlite3 connections must
+        # not be shared between threads.
+        with closing(sqlite3.connect(self._path, timeout=30)) as connection:
+            with connection:
+                yield connection
+
+    def is_fresh(self, asset_type: str, scope: str = "",
+                 partition: InventoryPartition = InventoryPartition()) -> bool:
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT refreshed_at FROM refreshes WHERE account = ? AND region = ?"
+                " AND asset_type = ? AND scope = ?",
+                (partition.account, partition.region, asset_type, scope),
+            ).fetchone()
+        return row is not None and self._clock() - row[0] < self._ttl
+
+    def entries(self, asset_type: str, scope: str = "",
+                partition: InventoryPartition = InventoryPartition()) -> List[InventoryEntry]:
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT asset_id, tag_value, volatile, data FROM assets"
+                " WHERE account = ? AND region = ? AND asset_type = ? AND scope = ?"
+                " ORDER BY rowid",
+                (partition.account, partition.region, asset_type, scope),
+            ).fetchall()
+        return [
+            InventoryEntry(asset_id, tag_value, bool(volatile), json.loads(data, object_hook=_decode))
+            for asset_id, tag_value, volatile, data in rows
+        ]
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, partition: InventoryPartition,
+                asset_type: str, scope: str, entries: Iterable[InventoryEntry]) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (partition.account, partition.region, asset_type, scope,
+                 e.asset_id, e.tag_value, int(e.volatile), json.dumps(e.data, default=_encode))
+                for e in entries
+            ),
+        )
+
+    def replace(self, asset_type: str, scope: str, entries: Iterable[InventoryEntry],
+                partition: InventoryPartition = InventoryPartition()) -> None:
+        """
+        Replaces all assets of the given type and scope after retrieving them
+        completely from AWS.
+        """
+        entries = list(entries)
+        with self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM assets WHERE account = ? AND region = ?"
+                " AND asset_type = ? AND scope = ?",
+                (partition.account, partition.region, asset_type, scope),
+            )
+            self._insert(connection, partition, asset_type, scope, entries)
+            connection.execute(
+                "INSERT OR REPLACE INTO refreshes VALUES (?, ?, ?, ?, ?)",
+                (partition.account, partition.region, asset_type, scope, self._clock()),
+            )
+
+    def update(self, asset_type: str, scope: str, asset_ids: Iterable[str],
+               entries: Iterable[InventoryEntry],
+               partition: InventoryPartition = InventoryPartition()) -> None:
+        """
+        Replaces only the assets with the given ids, e.g. after describing
+        the volatile assets again. Assets not contained in entries anymore
+        are removed. The time of the last complete refresh is kept.
+        """
+        entries = list(entries)
+        with self._transaction() as connection:
+            connection.executemany(
+                "DELETE FROM assets WHERE account = ? AND region = ?"
+                " AND asset_type = ? AND scope = ? AND asset_id = ?",
+                (
+                    (partition.account, partition.region, asset_type, scope, asset_id)
+                    for asset_id in asset_ids
+                ),
+            )
+            self._insert(connection, partition, asset_type, scope, entries)
+
+    def invalidate(self, asset_type: Optional[str] = None,
+                   partition: Optional[InventoryPartition] = None) -> None:
+        """
+        Forces a complete refresh of the given asset type, or of all asset
+        types if asset_type is None, in the given partition, or in all
+        partitions if partition is None.
+        """
+        conditions, parameters = [], []
+        if partition is not None:
+            conditions.append("account = ? AND region = ?")
+            parameters += [partition.account, partition.region]
+        if asset_type is not None:
+            conditions.append("asset_type = ?")
+            parameters.append(asset_type)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._transaction() as connection:
+            connection.execute(f"DELETE FROM refreshes{where}", parameters)
+
+
+def _tag_value(aws_object: Dict[str, Any]) -> Optional[str]:
+    return next(
+        (tag["Value"] for tag in aws_object.get("Tags") or [] if tag["Key"] == DEFAULT_TAG_KEY),
+        None,
+    )
+
+
+def _tag_filter_value(filters: list) -> Optional[str]:
+    """
+    Returns the value of the filter if filters consist only of a filter
+    for tag DEFAULT_TAG_KEY, otherwise None.
+    """
+    if len(filters) != 1:
+        return None
+    name, values = filters[0].get("Name"), filters[0].get("Values", [])
+    if name != f"tag:{DEFAULT_TAG_KEY}" or len(values) != 1:
+        return None
+    return values[0]
+
+
+class CachedAwsAccess(AwsAccess):
+    """
+    AwsAccess reading the AWS assets listed by command show-aws-assets from
+    an AssetInventory.
+
+    The inventory always contains all assets tagged with DEFAULT_TAG_KEY,
+    listings filtering by this tag are answered from the inventory using the
+    same wildcard matching as AWS. All other filters are passed to AWS.
+
+    The assets are stored separately for each AWS account and region, as
+    identified by the caller identity and the region of the AWS profile.
+
+    If an asset type was not refreshed completely within the TTL of the
+    inventory, or if parameter refresh is True, then all assets of this
+    type are retrieved again. Otherwise, only the assets which can still
+    change their state, e.g. pending AMIs or active export image tasks, are
+    described again.
+    """
+
+    def __init__(
+            self,
+            aws_profile: Optional[str],
+            inventory: AssetInventory,
+            refresh: bool = False,
+            **kwargs,
+    ):
+        super().__init__(aws_profile, **kwargs)
+        self._inventory = inventory
+        self._refresh = refresh
+        self._refreshed = set()
+        self._partition: Optional[InventoryPartition] = None
+        self._lock = threading.Lock()
+
+    def instantiate_for_region(self, region: str) -> "CachedAwsAccess":
+        return self.__class__(
+            aws_profile=self._aws_profile,
+            inventory=self._inventory,
+            refresh=self._refresh,
+            region=region,
+            client_cache=self._client_cache,
+        )
+
+    @property
+    def partition(self) -> InventoryPartition:
+        with self._lock:
+            if self._partition is None:
+                account = self._get_aws_client("sts").get_caller_identity()["Account"]
+                region = self._get_aws_client("ec2").meta.region_name
+                self._partition = InventoryPartition(account, region)
+            return self._partition
+
+    def _needs_full_refresh(self, asset_type: str, scope: str) -> bool:
+        with self._lock:
+            if self._refresh and (asset_type, scope) not in self._refreshed:
+                self._refreshed.add((asset_type, scope))
+                return True
+        return not self._inventory.is_fresh(asset_type, scope, self.partition)
+
+    def _entries(
+            self,
+            asset_type: str,
+            entry: Callable[[Dict[str, Any]], InventoryEntry],
+            fetch_all: Callable[[], Iterable[Dict[str, Any]]],
+            fetch_by_ids: Optional[Callable[[List[str]], Iterable[Dict[str, Any]]]] = None,
+            scope: str = "",
+    ) -> List[InventoryEntry]:
+        """
+        :param fetch_by_ids: Describes the assets with the given ids again.
+               If None, then all assets are retrieved again if any of the
+               assets is volatile.
+        """
+        partition = self.partition
+        if self._needs_full_refresh(asset_type, scope):
+            LOG.debug(f"Retrieving all assets of type {asset_type} {scope}".rstrip())
+            self._inventory.replace(asset_type, scope, (entry(o) for o in fetch_all()), partition)
+            return self._inventory.entries(asset_type, scope, partition)
+        entries = self._inventory.entries(asset_type, scope, partition)
+        volatile = [e.asset_id for e in entries if e.volatile]
+        if not volatile:
+            return entries
+        LOG.debug(f"Refreshing {len(volatile)} volatile assets of type {asset_type} {scope}".rstrip())
+        if fetch_by_ids is None:
+            self._inventory.replace(asset_type, scope, (entry(o) for o in fetch_all()), partition)
+        else:
+            self._inventory.update(
+                asset_type, scope, volatile, (entry(o) for o in fetch_by_ids(volatile)), partition)
+        return self._inventory.entries(asset_type, scope, partition)
+
+    @staticmethod
+    def _matching(entries: List[InventoryEntry], filter_value: str,
+                  max_results: Optional[int]) -> Iterator[Dict[str, Any]]:
+        matching = (
+            e.data for e in entries
+            if e.tag_value is not None and fnmatch.fnmatchcase(e.tag_value, filter_value)
+        )
+        return islice(matching, max_results)
+
+    def _tagged_ec2_objects(self, operation: str, key: str) -> Iterator[Dict[str, Any]]:
+        tag_filter = [{"Name": f"tag:{DEFAULT_TAG_KEY}", "Values": ["*"]}]
+        return self._paginate("ec2", operation, key, Filters=tag_filter)
+
+    def list_amis(
+            self,
+            filters: list,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+            owners: Optional[List[str]] = None,
+    ) -> Iterator[Ami]:
+        filter_value = _tag_filter_value(filters)
+        if filter_value is None or owners is not None:
+            return super().list_amis(filters, max_results, page_size, owners)
+        entries = self._entries(
+            AMI,
+            lambda o: InventoryEntry(o["ImageId"], _tag_value(o), o["State"] == "pending", o),
+            lambda: self._tagged_ec2_objects("describe_images", "Images"),
+            lambda ids: self._paginate(
+                "ec2", "describe_images", "Images", Filters=[{"Name": "image-id", "Values": ids}]),
+        )
+        return (Ami(o) for o in self._matching(entries, filter_value, max_results))
+
+    def list_snapshots(
+            self,
+            filters: list,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+    ) -> Iterator[Snapshot]:
+        filter_value = _tag_filter_value(filters)
+        if filter_value is None:
+            return super().list_snapshots(filters, max_results, page_size)
+        entries = self._entries(
+            SNAPSHOT,
+            lambda o: InventoryEntry(o["SnapshotId"], _tag_value(o), o.get("State") == "pending", o),
+            lambda: self._tagged_ec2_objects("describe_snapshots", "Snapshots"),
+            lambda ids: self._paginate(
+                "ec2", "describe_snapshots", "Snapshots", Filters=[{"Name": "snapshot-id", "Values": ids}]),
+        )
+        return (Snapshot(o) for o in self._matching(entries, filter_value, max_results))
+
+    def list_export_image_tasks(
+            self,
+            filters: list,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+    ) -> Iterator[ExportImageTask]:
+        filter_value = _tag_filter_value(filters)
+        if filter_value is None:
+            return super().list_export_image_tasks(filters, max_results, page_size)
+        entries = self._entries(
+            EXPORT_IMAGE_TASK,
+            lambda o: InventoryEntry(
+                o["ExportImageTaskId"], _tag_value(o), o["Status"] in ("active", "deleting"), o),
+            lambda: self._tagged_ec2_objects("describe_export_image_tasks", "ExportImageTasks"),
+            lambda ids: self._paginate(
+                "ec2", "describe_export_image_tasks", "ExportImageTasks", ExportImageTaskIds=ids),
+        )
+        return (ExportImageTask(o) for o in self._matching(entries, filter_value, max_results))
+
+    def list_ec2_key_pairs(self, filters: list, max_results: Optional[int] = None) -> Iterator[KeyPair]:
+        filter_value = _tag_filter_value(filters)
+        if filter_value is None:
+            return super().list_ec2_key_pairs(filters, max_results)
+        entries = self._entries(
+            EC2_KEY_PAIR,
+            lambda o: InventoryEntry(o["KeyPairId"], _tag_value(o), False, o),
+            lambda: self._get_aws_client("ec2").describe_key_pairs(
+                Filters=[{"Name": f"tag:{DEFAULT_TAG_KEY}", "Values": ["*"]}])["KeyPairs"],
+        )
+        return (KeyPair(o) for o in self._matching(entries, filter_value, max_results))
+
+    def list_s3_objects(
+            self,
+            bucket: str,
+            prefix: str,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+    ) -> Iterator[S3Object]:
+        # Bucket names cannot contain a slash, hence the scope is unique
+        # for each combination of bucket and prefix.
+        entries = self._entries(
+            S3_OBJECT,
+            lambda o: InventoryEntry(o["Key"], None, False, o),
+            lambda: self._paginate("s3", "list_objects_v2", "Contents", Bucket=bucket, Prefix=prefix),
+            scope=f"{bucket}/{prefix}",
+        )
+        return (S3Object(e.data) for e in islice(entries, max_results))
+
+    def describe_stacks(self, max_results: Optional[int] = None) -> Iterator[CloudformationStack]:
+        entries = self._entries(
+            CLOUDFORMATION,
+            lambda o: InventoryEntry(
+                o["StackName"], _tag_value(o), o["StackStatus"].endswith("_IN_PROGRESS"), o),
+            lambda: self._paginate("cloudformation", "describe_stacks", "Stacks"),
+        )
+        return (CloudformationStack(e.data) for e in islice(entries, max_results))
+
+    def get_all_stack_resources(self, stack_name: str) -> List[StackResource]:
+        entries = self._entries(
+            STACK_RESOURCE,
+            lambda o: InventoryEntry(
+                o["LogicalResourceId"], None, o["ResourceStatus"].endswith("_IN_PROGRESS"), o),
+            lambda: self._paginate(
+                "cloudformation", "list_stack_resources", "StackResourceSummaries", StackName=stack_name),
+            scope=stack_name,
+        )
+        return [StackResource(e.data) for e in entries]
+
+    def modify_image_launch_permission(self, ami_id: str, launch_permissions: Dict[str, Any]):
+        super().modify_image_launch_permission(ami_id, launch_permissions)
+        self._inventory.invalidate(AMI, self.partition)
+
+    def deregister_ami(self, ami_d: str) -> None:
+        super().deregister_ami(ami_d)
+        self._inventory.invalidate(AMI, self.partition)
+
+    def remove_snapshot(self, snapshot_id: str) -> None:
+        super().remove_snapshot(snapshot_id)
+        self._inventory.invalidate(SNAPSHOT, self.partition)
+
+    def delete_stack(self, stack_name: str) -> None:
+        super().delete_stack(stack_name)
+        self._inventory.invalidate(CLOUDFORMATION, self.partition)
+        self._inventory.invalidate(STACK_RESOURCE, self.partition)
@@ -1,13 +1,17 @@
-import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import wraps
-from tempfile import NamedTemporaryFile
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import boto3
 import botocore
 import humanfriendly
 
 from exasol.ds.sandbox.lib.aws_access.ami import Ami
+from exasol.ds.sandbox.lib.aws_access.client_cache import (
+    AwsClientCache,
+    DEFAULT_MAX_POOL_CONNECTIONS,
+)
 from exasol.ds.sandbox.lib.aws_access.cloudformation_stack import CloudformationStack
 from exasol.ds.sandbox.lib.aws_access.deployer import Deployer
 from exasol.ds.sandbox.lib.aws_access.ec2_instance import EC2Instance
@@ -40,6 +44,27 @@ def _log_function_start(func):
     return wrapper
 
 
+S3_MIN_PART_SIZE = 5 * 1024 ** 2
+S3_MAX_PART_SIZE = 5 * 1024 ** 3
+S3_MAX_PARTS = 10000
+
+
+def s3_copy_part_ranges(size: int, part_size: int) -> List[Tuple[int, int, int]]:
+    """
+    Splits an S3 object of the given size into parts for a multi-part copy
+    and returns a list of tuples (part number, first byte, last byte), with
+    the last byte being inclusive as required by S3.
+    """
+    if not S3_MIN_PART_SIZE <= part_size <= S3_MAX_PART_SIZE:
+        raise ValueError(
+            f"Part size {part_size} must be between {S3_MIN_PART_SIZE} and {S3_MAX_PART_SIZE} bytes.")
+    part_size = max(part_size, -(-size // S3_MAX_PARTS))
+    return [
+        (number, first, min(first + part_size, size) - 1)
+        for number, first in enumerate(range(0, size, part_size), start=1)
+    ]
+
+
 class Progress:
     def __init__(self, report_every: str = "500 MB"):
         self._report_every = humanfriendly.parse_size(report_every)
@@ -61,9 +86,23 @@ class Progress:
 
 
 class AwsAccess(object):
-    def __init__(self, aws_profile: Optional[str], region: Optional[str] = None):
+    def __init__(
+            self,
+            aws_profile: Optional[str],
+            region: Optional[str] = None,
+            max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+            client_cache: Optional[AwsClientCache] = None,
+    ):
+        """
+        :param max_pool_connections: Maximum number of HTTPS connections kept
+               in the pool of each boto3 client. Ignored if parameter
+               client_cache is given.
+        :param client_cache: Cache for boto3 sessions and clients, which can be
+               shared between multiple instances of AwsAccess.
+        """
         self._aws_profile = aws_profile
         self._region = region
+        self._client_cache = client_cache or AwsClientCache(max_pool_connections)
         LOG.info("Instantiated AwsAccess with {aws_profile}".format(aws_profile=aws_profile))
 
     @property
@@ -77,6 +116,31 @@ class AwsAccess(object):
     def aws_profile(self) -> Optional[str]:
         return self._aws_profile
 
+    def _paginate(
+            self,
+            service_name: str,
+            operation: str,
+            key: str,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+            **kwargs,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Uses the boto3 paginator for the given operation to yield the elements
+        listed under the given key, requesting the pages one after another.
+        :param max_results: Maximum total number of elements, None for all.
+        :param page_size: Number of elements requested per page,
+               None for the default of AWS.
+        """
+        pagination_config = {}
+        if max_results is not None:
+            pagination_config["MaxItems"] = max_results
+        if page_size is not None:
+            pagination_config["PageSize"] = page_size
+        paginator = self._get_aws_client(service_name).get_paginator(operation)
+        for page in paginator.paginate(PaginationConfig=pagination_config, **kwargs):
+            yield from page.get(key, [])
+
     @_log_function_start
     def create_new_ec2_key_pair(self, key_name: str, tag_value: str) -> str:
         """
@@ -101,7 +165,9 @@ class AwsAccess(object):
     def upload_cloudformation_stack(self, yml: str, stack_name: str, tags=tuple()) -> None:
         """
         Deploy the cloudformation stack.
-        :required actions: cloudformation:CreateChangeSet, cloudformation:DescribeChangeSet,
+        Skips the deployment if the stack already exists with identical template and tags.
+        :required actions: cloudformation:DescribeStacks, cloudformation:GetTemplate,
+                           cloudformation:CreateChangeSet, cloudformation:DescribeChangeSet,
                            cloudformation:ExecuteChangeSet,
                            and all actions required for creating elements of the specific stack
                            (e.g. ec2:CreateSecurityGroup, ec2:RunInstances,...)
@@ -111,8 +177,12 @@ class AwsAccess(object):
         except Exception as e:
             LOG.error(f"Error getting cloud_client: {e}")
             raise e
+        cfn_deployer = Deployer(cloudformation_client=cloud_client)
+        if cfn_deployer.is_up_to_date(stack_name=stack_name, cfn_template=yml,
+                                      parameter_values=[], tags=list(tags)):
+            LOG.info(f"Cloudformation stack {stack_name} is up to date, skipping deployment.")
+            return
         try:
-            cfn_deployer = Deployer(cloudformation_client=cloud_client)
             result = cfn_deployer.create_and_wait_for_changeset(stack_name=stack_name, cfn_template=yml,
                                                                 parameter_values=[],
                                                                 capabilities=("CAPABILITY_IAM", "CAPABILITY_NAMED_IAM"),
@@ -160,13 +230,12 @@ class AwsAccess(object):
         cloud_client.validate_template(TemplateBody=cloudformation_yml)
 
     def _get_stack_resources(self, stack_name: str) -> List[StackResource]:
-        cf_client = self._get_aws_client('cloudformation')
-        current_result = cf_client.list_stack_resources(StackName=stack_name)
-        result = current_result["StackResourceSummaries"]
-
-        while "nextToken" in current_result:
-            current_result = cf_client.list_stack_resources(StackName=stack_name, nextToken=current_result["nextToken"])
-            result.extend(current_result["StackResourceSummaries"])
+        result = self._paginate(
+            "cloudformation",
+            "list_stack_resources",
+            "StackResourceSummaries",
+            StackName=stack_name,
+        )
         return [StackResource(stack_resource) for stack_resource in result]
 
     @_log_function_start
@@ -174,8 +243,7 @@ class AwsAccess(object):
         """
         This functions uses Boto3 to get all AWS Cloudformation resources for a specific Cloudformation stack,
         identified by parameter `stack_name`.
-        The AWS API truncates at a size of 1MB, and in order to get all chunks the method must be called
-        passing the previous retrieved token until no token is returned.
+        The AWS API truncates at a size of 1MB, the boto3 paginator retrieves all chunks.
         :required actions: cloudformation:ListStackResources
         """
         return self._get_stack_resources(stack_name=stack_name)
@@ -204,19 +272,15 @@ class AwsAccess(object):
         cf_client.delete_stack(StackName=stack_name)
 
     @_log_function_start
-    def describe_stacks(self) -> List[CloudformationStack]:
+    def describe_stacks(self, max_results: Optional[int] = None) -> Iterator[CloudformationStack]:
         """
         This functions uses Boto3 to describe all cloudformation stacks.
+        The stacks are retrieved page by page using the boto3 paginator.
+        DescribeStacks does not support a page size.
         :required actions: cloudformation:DescribeStacks
         """
-        cf_client = self._get_aws_client('cloudformation')
-        current_result = cf_client.describe_stacks()
-        result = current_result["Stacks"]
-
-        while "NextToken" in current_result:
-            current_result = cf_client.describe_stacks(NextToken=current_result["NextToken"])
-            result.extend(current_result["Stacks"])
-        return [CloudformationStack(stack) for stack in result]
+        for stack in self._paginate("cloudformation", "describe_stacks", "Stacks", max_results):
+            yield CloudformationStack(stack)
 
     @_log_function_start
     def describe_instance(self, instance_id: str) -> EC2Instance:
@@ -235,14 +299,19 @@ class AwsAccess(object):
         return EC2Instance(instances[0])
 
     @_log_function_start
-    def create_image_from_ec2_instance(self, instance_id: str, name: str, tag_value: str, description: str) -> str:
+    def create_image_from_ec2_instance(self, instance_id: str, name: str, tag_value: str, description: str,
+                                       extra_tags: Optional[Dict[str, str]] = None) -> str:
         """
         Creates an AMI image from an EC-2 instance.
+        Parameter extra_tags are added to the AMI in addition to the default asset tag.
         Returns the image-id of the new AMI.
         :required actions: ec2:CreateImage, ec2:CreateTags
         """
         cloud_client = self._get_aws_client("ec2")
-        tags = [{"ResourceType": "image", "Tags": create_default_asset_tag(tag_value)},
+        image_tags = create_default_asset_tag(tag_value) + [
+            {"Key": key, "Value": value} for key, value in (extra_tags or {}).items()
+        ]
+        tags = [{"ResourceType": "image", "Tags": image_tags},
                 {"ResourceType": "snapshot", "Tags": create_default_asset_tag(tag_value)}]
 
         result = cloud_client.create_image(Name=name, InstanceId=instance_id, Description=description,
@@ -274,15 +343,31 @@ class AwsAccess(object):
         Get Export-Image-Task for given export_image_task_id.
         :required actions: ec2:DescribeExportImageTasks
         """
+        return self.get_export_image_tasks([export_image_task_id])[0]
+
+    @_log_function_start
+    def get_export_image_tasks(self, export_image_task_ids: List[str]) -> List[ExportImageTask]:
+        """
+        Get Export-Image-Tasks for all given export_image_task_ids with a single request.
+        :required actions: ec2:DescribeExportImageTasks
+        """
         cloud_client = self._get_aws_client("ec2")
-        result = cloud_client.describe_export_image_tasks(ExportImageTaskIds=[export_image_task_id])
+        result = cloud_client.describe_export_image_tasks(ExportImageTaskIds=export_image_task_ids)
         if "NextToken" in result and result["NextToken"] != '':
-            raise RuntimeError(f"We expected only one result, but got {result}.")
+            raise RuntimeError(f"We expected only one result page, but got {result}.")
         export_image_tasks = result["ExportImageTasks"]
-        if len(export_image_tasks) != 1:
+        if len(export_image_tasks) != len(export_image_task_ids):
             raise RuntimeError(f"Unexpected number of export image tasks: {export_image_tasks}")
-        export_image_task = export_image_tasks[0]
-        return ExportImageTask(export_image_task)
+        return [ExportImageTask(export_image_task) for export_image_task in export_image_tasks]
+
+    @_log_function_start
+    def cancel_export_task(self, export_task_id: str) -> None:
+        """
+        Cancels an active export task, e.g. an export-image-task.
+        :required actions: ec2:CancelExportTask
+        """
+        cloud_client = self._get_aws_client("ec2")
+        cloud_client.cancel_export_task(ExportTaskId=export_task_id)
 
     @_log_function_start
     def get_ami(self, image_id: str) -> Ami:
@@ -315,65 +400,87 @@ class AwsAccess(object):
         return EC2InstanceStatus(instance_statuses[0])
 
     @_log_function_start
-    def list_amis(self, filters: list) -> List[Ami]:
-        """
-        List AMI images with given tag filter
+    def list_amis(
+            self,
+            filters: list,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+            owners: Optional[List[str]] = None,
+    ) -> Iterator[Ami]:
+        """
+        List AMI images with given tag filter.
+        The images are retrieved page by page using the boto3 paginator.
+        :param owners: Restrict the images to the given owners, e.g. "self"
+               for the images owned by the current account.
         :required actions: ec2:DescribeImages
         """
-        cloud_client = self._get_aws_client("ec2")
-        response = cloud_client.describe_images(Filters=filters)
-        return [Ami(ami) for ami in response["Images"]]
+        kwargs = {"Owners": owners} if owners is not None else {}
+        for ami in self._paginate("ec2", "describe_images", "Images", max_results, page_size,
+                                  Filters=filters, **kwargs):
+            yield Ami(ami)
 
     @_log_function_start
-    def list_snapshots(self, filters: list) -> List[Snapshot]:
+    def list_snapshots(
+            self,
+            filters: list,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+    ) -> Iterator[Snapshot]:
         """
-        List EC2 volume snapthos with given tag filter
+        List EC2 volume snapshots with given tag filter.
+        The snapshots are retrieved page by page using the boto3 paginator.
         :required actions: ec2:DescribeSnapshots
         """
-        cloud_client = self._get_aws_client("ec2")
-
-        response = cloud_client.describe_snapshots(Filters=filters)
-        if "NextToken" in response and response["NextToken"] != '':
-            raise RuntimeError(f"We expected only one result, but got {response}.")
-        return [Snapshot(snapshot) for snapshot in response["Snapshots"]]
+        for snapshot in self._paginate(
+                "ec2", "describe_snapshots", "Snapshots", max_results, page_size, Filters=filters):
+            yield Snapshot(snapshot)
 
     @_log_function_start
-    def list_export_image_tasks(self, filters: list) -> List[ExportImageTask]:
+    def list_export_image_tasks(
+            self,
+            filters: list,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+    ) -> Iterator[ExportImageTask]:
         """
-        List export image tasks with given tag filter
+        List export image tasks with given tag filter.
+        The tasks are retrieved page by page using the boto3 paginator.
         :required actions: ec2:DescribeExportImageTasks
         """
-        cloud_client = self._get_aws_client("ec2")
-
-        response = cloud_client.describe_export_image_tasks(Filters=filters)
-        if "NextToken" in response and response["NextToken"] != '':
-            raise RuntimeError(f"We expected only one result, but got {response}.")
-        return [ExportImageTask(export_image_task) for export_image_task in response["ExportImageTasks"]]
+        for export_image_task in self._paginate(
+                "ec2", "describe_export_image_tasks", "ExportImageTasks", max_results, page_size, Filters=filters):
+            yield ExportImageTask(export_image_task)
 
     @_log_function_start
-    def list_ec2_key_pairs(self, filters: list) -> List[KeyPair]:
+    def list_ec2_key_pairs(self, filters: list, max_results: Optional[int] = None) -> Iterator[KeyPair]:
         """
-        List ec-2 key-pairs with given tag filter
+        List ec-2 key-pairs with given tag filter.
+        DescribeKeyPairs does not support pagination and always returns all
+        key-pairs.
         :required actions: ec2:DescribeKeyPairs
         """
         cloud_client = self._get_aws_client("ec2")
 
         response = cloud_client.describe_key_pairs(Filters=filters)
-        if "NextToken" in response and response["NextToken"] != '':
-            raise RuntimeError(f"We expected only one result, but got {response}.")
-        return [KeyPair(keypair) for keypair in response["KeyPairs"]]
+        for keypair in islice(response["KeyPairs"], max_results):
+            yield KeyPair(keypair)
 
     @_log_function_start
-    def list_s3_objects(self, bucket: str, prefix: str) -> Optional[List[S3Object]]:
+    def list_s3_objects(
+            self,
+            bucket: str,
+            prefix: str,
+            max_results: Optional[int] = None,
+            page_size: Optional[int] = None,
+    ) -> Iterator[S3Object]:
         """
-        List s3 objects images with given tag filter
+        List all s3 objects with the given prefix.
+        The objects are retrieved page by page using the boto3 paginator.
         :required actions: s3:ListBucket
         """
-        cloud_client = self._get_aws_client("s3")
-
-        response = cloud_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-        if "Contents" in response:
-            return [S3Object(s3object) for s3object in response["Contents"]]
+        for s3object in self._paginate(
+                "s3", "list_objects_v2", "Contents", max_results, page_size, Bucket=bucket, Prefix=prefix):
+            yield S3Object(s3object)
 
     @_log_function_start
     def deregister_ami(self, ami_d: str) -> None:
@@ -461,30 +568,74 @@ class AwsAccess(object):
             source: str,
             dest: str,
             progress: Progress = None,
+            part_size: str = "500 MB",
+            max_concurrency: int = DEFAULT_MAX_POOL_CONNECTIONS,
     ):
         """
-        Copies an s3 object within a bucket but uses a TransferConfig to
-        process files larger than 5 GB as multi-part.
+        Copies an s3 object within a bucket. Objects larger than parameter
+        part_size are copied as multi-part, which also supports objects
+        larger than 5 GB.
+
+        The copy is done server-side, i.e. S3 copies the parts internally
+        (UploadPartCopy) and no bytes are transferred to the local machine.
 
-        The copy operation requires to first download the file from S3 to
-        local filesystem and then upload it again.
+        :param part_size: Size of each part, e.g. "500 MB", interpreted as
+               binary units. S3 requires parts between 5 MiB and 5 GiB and at
+               most 10,000 parts, the part size is increased if necessary.
+        :param max_concurrency: Maximum number of parts copied in parallel.
+        :required actions: s3:GetObject, s3:PutObject, s3:AbortMultipartUpload
         """
         cloud_client = self._get_aws_client("s3")
-        config = boto3.s3.transfer.TransferConfig()
-
         if progress is None:
             progress = Progress("500 MB")
 
-        callback = progress.report
-        tmpfile = NamedTemporaryFile(delete=False).name
+        copy_source = {"Bucket": bucket, "Key": source}
+        size = cloud_client.head_object(Bucket=bucket, Key=source)["ContentLength"]
+        parts = s3_copy_part_ranges(size, humanfriendly.parse_size(part_size, binary=True))
+        if len(parts) <= 1:
+            LOG.info(f"Copying S3 object {source} to {dest}")
+            cloud_client.copy_object(Bucket=bucket, CopySource=copy_source, Key=dest)
+            progress.report(size)
+            return
+
+        LOG.info(f"Copying (large) S3 object {source} to {dest} in {len(parts)} parts")
+        upload_id = cloud_client.create_multipart_upload(Bucket=bucket, Key=dest)["UploadId"]
+
+        def copy_part(part_number: int, first: int, last: int) -> Dict[str, Any]:
+            response = cloud_client.upload_part_copy(
+                Bucket=bucket,
+                Key=dest,
+                CopySource=copy_source,
+                CopySourceRange=f"bytes={first}-{last}",
+                PartNumber=part_number,
+                UploadId=upload_id,
+            )
+            return {"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]}
+
         try:
-            LOG.info(f"Downloading (large) S3 object {source} to temp file")
-            cloud_client.download_file(bucket, source, tmpfile, Callback=callback, Config=config)
-            progress.reset()
-            LOG.info(f"Uploading (large) temp file to S3 {dest}")
-            cloud_client.upload_file(tmpfile, bucket, dest, Config=config, Callback=callback)
-        finally:
-            os.unlink(tmpfile)
+            completed = []
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                futures = {executor.submit(copy_part, *part): part for part in parts}
+                try:
+                    for future in as_completed(futures):
+                        completed.append(future.result())
+                        _, first, last = futures[future]
+                        progress.report(last - first + 1)
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            completed.sort(key=lambda part: part["PartNumber"])
+            cloud_client.complete_multipart_upload(
+                Bucket=bucket,
+                Key=dest,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed},
+            )
+        except Exception as e:
+            LOG.error(f"Error copying S3 object {source} to {dest}: {e}")
+            cloud_client.abort_multipart_upload(Bucket=bucket, Key=dest, UploadId=upload_id)
+            raise e
 
     @_log_function_start
     def delete_s3_object(self, bucket: str, source: str):
@@ -500,14 +651,16 @@ class AwsAccess(object):
         cloud_client.delete_object(Bucket=bucket, Key=source)
 
     def _get_aws_client(self, service_name: str) -> Any:
-        if self._aws_profile is None:
-            return boto3.client(service_name, region_name=self._region)
-        aws_session = boto3.session.Session(profile_name=self._aws_profile, region_name=self._region)
-        return aws_session.client(service_name)
+        return self._client_cache.client(self._aws_profile, self._region, service_name)
 
     def instantiate_for_region(self, region: str) -> "AwsAccess":
         """
-        Creates a new instance, based on self, but for region indicated by parameter "region"
+        Creates a new instance, based on self, but for region indicated by parameter "region".
+        The new instance shares the cached boto3 sessions and clients with self.
         :param region: The AWS region on which the new AwsAccess instance will operate.
         """
-        return self.__class__(aws_profile=self._aws_profile, region=region)
+        return self.__class__(
+            aws_profile=self._aws_profile,
+            region=region,
+            client_cache=self._client_cache,
+        )
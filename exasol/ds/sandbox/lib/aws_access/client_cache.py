@@ -0,0 +1,55 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+
+class AwsClientCache:
+    """
+    Caches boto3 sessions per AWS profile and boto3 clients per
+    (profile, region, service).
+
+    Creating a client loads the botocore service model, resolves the
+    credentials and opens a new HTTPS connection pool, so clients should be
+    reused wherever possible. boto3 clients are thread-safe, sessions are
+    not. Therefore, creating sessions and clients is guarded by a lock.
+    """
+
+    def __init__(self, max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS):
+        self._config = Config(max_pool_connections=max_pool_connections)
+        self._sessions: Dict[Optional[str], boto3.session.Session] = {}
+        self._clients: Dict[Tuple[Optional[str], Optional[str], str], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_pool_connections(self) -> int:
+        return self._config.max_pool_connections
+
+    def _session(self, aws_profile: Optional[str]) -> boto3.session.Session:
+        if aws_profile not in self._sessions:
+            self._sessions[aws_profile] = boto3.session.Session(profile_name=aws_profile)
+        return self._sessions[aws_profile]
+
+    def session(self, aws_profile: Optional[str]) -> boto3.session.Session:
+        with self._lock:
+            return self._session(aws_profile)
+
+    def client(self, aws_profile: Optional[str], region: Optional[str], service_name: str) -> Any:
+        key = (aws_profile, region, service_name)
+        with self._lock:
+            if key not in self._clients:
+                session = self._session(aws_profile)
+                self._clients[key] = session.client(
+                    service_name,
+                    region_name=region,
+                    config=self._config,
+                )
+            return self._clients[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._sessions.clear()
@@ -14,6 +14,8 @@
 #Source: https://github.com/aws/aws-cli/blob/e1f7196ad7859a8144f0313fa4b407da5ae8b101/awscli/customizations/cloudformation/deployer.py
 
 import time
+import hashlib
+import json
 import logging
 import botocore
 import collections
@@ -30,6 +32,29 @@ ChangeSetResult = collections.namedtuple(
 
 DEFAULT_CHANGE_SET_PREFIX="ai-lab-ci-setup-deploy-"
 
+# Stacks in these states can be updated with a template without changes
+STABLE_STACK_STATES = ("CREATE_COMPLETE", "UPDATE_COMPLETE")
+
+
+def template_fingerprint(cfn_template, parameter_values, tags):
+    """
+    Computes a fingerprint of the CloudFormation template and the
+    parameters and tags it is deployed with, ignoring the order of the
+    parameters and tags.
+
+    :param parameter_values: Array of dicts with keys ParameterKey and ParameterValue
+    :param tags: Array of dicts with keys Key and Value
+    :return: SHA-256 hex digest
+    """
+    content = {
+        "template": cfn_template,
+        "parameters": sorted(
+            (p["ParameterKey"], p.get("ParameterValue")) for p in parameter_values),
+        "tags": sorted((t["Key"], t["Value"]) for t in tags),
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
 
 class Deployer(object):
 
@@ -73,6 +98,37 @@ class Deployer(object):
                 LOG.debug("Unable to get stack details.", exc_info=e)
                 raise e
 
+    def is_up_to_date(self, stack_name, cfn_template, parameter_values, tags):
+        """
+        Checks if the stack is deployed completely with an identical
+        template, parameters, and tags, so that a changeset would not
+        contain any changes.
+
+        :param stack_name: Name or ID of the stack
+        :param cfn_template: CloudFormation template string
+        :param parameter_values: Template parameters object
+        :param tags: Array of tags passed to CloudFormation
+        :return: True if the deployed stack does not differ. False otherwise
+        """
+        if not self.has_stack(stack_name):
+            return False
+        stack = self._client.describe_stacks(StackName=stack_name)["Stacks"][0]
+        if stack["StackStatus"] not in STABLE_STACK_STATES:
+            return False
+        # The original stage is the template exactly as it was uploaded
+        deployed_template = self._client.get_template(
+            StackName=stack_name, TemplateStage="Original")["TemplateBody"]
+        if not isinstance(deployed_template, str):
+            # boto3 parses JSON templates into dicts, hence the original
+            # text is not available for comparison
+            return False
+        deployed = template_fingerprint(
+            deployed_template,
+            stack.get("Parameters", []),
+            stack.get("Tags", []),
+        )
+        return deployed == template_fingerprint(cfn_template, parameter_values, tags)
+
     def create_changeset(self, stack_name, cfn_template,
                          parameter_values, capabilities, role_arn,
                          notification_arns, tags):
@@ -0,0 +1,19 @@
+import threading
+from typing import Optional
+
+
+class Cancelled(RuntimeError):
+    """
+    Raised by a pipeline when it has been asked to stop, e.g. since a
+    concurrent pipeline of the release build failed.
+    """
+
+
+def check_cancelled(cancelled: Optional[threading.Event], stage: str) -> None:
+    """
+    Raise Cancelled before starting the specified stage if the event is
+    set. Pipelines call this between their stages, so a cancelled pipeline
+    still cleans up, e.g. removes its EC2 instance or Docker container.
+    """
+    if cancelled is not None and cancelled.is_set():
+        raise Cancelled(f"Cancelled before {stage}")
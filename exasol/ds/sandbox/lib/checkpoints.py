@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import (
+    Dict,
+    Optional,
+)
+
+from exasol.ds.sandbox.lib.logging import (
+    LogType,
+    get_status_logger,
+)
+
+LOG = get_status_logger(LogType.CREATE_VM)
+
+DEFAULT_CHECKPOINT_FILE = Path.home() / ".cache" / "exasol-ai-lab" / "checkpoints.json"
+
+AMI_CREATED = "ami-created"
+
+
+def export_started(vm_image_format: str) -> str:
+    return f"export-started:{vm_image_format}"
+
+
+def image_renamed(vm_image_format: str) -> str:
+    return f"image-renamed:{vm_image_format}"
+
+
+class Checkpoints:
+    """
+    Completed stages of command create-vm for a specific asset id, e.g.
+    the id of the AMI or of the export image task for each VM image format.
+
+    The checkpoints of all asset ids are stored in a JSON file, which is
+    updated after each completed stage. If path is None, then the
+    checkpoints are only kept in memory.
+
+    Unless parameter resume is True, the checkpoints recorded by earlier
+    runs for the same asset id are discarded. Otherwise, the pipeline can
+    skip the stages whose outputs still exist in AWS. Only the creation of
+    the AMI, the export image tasks and the renaming of the exported VM
+    images can be resumed, as the EC2 instance is always removed after a
+    failure.
+    """
+
+    def __init__(
+            self,
+            asset_id: str,
+            path: Optional[Path] = DEFAULT_CHECKPOINT_FILE,
+            resume: bool = False,
+    ):
+        self.asset_id = asset_id
+        self._path = path
+        self._lock = threading.Lock()
+        self._stages: Dict[str, str] = (
+            self._load().get(asset_id, {}) if resume and path else {}
+        )
+        if resume and self._stages:
+            LOG.info(f"Resuming asset id {asset_id} with checkpoints {self._stages}")
+        self._save()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if not self._path.exists():
+            return {}
+        try:
+            return json.loads(self._path.read_text())
+        except json.JSONDecodeError:
+            LOG.warning(f"Ignoring corrupt checkpoint file {self._path}")
+            return {}
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        content = self._load()
+        content[self.asset_id] = self._stages
+        tmp = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(content, indent=2, sort_keys=True))
+        tmp.replace(self._path)
+
+    def get(self, stage: str) -> Optional[str]:
+        """
+        Returns the output recorded for the stage, or None if the stage
+        has not been completed.
+        """
+        with self._lock:
+            return self._stages.get(stage)
+
+    def record(self, stage: str, value: str) -> None:
+        with self._lock:
+            self._stages[stage] = value
+            self._save()
+
+    def discard(self, *stages: str) -> None:
+        with self._lock:
+            for stage in stages:
+                self._stages.pop(stage, None)
+            self._save()
+
+    def stages(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._stages)
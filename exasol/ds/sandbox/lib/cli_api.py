@@ -3,15 +3,29 @@ Runtime dependencies used by CLI command modules.
 
 The command registry lives in exasol.ds.sandbox.cli.commands; keep this module
 free of command imports so command modules can depend on it without cycles.
+
+The dependencies are imported on first access to keep the startup of the CLI
+fast.
 """
+import importlib
+from typing import TYPE_CHECKING
 
-from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.logging import set_log_level
 
-from exasol.ds.sandbox.lib.run_create_vm import run_create_vm
-from exasol.ds.sandbox.lib.setup_ec2.run_install_dependencies import run_install_dependencies
-from exasol.ds.sandbox.lib.setup_ec2.run_reset_password import run_reset_password
-from exasol.ds.sandbox.lib.setup_ec2.run_setup_ec2 import run_setup_ec2
+if TYPE_CHECKING:
+    from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+    from exasol.ds.sandbox.lib.run_create_vm import run_create_vm
+    from exasol.ds.sandbox.lib.setup_ec2.run_install_dependencies import run_install_dependencies
+    from exasol.ds.sandbox.lib.setup_ec2.run_reset_password import run_reset_password
+    from exasol.ds.sandbox.lib.setup_ec2.run_setup_ec2 import run_setup_ec2
+
+_LAZY_ATTRIBUTES = {
+    "AwsAccess": "exasol.ds.sandbox.lib.aws_access.aws_access",
+    "run_create_vm": "exasol.ds.sandbox.lib.run_create_vm",
+    "run_install_dependencies": "exasol.ds.sandbox.lib.setup_ec2.run_install_dependencies",
+    "run_reset_password": "exasol.ds.sandbox.lib.setup_ec2.run_reset_password",
+    "run_setup_ec2": "exasol.ds.sandbox.lib.setup_ec2.run_setup_ec2",
+}
 
 __all__ = [
     "AwsAccess",
@@ -21,3 +35,11 @@ __all__ = [
     "run_setup_ec2",
     "set_log_level",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
@@ -1,11 +1,29 @@
 from importlib.metadata import version
+from pathlib import Path
 
 # name of the project as specified in file pyproject.toml
 AI_LAB_VERSION = version("exasol-ai-lab")
 
+DEFAULT_INVENTORY_FILE = Path.home() / ".cache" / "exasol-ai-lab" / "asset_inventory.sqlite"
+
 _default_config = {
     # unit: seconds. For GPU AMIs 60 seconds are required.
+    # Polling backs off exponentially up to this value.
     "time_to_wait_for_polling": 60.0,
+    # unit: seconds. Initial delay when polling, and after progress was detected.
+    "polling_initial_delay": 5.0,
+    "polling_backoff_factor": 1.5,
+    # unit: seconds. Overall deadline of a single polling loop.
+    "polling_timeout": 6 * 60 * 60.0,
+    # Probe whether EC2 instances accept SSH connections before running Ansible,
+    # otherwise wait for time_to_wait_for_polling.
+    "ssh_readiness_probe": True,
+    # unit: seconds
+    "ssh_readiness_timeout": 300.0,
+    "wait_for_cloud_init": True,
+    # unit: seconds. Asset types in the local asset inventory are retrieved
+    # again completely from AWS after this time.
+    "asset_inventory_ttl": 600.0,
     # Source AMI is set to Ubuntu 22.04. Owner id '099720109477' == 'Canonical'
     "source_ami_filters": {
         "name": "ubuntu/images/hvm-ssd/ubuntu-jammy-22.04-amd64-server-*",
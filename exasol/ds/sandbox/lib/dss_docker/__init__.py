@@ -1,5 +1,6 @@
-from .create_image import DssDockerImage, DEFAULT_ORG_AND_REPOSITORY
-from .push_image import DockerRegistry
+import importlib
+
+DEFAULT_ORG_AND_REPOSITORY = "exasol/ai-lab"
 
 # Names of environment variables for user and password to access docker
 # services.  This is especially required for rate limits docker hub sometimes
@@ -7,3 +8,21 @@ from .push_image import DockerRegistry
 
 USER_ENV = "DOCKER_REGISTRY_USER"
 PASSWORD_ENV = "DOCKER_REGISTRY_PASSWORD"
+
+# The submodules import docker and are only loaded on first access of one of
+# their classes, so that CLI commands can use the constants above without
+# slowing down the startup of the CLI.
+_LAZY_ATTRIBUTES = {
+    "DssDockerImage": "create_image",
+    "DockerRegistry": "push_image",
+    "Wheelhouse": "wheelhouse",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Optional,
+)
+
+import docker
+import importlib_resources
+from docker.client import DockerClient
+
+import exasol.ds.sandbox.runtime.ansible as runtime_ansible
+from exasol.ds.sandbox.lib.logging import (
+    LogType,
+    get_status_logger,
+)
+
+_logger = get_status_logger(LogType.DOCKER_IMAGE)
+
+FINAL_STAGE = "final"
+
+
+@dataclass(frozen=True)
+class BuildStage:
+    """
+    Stage of a layered build of the Docker image. Attribute ``name`` is
+    passed to the Ansible playbook via variable ``build_stages`` in order to
+    select the tasks of the stage.
+
+    ``inputs`` are the files and directories in the Ansible runtime package
+    the tasks of the stage depend on, ``env`` the names of the environment
+    variables and ``variables`` the names of the Ansible extra variables
+    evaluated by these tasks. Inputs may be missing, e.g. optional lock
+    files. ``secrets`` are the names of environment variables with secret
+    values, e.g. passwords, which must not be part of published hashes.
+    """
+    name: str
+    inputs: tuple[str, ...]
+    env: tuple[str, ...] = ()
+    variables: tuple[str, ...] = ()
+    secrets: tuple[str, ...] = ()
+
+
+STAGES = (
+    BuildStage("system", (
+        "ai_lab_docker_playbook.yml",
+        "general_setup_tasks.yml",
+        "apt_update.yml",
+        "roles/ansible_access",
+        "roles/rsync",
+        "roles/jupyter_user",
+        "roles/jupyter/defaults",
+        "roles/jupyter/tasks/main.yml",
+    )),
+    BuildStage("jupyter", (
+        "roles/jupyter/tasks/update-pip.yml",
+        "roles/jupyter/tasks/pip-install.yml",
+        "roles/jupyter/tasks/jupyterlab.yml",
+        "roles/jupyter/files/jupyter_requirements.txt",
+        "roles/jupyter/files/jupyter_requirements.lock",
+    ), secrets=("JUPYTER_LAB_PASSWORD",)),
+    BuildStage("notebook", (
+        "roles/jupyter/tasks/tutorial.yml",
+        "roles/jupyter/tasks/compile-bytecode.yml",
+        "roles/jupyter/files/notebook_requirements.txt",
+        "roles/jupyter/files/notebook_requirements.lock",
+    ), variables=("jupyterlab_bytecode_optimization_levels",)),
+    BuildStage("docker", (
+        "roles/docker",
+        "roles/coredumps",
+    )),
+)
+
+
+def _update_digest(digest, item: importlib_resources.abc.Traversable, path: str):
+    if item.is_file():
+        digest.update(path.encode("utf-8") + b"\0")
+        digest.update(item.read_bytes())
+        return
+    if not item.is_dir():
+        digest.update(path.encode("utf-8") + b"\0missing\0")
+        return
+    for child in sorted(item.iterdir(), key=lambda c: c.name):
+        if child.name not in ("__init__.py", "__pycache__"):
+            _update_digest(digest, child, f"{path}/{child.name}")
+
+
+def stage_hashes(
+    base_file: importlib_resources.abc.Traversable,
+    stages: tuple[BuildStage, ...] = STAGES,
+    extra_vars: Optional[dict[str, Any]] = None,
+    include_secrets: bool = True,
+) -> dict[str, str]:
+    """
+    Return a content hash for each of the stages. The hash of a stage
+    covers the base file, e.g. the Dockerfile, and the inputs of the stage
+    itself and of all previous stages, including the secrets only if
+    include_secrets is True.
+    """
+    extra_vars = extra_vars or {}
+    ansible_files = importlib_resources.files(runtime_ansible)
+    digest = hashlib.sha256(base_file.read_bytes())
+    result = {}
+    for stage in stages:
+        for path in stage.inputs:
+            _update_digest(digest, ansible_files.joinpath(path), path)
+        for var in stage.env + (stage.secrets if include_secrets else ()):
+            digest.update(f"{var}={os.environ.get(var, '')}\0".encode("utf-8"))
+        for var in stage.variables:
+            value = json.dumps(extra_vars.get(var), sort_keys=True)
+            digest.update(f"{var}={value}\0".encode("utf-8"))
+        result[stage.name] = digest.hexdigest()
+    return result
+
+
+class StageImages:
+    """
+    Local Docker images with the state after each of the stages, tagged with
+    the content hash of the stage in repository ``<repository>-build-cache``.
+    """
+    def __init__(
+            self,
+            client: DockerClient,
+            repository: str,
+            docker_file: importlib_resources.abc.Traversable,
+            stages: tuple[BuildStage, ...] = STAGES,
+            extra_vars: Optional[dict[str, Any]] = None,
+    ):
+        self._client = client
+        self.repository = f"{repository}-build-cache"
+        self.stages = stages
+        self._hashes = stage_hashes(docker_file, stages, extra_vars)
+
+    def tag(self, stage: BuildStage) -> str:
+        return f"{stage.name}-{self._hashes[stage.name][:16]}"
+
+    def image_name(self, stage: BuildStage) -> str:
+        return f"{self.repository}:{self.tag(stage)}"
+
+    def _exists(self, stage: BuildStage) -> bool:
+        try:
+            self._client.images.get(self.image_name(stage))
+            return True
+        except docker.errors.ImageNotFound:
+            return False
+
+    def resume_point(self) -> tuple[Optional[str], tuple[BuildStage, ...]]:
+        """
+        Return the name of the image of the newest stage with matching
+        content hash, or None if there is none, and the stages remaining
+        to be built on top of it.
+        """
+        for i in reversed(range(len(self.stages))):
+            stage = self.stages[i]
+            if self._exists(stage):
+                _logger.info(f"Resuming after stage {stage.name} from image {self.image_name(stage)}")
+                return self.image_name(stage), self.stages[i + 1:]
+        _logger.info("Found no image for any of the build stages")
+        return None, self.stages
@@ -1,3 +1,4 @@
+import threading
 from datetime import datetime
 from functools import reduce
 from typing import (
@@ -13,10 +14,15 @@ from docker.models.containers import Container as DockerContainer
 from docker.models.images import Image as DockerImage
 
 from exasol.ds.sandbox.lib import pretty_print
+from exasol.ds.sandbox.lib.cancellation import check_cancelled
 from exasol.ds.sandbox.lib.config import (
     AI_LAB_VERSION,
     ConfigObject,
 )
+from exasol.ds.sandbox.lib.dss_docker.build_stages import (
+    FINAL_STAGE,
+    StageImages,
+)
 from exasol.ds.sandbox.lib.logging import (
     LogType,
     get_status_logger,
@@ -26,7 +32,6 @@ from exasol.ds.sandbox.lib.setup_ec2.run_install_dependencies import (
     run_install_dependencies,
 )
 
-DEFAULT_ORG_AND_REPOSITORY = "exasol/ai-lab"
 _logger = get_status_logger(LogType.DOCKER_IMAGE)
 
 
@@ -92,21 +97,36 @@ class DssDockerImage:
             repository: str,
             version: str = None,
             keep_container: bool = False,
+            layered: bool = False,
     ):
         version = version if version else AI_LAB_VERSION
         self.container_name = f"ds-sandbox-{DssDockerImage.timestamp()}"
         self.repository = repository
         self.version = version
         self.keep_container = keep_container
+        self.layered = layered
         self._start = None
+        self._stage_images = None
+        self._remaining_stages = ()
         self.registry = None
+        self.wheelhouse = None
+        self.bytecode_optimization_levels = None
+        # Set by the release build to stop before the next stage.
+        self.cancelled: threading.Event | None = None
 
     @property
     def image_name(self):
         return f"{self.repository}:{self.version}"
 
-    def _ansible_playbook(self) -> ansible.Playbook:
+    def _ansible_playbook(self, stage: str = None) -> ansible.Playbook:
         extra_vars = {"docker_container": self.container_name}
+        if stage is not None:
+            extra_vars["build_stages"] = [stage]
+        if self.wheelhouse is not None:
+            extra_vars.update(self.wheelhouse.extra_vars())
+        if self.bytecode_optimization_levels:
+            extra_vars["jupyterlab_bytecode_optimization_levels"] = \
+                self.bytecode_optimization_levels
         return ansible.Playbook("ai_lab_docker_playbook.yml", extra_vars)
 
     def _ansible_config(self) -> ConfigObject:
@@ -130,6 +150,29 @@ class DssDockerImage:
             return docker_client.containers.get(self.container_name)
         except:
             pass
+        base_image = None
+        if self.layered:
+            self._stage_images = StageImages(
+                docker_client,
+                self.repository,
+                self._docker_file(),
+                extra_vars=self._ansible_playbook().vars,
+            )
+            base_image, self._remaining_stages = self._stage_images.resume_point()
+        if base_image is None:
+            base_image = self._build_base_image(docker_client)
+        container = docker_client.containers.create(
+            image=base_image,
+            name=self.container_name,
+            command="sleep infinity",
+            detach=True,
+            volumes=self.wheelhouse.volumes() if self.wheelhouse else None,
+        )
+        _logger.info("Starting container")
+        container.start()
+        return container
+
+    def _build_base_image(self, docker_client: docker.DockerClient) -> str:
         docker_file = self._docker_file()
         _logger.info(
             f"Creating docker image {self.image_name} from {docker_file}:"
@@ -143,28 +186,42 @@ class DssDockerImage:
                 tag=self.image_name,
                 rm=True,
             )
-        container = docker_client.containers.create(
-            image=self.image_name,
-            name=self.container_name,
-            command="sleep infinity",
-            detach=True,
-        )
-        _logger.info("Starting container")
-        container.start()
-        return container
+        return self.image_name
 
-    def _install_dependencies(self) -> ansible.Facts:
-        _logger.info("Installing dependencies")
+    def _run_playbook(self, stage: str = None) -> ansible.Facts:
         host = ansible.Host(self.container_name)
         fact_cache = run_install_dependencies(
             configuration=self._ansible_config(),
             host_infos=(host,),
-            playbook=self._ansible_playbook(),
+            playbook=self._ansible_playbook(stage),
             ansible_repositories=DEFAULT_REPOSITORIES,
             retrieve_facts_from=host.name,
         )
         return ansible.Facts(fact_cache, prefixes=["dss_facts"])
 
+    def _install_dependencies(self, container: DockerContainer) -> ansible.Facts:
+        if self.wheelhouse is None:
+            return self._install_stages(container)
+        cached = self.wheelhouse.cached()
+        facts = self._install_stages(container)
+        self.wheelhouse.report(cached)
+        return facts
+
+    def _install_stages(self, container: DockerContainer) -> ansible.Facts:
+        if not self.layered:
+            _logger.info("Installing dependencies")
+            return self._run_playbook()
+        for stage in self._remaining_stages:
+            check_cancelled(self.cancelled, f"stage {stage.name}")
+            _logger.info(f"Installing dependencies of stage {stage.name}")
+            self._run_playbook(stage.name)
+            tag = self._stage_images.tag(stage)
+            container.commit(repository=self._stage_images.repository, tag=tag)
+            _logger.info(f"Committed stage {stage.name} as {self._stage_images.image_name(stage)}")
+        check_cancelled(self.cancelled, f"stage {FINAL_STAGE}")
+        _logger.info(f"Installing dependencies of stage {FINAL_STAGE}")
+        return self._run_playbook(FINAL_STAGE)
+
     def _commit_container(
             self,
             container: DockerContainer,
@@ -201,15 +258,18 @@ class DssDockerImage:
 
     def _push(self):
         if self.registry is not None:
-            self.registry.push(self.repository, self.version)
-            self.registry.push(self.repository, "latest")
+            self.registry.push_tags(self.repository, [self.version, "latest"])
 
     def create(self):
         container = None
         try:
+            check_cancelled(self.cancelled, "start of container")
             container = self._start_container()
-            facts = self._install_dependencies()
+            check_cancelled(self.cancelled, "installation of dependencies")
+            facts = self._install_dependencies(container)
+            check_cancelled(self.cancelled, "commit of image")
             image = self._commit_container(container, facts)
+            check_cancelled(self.cancelled, "push of image")
             self._push()
         except Exception as ex:
             raise ex
@@ -1,11 +1,16 @@
 import json
-import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
 from typing import (
+    Any,
     Callable,
     Optional,
 )
 
 import docker
+import humanfriendly
 import requests
 from docker.client import DockerClient
 
@@ -18,57 +23,83 @@ from exasol.ds.sandbox.lib.logging import (
 _logger = get_status_logger(LogType.DOCKER_IMAGE)
 
 
-class ProgressReporter:
+@dataclass
+class LayerProgress:
+    status: str = ""
+    current: int = 0
+    total: Optional[int] = None
+
+
+class PushProgress:
     """
-    Optional parameter :verbosity: controls the verbosity. If :verbosity:
-    is :None: then report neither status nor progress.  If :verbosity: is a
-    float value then report every status change and this fraction of the progress
-    messages for a given status.
+    Aggregates the byte progress of the layers reported in the stream of
+    messages of a Docker push.
 
-    For example, if :verbosity: is set to 0.1 then report only every 10th progress message.
+    At most every :interval: seconds method update() calls :on_report:
+    with a summary of the transferred bytes, the throughput and the
+    estimated remaining time.
     """
     def __init__(
             self,
-            verbosity: Optional[float] = 1.0,
-            on_status: Callable = None,
-            on_progress: Callable = None,
+            name: str,
+            interval: float = 5.0,
+            clock: Callable[[], float] = time.monotonic,
+            on_report: Callable = None,
     ):
-        self._last_status = None
-        self._verbosity = verbosity
-        self._need_linefeed = False
-        self._on_status = on_status or _logger.info
-        self._on_progress = on_progress or print
-        self._suppressed = 0
-
-    def _report(self, printer: Callable, msg: Optional[str], **kwargs):
-        printer(msg, **kwargs)
-
-    def _linefeed(self):
-        if self._need_linefeed:
-            self._need_linefeed = False
-            self._on_progress()
-
-    def _needs_report(self, msg: Optional[str]):
-        if msg is None or self._verbosity is None:
-            return False
-        self._suppressed += 1
-        if self._suppressed * self._verbosity < 1:
-            return False
-        self._suppressed = 0
-        return True
-
-
-    def report(self, status: Optional[str], progress: Optional[str]):
-        if self._verbosity is None:
+        self.name = name
+        self.layers: dict[str, LayerProgress] = {}
+        self._interval = interval
+        self._clock = clock
+        self._on_report = on_report or _logger.info
+        self._start = clock()
+        self._last_report = self._start
+
+    @property
+    def current(self) -> int:
+        return sum(layer.current for layer in self.layers.values())
+
+    @property
+    def total(self) -> int:
+        return sum(layer.total or layer.current for layer in self.layers.values())
+
+    def update(self, message: dict[str, Any]):
+        layer_id = message.get("id")
+        if layer_id is None or "status" not in message:
             return
-        if status == self._last_status:
-            if self._needs_report(progress):
-                self._report(self._on_progress, progress, end="\r")
-                self._need_linefeed = progress
-        else:
-            self._last_status = status
-            self._linefeed()
-            self._report(self._on_status, status)
+        layer = self.layers.setdefault(layer_id, LayerProgress())
+        layer.status = message["status"]
+        detail = message.get("progressDetail") or {}
+        if "current" in detail:
+            layer.current = detail["current"]
+        if "total" in detail:
+            layer.total = detail["total"]
+        if layer.status == "Pushed" and layer.total is not None:
+            layer.current = layer.total
+        now = self._clock()
+        if now - self._last_report >= self._interval:
+            self._last_report = now
+            self._on_report(self.summary())
+
+    def summary(self) -> str:
+        elapsed = self._clock() - self._start
+        current = self.current
+        rate = current / elapsed if elapsed > 0 else 0
+        remaining = self.total - current
+        eta = humanfriendly.format_timespan(remaining / rate) if rate > 0 else "unknown"
+        return (
+            f"{self.name}: pushed {humanfriendly.format_size(current)}"
+            f" of {humanfriendly.format_size(self.total)}"
+            f" at {humanfriendly.format_size(rate)}/s, ETA {eta}"
+        )
+
+    def final_report(self) -> str:
+        elapsed = humanfriendly.format_timespan(self._clock() - self._start)
+        lines = [f"Pushed {self.name} in {elapsed}:"]
+        for layer_id, layer in self.layers.items():
+            size = humanfriendly.format_size(layer.current)
+            lines.append(f"- layer {layer_id}: {size} ({layer.status})")
+        lines.append(f"Total: {humanfriendly.format_size(self.current)}")
+        return "\n".join(lines)
 
 
 class DockerRegistry:
@@ -76,21 +107,23 @@ class DockerRegistry:
         self.username = username
         self.password = password
 
-    def push(self, repository: str, tag: str):
+    @cached_property
+    def client(self) -> DockerClient:
+        return docker.from_env()
+
+    def push(self, repository: str, tag: str) -> PushProgress:
         auth_config = {
             "username": self.username,
             "password": self.password,
         }
-        client = docker.from_env()
-        responses = client.images.push(
+        responses = self.client.images.push(
             repository=repository,
             tag=tag,
             auth_config=auth_config,
             stream=True,
             decode=True,
         )
-        verbosity = 0.01 if _logger.isEnabledFor(logging.INFO) else 0
-        reporter = ProgressReporter(verbosity)
+        progress = PushProgress(f"{repository}:{tag}")
         for resp in responses:
             el = DictAccessor(resp)
             if error := el.get("error"):
@@ -98,4 +131,18 @@ class DockerRegistry:
                 details = el.get("errorDetail", "message")
                 if details is not None and details != error:
                     _logger.error(f"Details: {details}")
-            reporter.report(el.get("status"), el.get("progress"))
+            progress.update(resp)
+        _logger.info(progress.final_report())
+        return progress
+
+    def push_tags(self, repository: str, tags: list[str]) -> list[PushProgress]:
+        """
+        Push the specified tags of the repository concurrently, sharing
+        the Docker client.  Layers common to the tags are uploaded only
+        once by the Docker daemon.
+        """
+        # create the shared client before starting the threads
+        self.client
+        with ThreadPoolExecutor(max_workers=len(tags) or 1) as executor:
+            futures = [executor.submit(self.push, repository, tag) for tag in tags]
+            return [f.result() for f in futures]
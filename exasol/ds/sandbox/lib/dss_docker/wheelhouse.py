@@ -0,0 +1,102 @@
+import hashlib
+from pathlib import Path
+
+import humanfriendly
+import importlib_resources
+
+from exasol.ds.sandbox.lib.logging import (
+    LogType,
+    get_status_logger,
+)
+from exasol.ds.sandbox.lib.setup_ec2.jupyter_venv_lock import current_lock_files
+
+_logger = get_status_logger(LogType.DOCKER_IMAGE)
+
+DEFAULT_WHEELHOUSE = Path.home() / ".cache" / "exasol-ai-lab" / "wheelhouse"
+CONTAINER_PATH = "/tmp/ai-lab-wheelhouse"
+REQUIREMENTS = ("jupyter_requirements.txt", "notebook_requirements.txt")
+# Python version of the Jupyter venv, see Ansible role jupyter
+PYTHON_VERSION = "python3.10"
+
+
+def _requirements_file(name: str) -> importlib_resources.abc.Traversable:
+    return (
+        importlib_resources
+        .files("exasol.ds.sandbox.runtime.ansible")
+        .joinpath("roles", "jupyter", "files", name)
+    )
+
+
+def _size(directory: Path) -> tuple[int, int]:
+    files = [f for f in directory.glob("*.whl") if f.is_file()]
+    return len(files), sum(f.stat().st_size for f in files)
+
+
+class Wheelhouse:
+    """
+    Directory on the build host containing the wheels for each of the
+    requirements files of the Jupyter venv. The directory is mounted into
+    the Docker container and the Ansible role jupyter installs the
+    requirements from the wheels only, building the wheels in advance if
+    they are missing.
+
+    The wheels for a requirements file are stored in a subdirectory named
+    after a hash of the Python version and the content of the file and of
+    its lock file, if present. Hence, changing the requirements leads to a
+    cache miss, while versions resolved for open version ranges are kept
+    until the requirements change or the subdirectory is removed.
+
+    As Docker does not commit the contents of mounted volumes, the wheels
+    do not become part of the image.
+    """
+    def __init__(self, path: Path = DEFAULT_WHEELHOUSE):
+        self.path = Path(path)
+
+    def directories(self) -> dict[str, str]:
+        """
+        Map each requirements file to the name of its subdirectory.
+        """
+        lock_files = current_lock_files()
+
+        def name(requirements: str) -> str:
+            content = _requirements_file(requirements).read_bytes()
+            if lock := lock_files.get(requirements):
+                content += _requirements_file(lock).read_bytes()
+            digest = hashlib.sha256(PYTHON_VERSION.encode("utf-8") + b"\0" + content)
+            return f"{Path(requirements).stem}-{digest.hexdigest()[:16]}"
+
+        return {r: name(r) for r in REQUIREMENTS}
+
+    def volumes(self) -> dict[str, dict[str, str]]:
+        self.path.mkdir(parents=True, exist_ok=True)
+        return {str(self.path): {"bind": CONTAINER_PATH, "mode": "rw"}}
+
+    def extra_vars(self) -> dict[str, dict[str, str]]:
+        return {"pip_wheelhouse": {
+            requirements: f"{CONTAINER_PATH}/{directory}"
+            for requirements, directory in self.directories().items()
+        }}
+
+    def cached(self) -> set[str]:
+        """
+        Return the requirements files with existing wheels.
+        """
+        return {
+            requirements for requirements, directory in self.directories().items()
+            if (self.path / directory).is_dir()
+        }
+
+    def report(self, cached_before: set[str]):
+        for requirements, directory in self.directories().items():
+            count, size = _size(self.path / directory)
+            size = humanfriendly.format_size(size)
+            if requirements in cached_before:
+                _logger.info(
+                    f"Wheel cache hit for {requirements}:"
+                    f" installed {count} wheels, saved downloading {size}"
+                )
+            else:
+                _logger.info(
+                    f"Wheel cache miss for {requirements}:"
+                    f" built {count} wheels with {size}"
+                )
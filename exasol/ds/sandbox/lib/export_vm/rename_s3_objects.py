@@ -22,7 +22,7 @@ def build_image_destination(prefix: str, asset_id: AssetId, vm_image_format: VmD
 
 def rename_image_in_s3(aws_access: AwsAccess, export_image_task: ExportImageTask,
                        vm_image_format: VmDiskImageFormat,
-                       asset_id: AssetId) -> None:
+                       asset_id: AssetId) -> str:
     """
     Renames the resulting S3 object of an export-image-task.
     The source objects always have the format "$export-image-task-id.$format".
@@ -33,6 +33,7 @@ def rename_image_in_s3(aws_access: AwsAccess, export_image_task: ExportImageTask
     :param vm_image_format: The image format of the virtual image object.
                             The file name suffix is derived from this information.
     :param asset_id: The asset-id. This information will be appended to the destination name.
+    Returns the key of the destination object.
     """
     source = build_image_source(prefix=export_image_task.s3_prefix,
                                 export_image_task_id=export_image_task.id,
@@ -41,3 +42,4 @@ def rename_image_in_s3(aws_access: AwsAccess, export_image_task: ExportImageTask
                                    vm_image_format=vm_image_format)
     aws_access.copy_large_s3_object(bucket=export_image_task.s3_bucket, source=source, dest=dest)
     aws_access.delete_s3_object(bucket=export_image_task.s3_bucket, source=source)
+    return dest
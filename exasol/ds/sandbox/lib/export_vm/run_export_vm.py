@@ -1,13 +1,15 @@
-import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from exasol.ds.sandbox.lib.asset_id import AssetId
 from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.aws_access.export_image_task import ExportImageTask
+from exasol.ds.sandbox.lib.checkpoints import AMI_CREATED, Checkpoints, export_started, image_renamed
 from exasol.ds.sandbox.lib.export_vm.rename_s3_objects import rename_image_in_s3
 from exasol.ds.sandbox.lib.logging import get_status_logger, LogType
 from exasol.ds.sandbox.lib.config import ConfigObject
+from exasol.ds.sandbox.lib.polling import Backoff, BackoffConfig, poll
 from exasol.ds.sandbox.lib.setup_ec2.cf_stack import find_ec2_instance_in_cf_stack
 from exasol.ds.sandbox.lib.asset_printing.print_assets import print_assets
 from exasol.ds.sandbox.lib.export_vm.vm_disk_image_format import VmDiskImageFormat
@@ -30,36 +32,53 @@ class ExportImageTaskProgress:
         return ExportImageTaskProgress(progress=export_image_task.progress, status=export_image_task.status)
 
 
-def poll_export_image_task(aws_access: AwsAccess, export_image_task: ExportImageTask,
-                           configuration: ConfigObject) -> ExportImageTask:
+def poll_export_image_tasks(aws_access: AwsAccess, export_image_tasks: List[ExportImageTask],
+                            configuration: ConfigObject) -> Iterator[List[ExportImageTask]]:
     """
-    Checks a started exported-image-task in a loop until it completes or fails.
+    Checks the given started export-image-tasks in a loop until all of them completed or failed.
+    All tasks which are still active are checked with a single request.
+    The delay between the checks backs off exponentially, but shrinks again when any task made progress.
+    After each check the function yields the tasks which completed or failed since the previous check,
+    which allows the client to process these tasks while the others are still running.
     :param aws_access: Aws Access proxy
-    :param export_image_task:  the newly started export image task object.
+    :param export_image_tasks: the newly started export image task objects.
     :param configuration: The global configuration object.
-    :return: The export-image-task object after the task has completed or failed.
-    """
-    last_progress = ExportImageTaskProgress.from_export_image_task(export_image_task)
-    while export_image_task.is_active:
-        time.sleep(configuration.time_to_wait_for_polling)
-        export_image_task = aws_access.get_export_image_task(export_image_task.id)
-        progress = ExportImageTaskProgress.from_export_image_task(export_image_task)
-        if last_progress != progress:
-            LOG.info(f"still running export of vm image to "
-                     f"{export_image_task.s3_bucket}/{export_image_task.s3_prefix}: "
-                     f"{progress} ")
-            last_progress = progress
-    return export_image_task
+    :return: Iterator over lists of export-image-task objects after the tasks have completed or failed.
+    """
+    last_progress = {task.id: ExportImageTaskProgress.from_export_image_task(task)
+                     for task in export_image_tasks}
+    active = [task.id for task in export_image_tasks if task.is_active]
+    yield [task for task in export_image_tasks if not task.is_active]
+    backoff = Backoff(BackoffConfig.from_config(configuration))
+    progressed = False
+    while active:
+        backoff.sleep(progressed)
+        progressed = False
+        finished = []
+        for export_image_task in aws_access.get_export_image_tasks(list(active)):
+            if not export_image_task.is_active:
+                active.remove(export_image_task.id)
+                finished.append(export_image_task)
+                continue
+            progress = ExportImageTaskProgress.from_export_image_task(export_image_task)
+            if last_progress[export_image_task.id] != progress:
+                LOG.info(f"still running export of vm image to "
+                         f"{export_image_task.s3_bucket}/{export_image_task.s3_prefix}: "
+                         f"{progress} ")
+                last_progress[export_image_task.id] = progress
+                progressed = True
+        yield finished
 
 
-def export_vm_image(aws_access: AwsAccess, vm_image_format: VmDiskImageFormat, tag_value: str,
-                    ami_id: str, vmimport_role: str, vm_bucket: str, asset_id: AssetId,
-                    configuration: ConfigObject):
+def start_export_vm_image(aws_access: AwsAccess, vm_image_format: VmDiskImageFormat, tag_value: str,
+                          ami_id: str, vmimport_role: str, vm_bucket: str,
+                          asset_id: AssetId) -> ExportImageTask:
     """
-    Exports an AMI (parameter ami_id) to a VM image in the given S3-Bucket (parameter vm_bucket)
+    Starts exporting an AMI (parameter ami_id) to a VM image in the given S3-Bucket (parameter vm_bucket)
     at prefix (parameter bucket_prefix). The format of the VM is given by parameter vm_image_format.
     The export-image-task will be tagged with parameter tag_value. This action requires a AWS-role with sufficient
     permissions; this role needs to be defined by parameter vmimport_role.
+    Returns the newly started export-image-task.
     """
     LOG.info(f"export ami to vm with format '{vm_image_format}'")
     export_image_task_id = \
@@ -71,58 +90,174 @@ def export_vm_image(aws_access: AwsAccess, vm_image_format: VmDiskImageFormat, t
     export_image_task = aws_access.get_export_image_task(export_image_task_id)
     LOG.info(f"Started export of vm image to {vm_bucket}/{asset_id.bucket_prefix}. "
              f"Status message is {export_image_task.status_message}.")
-    export_image_task = poll_export_image_task(aws_access, export_image_task, configuration)
-    if not export_image_task.is_completed:
-        raise RuntimeError(f"Export of VM failed: status message was {export_image_task.status_message}")
-    rename_image_in_s3(aws_access, export_image_task, vm_image_format, asset_id=asset_id)
+    return export_image_task
 
 
-def export_vm_images(aws_access: AwsAccess, vm_image_formats: Tuple[str, ...], tag_value: str,
-                     ami_id: str, vmimport_role: str, vm_bucket: str,
-                     asset_id: AssetId, configuration: ConfigObject):
-    for vm_image_format in vm_image_formats:
+def cancel_export_image_tasks(aws_access: AwsAccess, export_image_task_ids: Iterable[str]) -> None:
+    for export_image_task_id in export_image_task_ids:
         try:
-            export_vm_image(aws_access, VmDiskImageFormat[vm_image_format], tag_value,
-                            ami_id, vmimport_role, vm_bucket, asset_id, configuration)
+            LOG.info(f"Cancelling export image task {export_image_task_id}")
+            aws_access.cancel_export_task(export_image_task_id)
         except Exception as e:
-            raise RuntimeError(f"Failed to export VM to bucket {vm_bucket} at {asset_id.bucket_prefix}\n") from e
+            LOG.warning(f"Failed to cancel export image task {export_image_task_id}: {e}")
+
+
+def _raise_on_failed_rename(renames: List[Future]) -> None:
+    for rename in renames:
+        if rename.done() and rename.exception() is not None:
+            raise rename.exception()
+
+
+def _s3_object_exists(aws_access: AwsAccess, bucket: str, key: str) -> bool:
+    return any(s3_object.key == key for s3_object in aws_access.list_s3_objects(bucket, key, max_results=1))
+
+
+def _resumable_export_image_task(aws_access: AwsAccess, checkpoints: Checkpoints,
+                                 vm_image_format: str) -> Optional[ExportImageTask]:
+    """
+    Returns the export-image-task recorded for the given VM image format, if it is still active
+    or has completed, otherwise None.
+    """
+    export_image_task_id = checkpoints.get(export_started(vm_image_format))
+    if export_image_task_id is None:
+        return None
+    try:
+        export_image_task = aws_access.get_export_image_task(export_image_task_id)
+    except Exception as e:
+        LOG.info(f"Could not find export image task {export_image_task_id}: {e}")
+        return None
+    if not (export_image_task.is_active or export_image_task.is_completed):
+        LOG.info(f"Export image task {export_image_task_id} has status {export_image_task.status}, restarting it.")
+        return None
+    LOG.info(f"Resuming export image task {export_image_task_id} for format {vm_image_format} "
+             f"with status {export_image_task.status}.")
+    return export_image_task
+
+
+def resumable_ami(aws_access: AwsAccess, checkpoints: Checkpoints) -> Optional[str]:
+    """
+    Returns the id of the AMI recorded in the checkpoints, if the AMI is still available, otherwise None.
+    In the latter case all checkpoints depending on the AMI are discarded.
+    """
+    ami_id = checkpoints.get(AMI_CREATED)
+    if ami_id is None:
+        return None
+    try:
+        ami = aws_access.get_ami(ami_id)
+        if ami.is_available:
+            LOG.info(f"Resuming with existing AMI {ami_id}.")
+            return ami_id
+        LOG.info(f"AMI {ami_id} is {ami.state}, creating a new one.")
+    except Exception as e:
+        LOG.info(f"Could not find AMI {ami_id}, creating a new one: {e}")
+    checkpoints.discard(AMI_CREATED, *(
+        stage(vm_image_format.name)
+        for vm_image_format in VmDiskImageFormat
+        for stage in (export_started, image_renamed)
+    ))
+    return None
+
+
+def export_vm_images(aws_access: AwsAccess, vm_image_formats: Tuple[str, ...], tag_value: str,
+                     ami_id: str, vmimport_role: str, vm_bucket: str,
+                     asset_id: AssetId, configuration: ConfigObject,
+                     checkpoints: Optional[Checkpoints] = None):
+    """
+    Starts the export-image-tasks for all given VM image formats at once and polls them together.
+    The resulting S3 object of each export-image-task is renamed as soon as the task has completed,
+    while the other tasks are still running.
+    If any export or rename fails, then all export-image-tasks which are still active will be cancelled.
+
+    The checkpoints record the id of each export-image-task and the key of each renamed S3 object.
+    When resuming, formats with an existing renamed S3 object are skipped and export-image-tasks which
+    are still active or have completed are polled again instead of starting new ones.
+    """
+    checkpoints = checkpoints or Checkpoints(str(asset_id), path=None)
+    formats: Dict[str, VmDiskImageFormat] = {}
+    pending: Set[str] = set()
+
+    def rename(export_image_task: ExportImageTask, disk_format: VmDiskImageFormat) -> None:
+        dest = rename_image_in_s3(aws_access, export_image_task, disk_format, asset_id=asset_id)
+        checkpoints.record(image_renamed(disk_format.name), dest)
+
+    try:
+        export_image_tasks = []
+        for vm_image_format in vm_image_formats:
+            disk_format = VmDiskImageFormat[vm_image_format]
+            renamed = checkpoints.get(image_renamed(vm_image_format))
+            if renamed is not None and _s3_object_exists(aws_access, vm_bucket, renamed):
+                LOG.info(f"Skipping export of format {vm_image_format}, found {vm_bucket}/{renamed}.")
+                continue
+            export_image_task = _resumable_export_image_task(aws_access, checkpoints, vm_image_format)
+            if export_image_task is None:
+                export_image_task = start_export_vm_image(aws_access, disk_format, tag_value, ami_id,
+                                                          vmimport_role, vm_bucket, asset_id)
+                checkpoints.record(export_started(vm_image_format), export_image_task.id)
+            formats[export_image_task.id] = disk_format
+            pending.add(export_image_task.id)
+            export_image_tasks.append(export_image_task)
+        with ThreadPoolExecutor(max_workers=max(len(formats), 1)) as executor:
+            renames = []
+            try:
+                for finished in poll_export_image_tasks(aws_access, export_image_tasks, configuration):
+                    _raise_on_failed_rename(renames)
+                    for export_image_task in finished:
+                        pending.remove(export_image_task.id)
+                        if not export_image_task.is_completed:
+                            raise RuntimeError(f"Export of VM failed: status message was "
+                                               f"{export_image_task.status_message}")
+                        renames.append(executor.submit(rename, export_image_task, formats[export_image_task.id]))
+                for rename_future in renames:
+                    rename_future.result()
+            except Exception:
+                # Leaving the executor waits for the renames in progress, which copy
+                # large S3 objects, hence cancel the exports before.
+                cancel_export_image_tasks(aws_access, pending)
+                pending.clear()
+                raise
+    except Exception as e:
+        cancel_export_image_tasks(aws_access, pending)
+        raise RuntimeError(f"Failed to export VM to bucket {vm_bucket} at {asset_id.bucket_prefix}\n") from e
 
 
 def create_ami(aws_access: AwsAccess, ami_name: str, tag_value: str,
-               instance_id: str, configuration: ConfigObject) -> str:
+               instance_id: str, configuration: ConfigObject,
+               extra_tags: Optional[Dict[str, str]] = None) -> str:
     """
     Creates a new AMI with the given name (parameter ami_name) for the EC2-Instance identified by parameter instance_id.
-    The AMI will be tagged with given tag_value.
+    The AMI will be tagged with given tag_value and the optional extra_tags.
     :raises RuntimeError if an error occured during creation of the AMI
     Returns the ami_id if the export-image-task succeeded.
     """
     LOG.info(f"create ami with name '{ami_name}' and tag(s) '{tag_value}'")
     ami_id = aws_access.create_image_from_ec2_instance(instance_id, name=ami_name, tag_value=tag_value,
-                                                       description="Image Description")
+                                                       description="Image Description", extra_tags=extra_tags)
 
-    ami = aws_access.get_ami(ami_id)
-    while ami.is_pending:
-        LOG.info(f"ami  with name '{ami.name}' and tag(s) '{tag_value}'  still pending...")
-        time.sleep(configuration.time_to_wait_for_polling)
-        ami = aws_access.get_ami(ami_id)
+    ami = poll(
+        lambda: aws_access.get_ami(ami_id),
+        until=lambda ami: not ami.is_pending,
+        backoff=Backoff(BackoffConfig.from_config(configuration)),
+        on_pending=lambda ami: LOG.info(f"ami  with name '{ami.name}' and tag(s) '{tag_value}'  still pending..."),
+    )
     if not ami.is_available:
         raise RuntimeError(f"Failed to create ami! ami state is '{ami.state}'")
     return ami_id
 
 
-def export_vm(aws_access: AwsAccess,
-              instance_id: str,
-              vm_image_formats: Tuple[str, ...],
-              asset_id: AssetId,
-              configuration: ConfigObject) -> None:
+def _export(aws_access: AwsAccess,
+            get_ami_id: Callable[[], str],
+            vm_image_formats: Tuple[str, ...],
+            asset_id: AssetId,
+            configuration: ConfigObject,
+            checkpoints: Optional[Checkpoints]) -> None:
     vm_s3_bucket = VmBucketCfTemplate(aws_access)
     vm_bucket = vm_s3_bucket.id
     vmimport_role = vm_s3_bucket.import_role
     tag_value = asset_id.tag_value
     try:
-        ami_id = create_ami(aws_access, asset_id.ami_name, tag_value, instance_id, configuration)
+        ami_id = get_ami_id()
         export_vm_images(aws_access, vm_image_formats, tag_value, ami_id, vmimport_role, vm_bucket,
-                         asset_id, configuration)
+                         asset_id, configuration, checkpoints)
     except Exception as e:
         print_assets(aws_access=aws_access, asset_id=asset_id, out_file_obj=None)
         LOG.warning(f"VM Export finished for: {asset_id.ami_name}. There were errors. "
@@ -132,6 +267,33 @@ def export_vm(aws_access: AwsAccess,
     LOG.info(f"VM Export finished for: {asset_id.ami_name} without any errors")
 
 
+def export_vm(aws_access: AwsAccess,
+              instance_id: str,
+              vm_image_formats: Tuple[str, ...],
+              asset_id: AssetId,
+              configuration: ConfigObject,
+              checkpoints: Optional[Checkpoints] = None) -> None:
+    def get_ami_id() -> str:
+        ami_id = create_ami(aws_access, asset_id.ami_name, asset_id.tag_value, instance_id, configuration)
+        if checkpoints is not None:
+            checkpoints.record(AMI_CREATED, ami_id)
+        return ami_id
+
+    _export(aws_access, get_ami_id, vm_image_formats, asset_id, configuration, checkpoints)
+
+
+def export_ami(aws_access: AwsAccess,
+               ami_id: str,
+               vm_image_formats: Tuple[str, ...],
+               asset_id: AssetId,
+               configuration: ConfigObject,
+               checkpoints: Optional[Checkpoints] = None) -> None:
+    """
+    Exports the VM images from an existing AMI, e.g. when resuming command create-vm.
+    """
+    _export(aws_access, lambda: ami_id, vm_image_formats, asset_id, configuration, checkpoints)
+
+
 def run_export_vm(aws_access: AwsAccess,
                   stack_name: str,
                   vm_image_formats: Tuple[str, ...],
@@ -8,7 +8,7 @@ LOG = get_status_logger(LogType.EXPORT)
 
 def run_make_ami_public(aws_access: AwsAccess, asset_id: AssetId):
     """Modifies all AMI's with matching asset-id so that they become publicly available."""
-    amis = aws_access.list_amis(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [asset_id.tag_value]}])
+    amis = list(aws_access.list_amis(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}', 'Values': [asset_id.tag_value]}]))
     LOG.info(f"Found {len(amis)} for asset-id {asset_id}")
     make_public_launch_permission = {
         'Add': [
@@ -1,8 +1,6 @@
 import logging
 from enum import Enum
 
-from rich.logging import RichHandler
-
 SUPPORTED_LOG_LEVELS = {"normal": logging.WARNING, "info": logging.INFO, "debug": logging.DEBUG}
 
 
@@ -25,6 +23,9 @@ def get_status_logger(log_type: LogType) -> logging.Logger:
 
 
 def set_log_level(level: str):
+    # rich is imported only here to keep the startup of the CLI fast
+    from rich.logging import RichHandler
+
     try:
         target_level = SUPPORTED_LOG_LEVELS[level]
         logging.basicConfig(level=target_level, datefmt="[%X]",
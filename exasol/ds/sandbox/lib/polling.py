@@ -0,0 +1,143 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+
+from exasol.ds.sandbox.lib.config import ConfigObject
+
+T = TypeVar("T")
+
+
+class PollingTimeout(RuntimeError):
+    """
+    The polled condition was not met before the deadline.
+    """
+
+
+class Clock:
+    """
+    Provides the current time and sleeping to class Backoff.
+    Tests can replace it by a fake clock.
+    """
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+@dataclass(frozen=True)
+class BackoffConfig:
+    """
+    Configuration for class Backoff, all durations are in seconds.
+
+    initial_delay: delay before the second attempt and after progress was detected.
+    max_delay: cap for the delay between two attempts.
+    factor: the delay is multiplied by this factor after each attempt without progress.
+    jitter: relative random deviation of each delay, e.g. 0.1 for +/- 10%.
+    timeout: overall deadline for polling, None for no deadline.
+    """
+    initial_delay: float = 5.0
+    max_delay: float = 60.0
+    factor: float = 1.5
+    jitter: float = 0.1
+    timeout: Optional[float] = None
+
+    @staticmethod
+    def from_config(configuration: ConfigObject) -> "BackoffConfig":
+        max_delay = configuration.time_to_wait_for_polling
+        return BackoffConfig(
+            initial_delay=min(configuration.polling_initial_delay, max_delay),
+            max_delay=max_delay,
+            factor=configuration.polling_backoff_factor,
+            timeout=configuration.polling_timeout,
+        )
+
+
+class Backoff:
+    """
+    Sleeps between the attempts of a polling loop using exponential backoff
+    with jitter, a cap for the delay, and an overall deadline.
+
+    If the polled resource made progress since the previous attempt, the
+    delay is reset to the initial delay, so that polling gets faster again
+    while the resource is changing.
+    """
+
+    def __init__(
+            self,
+            config: BackoffConfig,
+            clock: Optional[Clock] = None,
+            rand: Callable[[], float] = random.random,
+    ):
+        self._config = config
+        self._clock = clock or Clock()
+        self._random = rand
+        self._delay = config.initial_delay
+        self._deadline = (
+            None if config.timeout is None
+            else self._clock.monotonic() + config.timeout
+        )
+
+    @property
+    def next_delay(self) -> float:
+        """
+        Delay of the next call to sleep() without progress and jitter.
+        """
+        return self._delay
+
+    def sleep(self, progressed: bool = False) -> None:
+        """
+        Sleeps before the next attempt.
+
+        :param progressed: True if the polled resource made progress since
+               the previous attempt.
+        :raises PollingTimeout: if the deadline is exceeded.
+        """
+        if progressed:
+            self._delay = self._config.initial_delay
+        jitter = self._config.jitter * (2 * self._random() - 1)
+        delay = min(self._delay * (1 + jitter), self._config.max_delay)
+        if self._deadline is not None:
+            remaining = self._deadline - self._clock.monotonic()
+            if remaining <= 0:
+                raise PollingTimeout(
+                    f"Polling did not finish within {self._config.timeout} seconds.")
+            delay = min(delay, remaining)
+        self._clock.sleep(delay)
+        self._delay = min(self._delay * self._config.factor, self._config.max_delay)
+
+
+def poll(
+        fetch: Callable[[], T],
+        until: Callable[[T], bool],
+        backoff: Backoff,
+        progress: Optional[Callable[[T], Any]] = None,
+        on_pending: Optional[Callable[[T], None]] = None,
+) -> T:
+    """
+    Calls fetch() repeatedly until its result satisfies the condition until(),
+    sleeping between the attempts as defined by parameter backoff.
+
+    :param progress: Optional function extracting the progress from a result
+           of fetch(). If the progress changed since the previous attempt, the
+           backoff starts again with its initial delay.
+    :param on_pending: Optional function called with each result not yet
+           satisfying the condition, e.g. for logging.
+    :return: The first result satisfying the condition.
+    :raises PollingTimeout: if the deadline of the backoff is exceeded.
+    """
+    result = fetch()
+    last_progress = progress(result) if progress else None
+    progressed = False
+    while not until(result):
+        if on_pending:
+            on_pending(result)
+        backoff.sleep(progressed)
+        result = fetch()
+        if progress:
+            current_progress = progress(result)
+            progressed = current_progress != last_progress
+            last_progress = current_progress
+    return result
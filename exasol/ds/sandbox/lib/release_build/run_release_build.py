@@ -1,5 +1,6 @@
 import logging
 import os
+import threading
 
 from exasol.ds.sandbox.lib.asset_id import AssetId
 from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
@@ -13,7 +14,14 @@ from exasol.ds.sandbox.lib.dss_docker import (
 )
 from exasol.ds.sandbox.lib.export_vm.vm_disk_image_format import VmDiskImageFormat
 from exasol.ds.sandbox.lib.logging import get_status_logger, LogType
+from exasol.ds.sandbox.lib.release_build.task_graph import (
+    FailurePolicy,
+    Task,
+    TaskGraph,
+)
+from exasol.ds.sandbox.lib.render_template import precompile_templates
 from exasol.ds.sandbox.lib.run_create_vm import run_create_vm
+from exasol.ds.sandbox.lib.setup_ec2.jupyter_venv_lock import ensure_lock_files
 
 LOG = get_status_logger(LogType.RELEASE_BUILD)
 DEFAULT_RELEASE_USER = "release_user"
@@ -50,7 +58,13 @@ def run_start_release_build(
         publish: bool = False,
         repository: str = DEFAULT_ORG_AND_REPOSITORY,
         asset_id: str | None = None,
+        failure_policy: FailurePolicy = FailurePolicy.FAIL_FAST,
+        resume: bool = False,
 ) -> None:
+    """
+    Build the VM images and the Docker image concurrently, as both
+    pipelines share nothing but the asset id and the Ansible roles.
+    """
     release_asset_id = asset_id or config.ai_lab_version
     logging.info(
         "run_start_release_build for repository %s and asset id %s",
@@ -58,19 +72,37 @@ def run_start_release_build(
         release_asset_id,
     )
     registry = _docker_registry(publish)
-    run_create_vm(
-        aws_access=aws_access,
-        ec2_instance_type="t2.medium",
-        ec2_source_ami=None,
-        ec2_key_file=None,
-        ec2_key_name=None,
-        default_password=_release_default_password(),
-        vm_image_formats=VmDiskImageFormat.default_formats(),
-        asset_id=AssetId(release_asset_id),
-        configuration=config,
-        user_name=os.getenv("AWS_USER_NAME", DEFAULT_RELEASE_USER),
-        make_ami_public=publish,
-    )
+    default_password = _release_default_password()
+    # Surface syntax errors in the templates before the builds access AWS.
+    precompile_templates()
+    # Both builds install the Jupyter venv from the lock files, see Ansible
+    # role jupyter, hence generate them before starting the builds.
+    ensure_lock_files(config.ai_lab_version)
+    # Set by the task graph to stop the other build after a failure.
+    cancelled = threading.Event()
+
+    def create_vm():
+        run_create_vm(
+            aws_access=aws_access,
+            ec2_instance_type="t2.medium",
+            ec2_source_ami=None,
+            ec2_key_file=None,
+            ec2_key_name=None,
+            default_password=default_password,
+            vm_image_formats=VmDiskImageFormat.default_formats(),
+            asset_id=AssetId(release_asset_id),
+            configuration=config,
+            user_name=os.getenv("AWS_USER_NAME", DEFAULT_RELEASE_USER),
+            make_ami_public=publish,
+            resume=resume,
+            cancelled=cancelled,
+        )
+
     creator = DssDockerImage(repository, release_asset_id)
     creator.registry = registry
-    creator.create()
+    creator.cancelled = cancelled
+    TaskGraph(
+        [Task("vm", create_vm), Task("docker", creator.create)],
+        policy=failure_policy,
+        cancelled=cancelled,
+    ).run()
@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+import humanfriendly
+
+from exasol.ds.sandbox.lib.cancellation import Cancelled
+from exasol.ds.sandbox.lib.logging import (
+    LogType,
+    get_status_logger,
+)
+
+LOG = get_status_logger(LogType.RELEASE_BUILD)
+
+
+class FailurePolicy(Enum):
+    """
+    FAIL_FAST: After the first failure do not start any further tasks,
+    set the cancellation event to ask the running tasks to stop before
+    their next stage, wait for them, and raise the error.
+
+    FAIL_LATE: Run all tasks not depending on a failed task and raise the
+    first error at the end.
+    """
+    FAIL_FAST = "fail-fast"
+    FAIL_LATE = "fail-late"
+
+
+class TaskStatus(Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable[[], Any]
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class TaskResult:
+    status: TaskStatus
+    duration: float = 0.0
+    error: Optional[BaseException] = None
+
+
+class TaskGraphError(RuntimeError):
+    def __init__(self, failed: dict[str, BaseException]):
+        names = ", ".join(failed)
+        super().__init__(f"Failed tasks: {names}")
+        self.failed = failed
+
+
+class BranchLogFilter(logging.Filter):
+    """
+    Prefix the messages logged by the thread of a task with the name of
+    the task.
+    """
+    def __init__(self):
+        super().__init__()
+        self._branches: dict[int, str] = {}
+
+    def register(self, name: str):
+        self._branches[threading.get_ident()] = name
+
+    def unregister(self):
+        self._branches.pop(threading.get_ident(), None)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        branch = self._branches.get(record.thread)
+        if branch is not None and not getattr(record, "branch", None):
+            record.branch = branch
+            record.msg = f"[{branch}] {record.msg}"
+        return True
+
+
+class TaskGraph:
+    """
+    Run the tasks concurrently in threads, each task as soon as all of
+    the tasks it depends on have succeeded.
+
+    The tasks are expected to check the cancellation event between their
+    stages, see exasol.ds.sandbox.lib.cancellation.check_cancelled.
+    """
+    def __init__(
+            self,
+            tasks: list[Task],
+            policy: FailurePolicy = FailurePolicy.FAIL_FAST,
+            clock: Callable[[], float] = time.monotonic,
+            cancelled: Optional[threading.Event] = None,
+    ):
+        names = {t.name for t in tasks}
+        for task in tasks:
+            if unknown := set(task.depends_on) - names:
+                raise ValueError(f"Task {task.name} depends on unknown tasks {unknown}")
+        self.tasks = {t.name: t for t in tasks}
+        self.policy = policy
+        self.results: dict[str, TaskResult] = {}
+        self.duration = 0.0
+        self._clock = clock
+        self.cancelled = cancelled or threading.Event()
+        self._log_filter = BranchLogFilter()
+
+    def _run_task(self, task: Task) -> TaskResult:
+        self._log_filter.register(task.name)
+        start = self._clock()
+        try:
+            LOG.info("Started")
+            task.func()
+            return TaskResult(TaskStatus.SUCCEEDED, self._clock() - start)
+        except Cancelled as ex:
+            LOG.warning(f"Task {task.name} stopped: {ex}")
+            return TaskResult(TaskStatus.CANCELLED, self._clock() - start, ex)
+        except Exception as ex:
+            LOG.error(f"Task {task.name} failed: {ex}")
+            return TaskResult(TaskStatus.FAILED, self._clock() - start, ex)
+        finally:
+            self._log_filter.unregister()
+
+    def _ready(self, name: str) -> bool:
+        return all(
+            d in self.results and self.results[d].status == TaskStatus.SUCCEEDED
+            for d in self.tasks[name].depends_on
+        )
+
+    def _blocked(self, name: str) -> bool:
+        return any(
+            d in self.results and self.results[d].status != TaskStatus.SUCCEEDED
+            for d in self.tasks[name].depends_on
+        )
+
+    def _schedule(self, executor: ThreadPoolExecutor, pending: set[str], running: dict):
+        for name in sorted(pending):
+            if self._blocked(name):
+                pending.remove(name)
+                self.results[name] = TaskResult(TaskStatus.SKIPPED)
+            elif self._ready(name):
+                pending.remove(name)
+                running[executor.submit(self._run_task, self.tasks[name])] = name
+
+    def _handlers(self) -> list[logging.Handler]:
+        return logging.getLogger().handlers
+
+    def run(self):
+        for handler in self._handlers():
+            handler.addFilter(self._log_filter)
+        start = self._clock()
+        executor = ThreadPoolExecutor(max_workers=len(self.tasks) or 1)
+        running: dict[Future, str] = {}
+        try:
+            pending = set(self.tasks)
+            while pending or running:
+                self._schedule(executor, pending, running)
+                if not running:
+                    if pending:
+                        raise ValueError(f"Cyclic dependencies between tasks {pending}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.results[name] = result = future.result()
+                    if result.status == TaskStatus.FAILED \
+                            and self.policy == FailurePolicy.FAIL_FAST:
+                        # The loop continues until the running tasks
+                        # have stopped.
+                        self.cancelled.set()
+                        for other in pending:
+                            self.results[other] = TaskResult(TaskStatus.SKIPPED)
+                        pending.clear()
+        finally:
+            if running:
+                self.cancelled.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future, name in running.items():
+                self.results[name] = (
+                    TaskResult(TaskStatus.SKIPPED) if future.cancelled()
+                    else future.result()
+                )
+            self.duration = self._clock() - start
+            for handler in self._handlers():
+                handler.removeFilter(self._log_filter)
+            LOG.info(self.summary())
+        failed = {
+            name: result.error for name, result in self.results.items()
+            if result.status == TaskStatus.FAILED
+        }
+        # Tasks may also have been cancelled by the caller of the graph.
+        failed = failed or {
+            name: result.error for name, result in self.results.items()
+            if result.status == TaskStatus.CANCELLED
+        }
+        if failed:
+            raise TaskGraphError(failed) from next(iter(failed.values()))
+
+    def summary(self) -> str:
+        lines = ["Timing summary:"]
+        for name in self.tasks:
+            result = self.results.get(name)
+            if result is None:
+                lines.append(f"- {name}: not started")
+                continue
+            duration = humanfriendly.format_timespan(result.duration)
+            lines.append(f"- {name}: {result.status.value} after {duration}")
+        total = humanfriendly.format_timespan(self.duration)
+        sequential = humanfriendly.format_timespan(
+            sum(r.duration for r in self.results.values()))
+        lines.append(f"Total: {total} (sequential: {sequential})")
+        return "\n".join(lines)
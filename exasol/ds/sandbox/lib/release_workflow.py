@@ -8,6 +8,7 @@ from exasol.ds.sandbox.lib.check_release import get_poetry_version, validate_rel
 from exasol.ds.sandbox.lib.config import default_config_object
 from exasol.ds.sandbox.lib.release_build.run_release_build import run_start_release_build
 from exasol.ds.sandbox.lib.release_notes import write_release_notes
+from exasol.ds.sandbox.lib.render_template import precompile_templates
 from exasol.ds.sandbox.lib.release_tag import release_version_from_tag
 
 
@@ -73,6 +74,8 @@ def run_check(context: ReleaseContext) -> None:
         validate_release("")
     else:
         validate_release(context.release_tag)
+    # Surface syntax errors in the templates before the build accesses AWS.
+    precompile_templates()
 
 
 def run_build(context: ReleaseContext, aws_access: AwsAccess) -> None:
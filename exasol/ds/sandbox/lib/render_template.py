@@ -1,15 +1,76 @@
+import os
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import (
+    List,
+    Optional,
+)
+
 import jinja2
 from jinja2 import StrictUndefined
 
+# Maximum number of compiled templates kept in memory by the environment.
+TEMPLATE_CACHE_SIZE = 64
+
+# Name of the environment variable for a directory caching the bytecode of
+# the compiled templates across processes.
+BYTECODE_CACHE_ENV = "AI_LAB_TEMPLATE_BYTECODE_CACHE"
+
+
+def create_environment(bytecode_cache_dir: Optional[Path] = None) -> jinja2.Environment:
+    """
+    Create a Jinja2 environment for the templates in package
+    exasol.ds.sandbox. The templates are part of the package and do not
+    change at runtime, so the environment does not check them for updates.
+    """
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(str(bytecode_cache_dir))
+    return jinja2.Environment(loader=jinja2.PackageLoader("exasol.ds.sandbox"),
+                              autoescape=jinja2.select_autoescape(), keep_trailing_newline=True,
+                              undefined=StrictUndefined,
+                              cache_size=TEMPLATE_CACHE_SIZE,
+                              auto_reload=False,
+                              bytecode_cache=bytecode_cache)
+
+
+@lru_cache(maxsize=1)
+def environment() -> jinja2.Environment:
+    """
+    Return the environment shared by all renderings, using a bytecode
+    cache if environment variable BYTECODE_CACHE_ENV is set.
+    """
+    cache_dir = os.environ.get(BYTECODE_CACHE_ENV)
+    return create_environment(Path(cache_dir) if cache_dir else None)
+
 
 def render_template(template: str, **kwargs):
-    env = jinja2.Environment(loader=jinja2.PackageLoader("exasol.ds.sandbox"),
-                             autoescape=jinja2.select_autoescape(), keep_trailing_newline=True,
-                             undefined=StrictUndefined)
-    t = env.get_template(template)
+    t = environment().get_template(template)
     return t.render(**kwargs)
 
 
+def precompile_templates(env: Optional[jinja2.Environment] = None) -> List[str]:
+    """
+    Compile all templates of the environment, i.e. all files with suffix
+    .jinja, storing the bytecode in its bytecode cache, if any, and return
+    the names of the templates.
+
+    Raise a RuntimeError listing all templates with syntax errors.
+    """
+    env = env or environment()
+    names = env.list_templates(filter_func=lambda name: ".jinja" in PurePosixPath(name).suffixes)
+    errors = []
+    for name in names:
+        try:
+            env.get_template(name)
+        except jinja2.TemplateSyntaxError as ex:
+            errors.append(f"{name}:{ex.lineno}: {ex.message}")
+    if errors:
+        raise RuntimeError("Invalid templates:\n" + "\n".join(errors))
+    return names
+
+
 class TemplateRenderer:
     def render(self, template: str, **kwargs):
         return render_template(template, **kwargs)
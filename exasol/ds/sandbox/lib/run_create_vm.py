@@ -1,4 +1,5 @@
-import time
+import threading
+from pathlib import Path
 from typing import Optional, Tuple
 
 import exasol.ansible as ansible
@@ -10,11 +11,29 @@ from exasol.ds.sandbox.lib.setup_ec2.ansible_execution import (
 
 from exasol.ds.sandbox.lib.asset_id import AssetId
 from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+from exasol.ds.sandbox.lib.cancellation import check_cancelled
+from exasol.ds.sandbox.lib.checkpoints import (
+    DEFAULT_CHECKPOINT_FILE,
+    Checkpoints,
+)
 from exasol.ds.sandbox.lib.config import ConfigObject
-from exasol.ds.sandbox.lib.export_vm.run_export_vm import export_vm
+from exasol.ds.sandbox.lib.export_vm.run_export_vm import (
+    export_ami,
+    export_vm,
+    resumable_ami,
+)
 from exasol.ds.sandbox.lib.export_vm.run_make_ami_public import \
     run_make_ami_public
 from exasol.ds.sandbox.lib.logging import LogType, get_status_logger
+from exasol.ds.sandbox.lib.render_template import precompile_templates
+from exasol.ds.sandbox.lib.setup_ec2.base_ami import (
+    BASE_STAGES,
+    REMAINING_STAGES,
+    base_ami_hash,
+    create_base_ami,
+    has_current_secrets,
+    with_build_stages,
+)
 from exasol.ds.sandbox.lib.setup_ec2.run_install_dependencies import \
     run_install_dependencies
 from exasol.ds.sandbox.lib.setup_ec2.run_reset_password import \
@@ -22,6 +41,8 @@ from exasol.ds.sandbox.lib.setup_ec2.run_reset_password import \
 from exasol.ds.sandbox.lib.setup_ec2.run_setup_ec2 import (
     EC2StackLifecycleContextManager, run_lifecycle_for_ec2)
 from exasol.ds.sandbox.lib.setup_ec2.source_ami import AmiFinder
+from exasol.ds.sandbox.lib.setup_ec2.ssh_readiness import wait_until_ssh_ready
+from exasol.ds.sandbox.lib.tags import BASE_AMI_TAG_KEY
 
 LOG = get_status_logger(LogType.CREATE_VM)
 
@@ -41,6 +62,10 @@ def run_create_vm(
     playbook: ansible.Playbook = DEFAULT_INSTALL_DEPENDENCIES_PLAYBOOK,
     reset_password_playbook: ansible.Playbook = DEFAULT_RESET_PASSWORD_PLAYBOOK,
     ansible_repositories: tuple[ansible.Repository, ...] = DEFAULT_REPOSITORIES,
+    resume: bool = False,
+    checkpoint_file: Optional[Path] = DEFAULT_CHECKPOINT_FILE,
+    base_ami_cache: bool = False,
+    cancelled: Optional[threading.Event] = None,
 ) -> None:
     """
     Runs setup of an EC2 instance and then installs all dependencies via Ansible,
@@ -48,16 +73,49 @@ def run_create_vm(
     by the stack "DATA-SCIENCE-SANDBOX-VM-Bucket").
     If anything goes wrong the cloudformation stack of the EC-2 instance will be removed.
     For debuging you can use the available debug commands.
+
+    The completed stages are recorded in the checkpoint file. With parameter resume
+    the stages whose outputs still exist in AWS are skipped, e.g. an existing AMI is
+    exported again without launching a new EC2 instance. Only the AMI, the export and
+    the rename stages can be resumed, as the EC2 instance is removed after a failure.
+
+    With parameter base_ami_cache the EC2 instance is launched from a base AMI
+    tagged with the content hash of the base stages, see setup_ec2/base_ami.py,
+    and only the remaining stages are installed. If there is no such base AMI,
+    then it is created after installing the base stages.
+
+    If the event cancelled is set, e.g. since the concurrent Docker build
+    failed, then the function raises Cancelled before starting the next
+    stage, removing the EC2 instance.
     """
-    source_ami = AmiFinder(aws_access, configuration.source_ami_filters).find(ec2_source_ami)
+    # Surface syntax errors in the templates before accessing AWS.
+    precompile_templates()
+    checkpoints = Checkpoints(str(asset_id), checkpoint_file, resume)
+    if ami_id := resumable_ami(aws_access, checkpoints):
+        check_cancelled(cancelled, "export")
+        LOG.info(f"Skipping setup of EC2 instance, exporting existing AMI {ami_id}")
+        export_ami(aws_access, ami_id, vm_image_formats, asset_id, configuration, checkpoints)
+        if make_ami_public:
+            run_make_ami_public(aws_access, asset_id)
+        return
+
+    ami_finder = AmiFinder(aws_access, configuration.source_ami_filters)
+    source_ami = ami_finder.find(ec2_source_ami)
     LOG.info(f"Using source AMI: {source_ami.info}")
+    base_hash = base_ami_hash(source_ami.id, playbook.file) if base_ami_cache else None
+    base_ami = ami_finder.by_tag(BASE_AMI_TAG_KEY, base_hash, has_current_secrets) if base_hash else None
+    if base_ami:
+        LOG.info(f"Using base AMI: {base_ami.info}")
+    elif base_hash:
+        LOG.info(f"Found no base AMI with hash {base_hash}")
+    check_cancelled(cancelled, "setup of EC2 instance")
     execution_generator = run_lifecycle_for_ec2(
         aws_access=aws_access,
         ec2_instance_type=ec2_instance_type,
         ec2_key_file=ec2_key_file,
         ec2_key_name=ec2_key_name,
         asset_id=asset_id,
-        ami_id=source_ami.id,
+        ami_id=(base_ami or source_ami).id,
         user_name=user_name,
     )
     with EC2StackLifecycleContextManager(execution_generator, configuration) as ec2_data:
@@ -68,29 +126,43 @@ def run_create_vm(
                 f"Status is {ec2_instance.state_name}"
             )
 
-        # Wait for the EC-2 instance to become ready.
-        time.sleep(configuration.time_to_wait_for_polling)
-
         host_name = ec2_instance.public_dns_name
+        wait_until_ssh_ready(host_name, key_file_location, configuration)
+
+        if base_hash and not base_ami:
+            check_cancelled(cancelled, "installation of base stages")
+            run_install_dependencies(
+                configuration,
+                (ansible.Host(host_name, key_file_location),),
+                with_build_stages(playbook, tuple(s.name for s in BASE_STAGES)),
+                ansible_repositories,
+            )
+            create_base_ami(aws_access, ec2_instance.id, base_hash, configuration)
+            wait_until_ssh_ready(host_name, key_file_location, configuration)
+        check_cancelled(cancelled, "installation of dependencies")
         run_install_dependencies(
             configuration,
             (ansible.Host(host_name, key_file_location),),
-            playbook,
+            with_build_stages(playbook, REMAINING_STAGES) if base_hash else playbook,
             ansible_repositories,
         )
+        check_cancelled(cancelled, "reset of password")
         run_reset_password(
             default_password,
             (ansible.Host(host_name, key_file_location),),
             reset_password_playbook,
             ansible_repositories,
         )
+        check_cancelled(cancelled, "export")
         export_vm(
             aws_access,
             ec2_instance.id,
             vm_image_formats,
             asset_id,
             configuration,
+            checkpoints,
         )
 
     if make_ami_public:
+        check_cancelled(cancelled, "making the AMI public")
         run_make_ami_public(aws_access, asset_id)
@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import os
+from typing import Optional
+
+import exasol.ansible as ansible
+import importlib_resources
+
+import exasol.ds.sandbox.runtime.ansible as runtime_ansible
+from exasol.ds.sandbox.lib.aws_access.ami import Ami
+from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+from exasol.ds.sandbox.lib.config import ConfigObject
+from exasol.ds.sandbox.lib.dss_docker.build_stages import (
+    FINAL_STAGE,
+    STAGES,
+    BuildStage,
+    stage_hashes,
+)
+from exasol.ds.sandbox.lib.export_vm.run_export_vm import create_ami
+from exasol.ds.sandbox.lib.logging import (
+    LogType,
+    get_status_logger,
+)
+from exasol.ds.sandbox.lib.tags import (
+    BASE_AMI_SECRETS_TAG_KEY,
+    BASE_AMI_TAG_KEY,
+)
+
+LOG = get_status_logger(LogType.CREATE_VM)
+
+# The base AMI contains all stages independent of the notebooks, the
+# remaining stages are installed on each EC2 instance launched from it. On
+# EC2, the system stage runs the tasks of ec2_playbook.yml instead of the
+# playbook and the Ansible access of the Docker container.
+BASE_STAGES = (
+    BuildStage("system", (
+        "apt_update.yml",
+        "general_setup_tasks.yml",
+        "roles/rsync",
+        "roles/jupyter_user",
+        "roles/jupyter/defaults",
+        "roles/jupyter/tasks/main.yml",
+    )),
+) + tuple(s for s in STAGES if s.name in ("jupyter", "docker"))
+REMAINING_STAGES = ("notebook", FINAL_STAGE)
+
+# Iterations of PBKDF2 for the digest of the secrets in tag
+# BASE_AMI_SECRETS_TAG_KEY, making it expensive to guess the secrets.
+SECRETS_ITERATIONS = 600_000
+
+
+def base_ami_hash(source_ami_id: str, playbook_file: str = "ec2_playbook.yml") -> str:
+    """
+    Return the content hash of the base AMI built from the given source
+    AMI, covering the playbook and the inputs of all base stages, e.g. the
+    Ansible roles and the requirements files of the Jupyter venv.
+
+    The hash is published as tag of the base AMI, hence it excludes the
+    secrets, see secrets_tag_value().
+    """
+    playbook = importlib_resources.files(runtime_ansible).joinpath(playbook_file)
+    content = stage_hashes(playbook, BASE_STAGES, include_secrets=False)[BASE_STAGES[-1].name]
+    return hashlib.sha256(f"{source_ami_id}\0{content}".encode("utf-8")).hexdigest()
+
+
+def _secrets_digest(salt: bytes) -> str:
+    secrets = "".join(
+        f"{var}={os.environ.get(var, '')}\0"
+        for stage in BASE_STAGES
+        for var in stage.secrets
+    )
+    return hashlib.pbkdf2_hmac("sha256", secrets.encode("utf-8"), salt, SECRETS_ITERATIONS).hex()
+
+
+def secrets_tag_value() -> str:
+    """
+    Return a random salt and the digest of the secrets of the base stages
+    salted with it, e.g. the password of JupyterLab.
+    """
+    salt = os.urandom(16)
+    return f"{salt.hex()}:{_secrets_digest(salt)}"
+
+
+def has_current_secrets(ami: Ami) -> bool:
+    """
+    Return True if the base AMI has been built with the current secrets.
+    """
+    value: Optional[str] = next(
+        (tag["Value"] for tag in ami.tags or [] if tag["Key"] == BASE_AMI_SECRETS_TAG_KEY),
+        None,
+    )
+    if value is None or ":" not in value:
+        return False
+    salt, digest = value.split(":", 1)
+    return hmac.compare_digest(_secrets_digest(bytes.fromhex(salt)), digest)
+
+
+def with_build_stages(playbook: ansible.Playbook, stages: tuple[str, ...]) -> ansible.Playbook:
+    return ansible.Playbook(playbook.file, {**playbook.vars, "build_stages": list(stages)})
+
+
+def create_base_ami(
+    aws_access: AwsAccess,
+    instance_id: str,
+    content_hash: str,
+    configuration: ConfigObject,
+) -> str:
+    """
+    Create a base AMI from the EC2 instance and tag it with the content
+    hash and the salted digest of the secrets. Creating the AMI reboots the
+    instance.
+    """
+    name = f"base-{content_hash[:16]}"
+    LOG.info(f"Creating base AMI {name}")
+    return create_ami(
+        aws_access,
+        ami_name=f"Exasol-AI-Lab-{name}",
+        tag_value=name,
+        instance_id=instance_id,
+        configuration=configuration,
+        extra_tags={
+            BASE_AMI_TAG_KEY: content_hash,
+            BASE_AMI_SECRETS_TAG_KEY: secrets_tag_value(),
+        },
+    )
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import (
+    Callable,
+    Optional,
+)
+
+import importlib_resources
+
+from exasol.ds.sandbox.lib.logging import (
+    LogType,
+    get_status_logger,
+)
+
+_logger = get_status_logger(LogType.SETUP)
+
+# Each lock file pins the packages resolved for the specified requirements
+# files, including the requirements installed before.
+LOCKED_REQUIREMENTS = {
+    "jupyter_requirements.txt": ("jupyter_requirements.txt",),
+    "notebook_requirements.txt": (
+        "jupyter_requirements.txt",
+        "notebook_requirements.txt",
+    ),
+}
+# Target environment of the Jupyter venv, see Ansible role jupyter
+PYTHON_VERSION = "3.10"
+PIP_PLATFORM = "manylinux2014_x86_64"
+UV_PLATFORM = "x86_64-manylinux2014"
+HASH_HEADER = "# requirements-sha256: "
+
+
+def role_files() -> importlib_resources.abc.Traversable:
+    return (
+        importlib_resources
+        .files("exasol.ds.sandbox.runtime.ansible")
+        .joinpath("roles", "jupyter", "files")
+    )
+
+
+def lock_file_name(requirements_file: str) -> str:
+    return f"{Path(requirements_file).stem}.lock"
+
+
+def requirements_hash(requirements_file: str, files: Optional[Path] = None) -> str:
+    files = files or role_files()
+    digest = hashlib.sha256(PYTHON_VERSION.encode("utf-8") + b"\0")
+    for name in LOCKED_REQUIREMENTS[requirements_file]:
+        digest.update(files.joinpath(name).read_bytes())
+    return digest.hexdigest()
+
+
+def current_lock_files(files: Optional[Path] = None) -> dict[str, str]:
+    """
+    Map each requirements file to the name of its lock file, if the lock
+    file exists and has been generated from the current requirements.
+    """
+    files = files or role_files()
+    result = {}
+    for requirements in LOCKED_REQUIREMENTS:
+        lock = files.joinpath(lock_file_name(requirements))
+        if not lock.is_file():
+            continue
+        expected = HASH_HEADER + requirements_hash(requirements, files)
+        if expected in lock.read_text().splitlines():
+            result[requirements] = lock.name
+        else:
+            _logger.warning(
+                f"Ignoring outdated lock file {lock.name},"
+                f" please run command lock-jupyter-venv."
+            )
+    return result
+
+
+def _options(requirements: list[Path]) -> list[str]:
+    """
+    Return the option lines, e.g. --extra-index-url, of the requirements files.
+    """
+    return [
+        line.strip()
+        for file in requirements
+        for line in file.read_text().splitlines()
+        if line.strip().startswith("--")
+    ]
+
+
+def _resolve_with_pip(requirements: list[Path], run: Callable) -> list[str]:
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.json"
+        command = [
+            sys.executable, "-m", "pip", "install",
+            "--dry-run", "--ignore-installed", "--quiet",
+            "--report", str(report),
+            "--target", str(Path(tmp) / "target"),
+            "--python-version", PYTHON_VERSION,
+            "--platform", PIP_PLATFORM,
+            "--only-binary=:all:",
+        ]
+        for file in requirements:
+            command += ["--requirement", str(file)]
+        run(command, check=True)
+        packages = json.loads(report.read_text())["install"]
+    lines = []
+    for package in sorted(packages, key=lambda p: p["metadata"]["name"].lower()):
+        metadata = package["metadata"]
+        archive = package["download_info"]["archive_info"]
+        sha256 = archive.get("hashes", {}).get("sha256") \
+            or archive["hash"].split("=", 1)[1]
+        lines.append(
+            f"{metadata['name']}=={metadata['version']} \\\n"
+            f"    --hash=sha256:{sha256}"
+        )
+    return lines
+
+
+def _resolve_with_uv(uv: str, requirements: list[Path], run: Callable) -> list[str]:
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "requirements.lock"
+        command = [
+            uv, "pip", "compile", "--quiet",
+            "--generate-hashes", "--no-header", "--no-annotate",
+            "--python-version", PYTHON_VERSION,
+            "--python-platform", UV_PLATFORM,
+            "--output-file", str(output),
+        ] + [str(f) for f in requirements]
+        run(command, check=True)
+        return [
+            line for line in output.read_text().splitlines()
+            if not line.startswith("--")
+        ]
+
+
+def generate_lock_files(
+    ai_lab_version: str,
+    target: Optional[Path] = None,
+    run: Callable = subprocess.run,
+) -> list[Path]:
+    """
+    Resolve the requirements of the Jupyter venv for the target platform
+    using ``uv`` if available or ``pip`` otherwise and write a lock file
+    with pinned versions and hashes for each of the requirements files.
+    """
+    files = Path(str(role_files()))
+    target = target or files
+    uv = shutil.which("uv")
+    result = []
+    for requirements, inputs in LOCKED_REQUIREMENTS.items():
+        paths = [files / name for name in inputs]
+        _logger.info(f"Resolving {', '.join(inputs)} using {'uv' if uv else 'pip'}")
+        packages = (
+            _resolve_with_uv(uv, paths, run) if uv
+            else _resolve_with_pip(paths, run)
+        )
+        lock = target / lock_file_name(requirements)
+        header = [
+            f"# Generated by command lock-jupyter-venv for AI Lab {ai_lab_version}",
+            HASH_HEADER + requirements_hash(requirements, files),
+        ]
+        lock.write_text("\n".join(header + _options(paths) + packages) + "\n")
+        _logger.info(f"Wrote {lock}")
+        result.append(lock)
+    return result
+
+
+def ensure_lock_files(
+    ai_lab_version: str,
+    run: Callable = subprocess.run,
+) -> dict[str, str]:
+    """
+    Generate the lock files unless all of them have been generated from
+    the current requirements, e.g. before a release build, and return the
+    current lock files.
+    """
+    lock_files = current_lock_files()
+    if len(lock_files) < len(LOCKED_REQUIREMENTS):
+        generate_lock_files(ai_lab_version, run=run)
+        lock_files = current_lock_files()
+    return lock_files
@@ -7,6 +7,7 @@ from exasol.ds.sandbox.lib.setup_ec2.ansible_execution import (
     DEFAULT_REPOSITORIES,
     DEFAULT_INSTALL_DEPENDENCIES_PLAYBOOK,
 )
+from exasol.ds.sandbox.lib.setup_ec2.jupyter_venv_lock import current_lock_files
 
 
 def run_install_dependencies(
@@ -22,10 +23,14 @@ def run_install_dependencies(
     All ansible repositories, given by variable ansible_repositories,
     are copied as flat copy to the dynamic working copy, too.
     The playbook parameter indicates which playbook to run and can contain additional Ansible variables.
+    If there are current lock files for the requirements of the Jupyter venv, then the
+    playbook installs the pinned packages from the lock files.
     """
     extra_vars = {
         "ai_lab_version": configuration.ai_lab_version,
     }
+    if lock_files := current_lock_files():
+        extra_vars["pip_lock_files"] = lock_files
     extra_vars.update(playbook.vars)
     enhanced_playbook = ansible.Playbook(playbook.file, extra_vars)
     runner = ansible.Runner(ansible_repositories)
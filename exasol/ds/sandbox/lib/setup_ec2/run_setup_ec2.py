@@ -1,5 +1,4 @@
 import signal
-import time
 from enum import Enum
 from typing import Iterator, Optional, Tuple
 
@@ -9,12 +8,14 @@ from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.aws_access.ec2_instance import EC2Instance
 from exasol.ds.sandbox.lib.config import ConfigObject
 from exasol.ds.sandbox.lib.logging import LogType, get_status_logger
+from exasol.ds.sandbox.lib.polling import Backoff, BackoffConfig, poll
 from exasol.ds.sandbox.lib.setup_ec2.ansible_execution import AnsibleDependencyInstaller
 from exasol.ds.sandbox.lib.setup_ec2.cf_stack import (
     CloudformationStack, CloudformationStackContextManager)
 from exasol.ds.sandbox.lib.setup_ec2.key_file_manager import (
     KeyFileManager, KeyFileManagerContextManager)
 from exasol.ds.sandbox.lib.setup_ec2.source_ami import AmiFinder
+from exasol.ds.sandbox.lib.setup_ec2.ssh_readiness import wait_until_ssh_ready
 from exasol.ds.sandbox.lib.setup_ec2.run_install_dependencies import run_install_dependencies
 
 LOG = get_status_logger(LogType.SETUP)
@@ -106,11 +107,12 @@ class EC2StackLifecycleContextManager:
         self._config = configuration
 
     def __enter__(self) -> Tuple[EC2Instance, str]:
-        res = next(self._lifecycle_generator)
-        while res[0].is_pending:
-            LOG.info(f"EC2 instance not ready yet.")
-            time.sleep(self._config.time_to_wait_for_polling)
-            res = next(self._lifecycle_generator)
+        res = poll(
+            lambda: next(self._lifecycle_generator),
+            until=lambda res: not res[0].is_pending,
+            backoff=Backoff(BackoffConfig.from_config(self._config)),
+            on_pending=lambda res: LOG.info(f"EC2 instance not ready yet."),
+        )
         ec2_instance_description, key_file_location = res
         return ec2_instance_description, key_file_location
 
@@ -160,8 +162,7 @@ def _ec2_status_with_optional_dependencies(
         return Ec2State.RUNNING
 
     host_name = ec2_instance.public_dns_name
-    # Wait for the EC-2 instance to become ready.
-    time.sleep(configuration.time_to_wait_for_polling)
+    wait_until_ssh_ready(host_name, key_file_location, configuration)
     host_info = ansible.Host(host_name, key_file_location)
     try:
         run_install_dependencies(
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from typing import Callable, Optional
 
 from exasol.ds.sandbox.lib.aws_access.ami import Ami
 from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
@@ -11,17 +12,26 @@ class FindAmiError(Exception):
     """
 
 
+def _creation_date(ami: Ami) -> datetime:
+    value = ami.creation_date
+    if value.endswith("Z"):
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value)
+
+
 class AmiFinder:
     def __init__(self, aws_access: AwsAccess, filters: dict[str, str]):
         self._aws_access = aws_access
         self._default_filters = filters
 
-    def _list(self, filters: dict[str, str]) -> list[Ami]:
+    def _list(self, filters: dict[str, str], owners: list[str] | None = None) -> list[Ami]:
         filter_list = [
             {"Name": key, "Values": [value]}
             for key, value in filters.items()
         ]
-        return self._aws_access.list_amis(filters=filter_list)
+        if owners is None:
+            return list(self._aws_access.list_amis(filters=filter_list))
+        return list(self._aws_access.list_amis(filters=filter_list, owners=owners))
 
     def unique(self, filters: dict[str, str]) -> Ami:
         amis = self._list(filters)
@@ -32,17 +42,32 @@ class AmiFinder:
 
     @property
     def latest(self) -> Ami:
-        def as_datetime(value: str) -> datetime:
-            if value.endswith("Z"):
-                return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
-            return datetime.fromisoformat(value)
-
         amis = self._list(self._default_filters)
         if len(amis) < 1:
             raise FindAmiError(f"Couldn't find any AMI matching: {self._default_filters}")
-        latest = max(amis, key=lambda ami: as_datetime(ami.creation_date))
+        latest = max(amis, key=_creation_date)
         return latest
 
+    def by_tag(
+        self,
+        key: str,
+        value: str,
+        accept: Optional[Callable[[Ami], bool]] = None,
+    ) -> Ami | None:
+        """
+        Returns the latest available AMI owned by the current account with
+        the given tag, e.g. a base AMI with a specific content hash, or None
+        if there is none. Optional function accept can reject AMIs, e.g.
+        base AMIs built with other secrets.
+
+        The tag value can be derived from public information, hence AMIs of
+        other accounts must not be considered.
+        """
+        amis = self._list({f"tag:{key}": value, "state": "available"}, owners=["self"])
+        if accept is not None:
+            amis = [ami for ami in amis if accept(ami)]
+        return max(amis, key=_creation_date, default=None)
+
     def find(self, ami_id: str | None) -> Ami:
         if ami_id:
             return self.unique({"image-id": ami_id})
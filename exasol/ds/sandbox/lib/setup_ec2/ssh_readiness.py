@@ -0,0 +1,145 @@
+import socket
+import subprocess
+import time
+from typing import Callable, Optional
+
+from exasol.ds.sandbox.lib.config import ConfigObject
+from exasol.ds.sandbox.lib.logging import get_status_logger, LogType
+from exasol.ds.sandbox.lib.polling import (
+    Backoff,
+    BackoffConfig,
+    PollingTimeout,
+    poll,
+)
+
+LOG = get_status_logger(LogType.SETUP)
+
+CLOUD_INIT_BOOT_FINISHED = "/var/lib/cloud/instance/boot-finished"
+
+
+class SshReadinessProbe:
+    """
+    Actively probes whether a host is ready for running Ansible:
+
+    1. TCP connect to the SSH port
+    2. receive the SSH banner
+    3. authenticate with the private key
+    4. optionally check that cloud-init has completed
+
+    Authentication uses the OpenSSH client, which is also used by Ansible.
+    """
+
+    def __init__(
+            self,
+            host_name: str,
+            key_file: Optional[str],
+            user: str = "ubuntu",
+            port: int = 22,
+            wait_for_cloud_init: bool = True,
+            connect_timeout: float = 5.0,
+            run: Callable[..., subprocess.CompletedProcess] = subprocess.run,
+    ):
+        self._host_name = host_name
+        self._key_file = key_file
+        self._user = user
+        self._port = port
+        self._wait_for_cloud_init = wait_for_cloud_init
+        self._connect_timeout = connect_timeout
+        self._run = run
+
+    def _ssh_command(self, remote_command: str) -> list[str]:
+        key_file = ["-i", self._key_file] if self._key_file else []
+        return [
+            "ssh",
+            "-o", "BatchMode=yes",
+            "-o", "StrictHostKeyChecking=no",
+            "-o", "UserKnownHostsFile=/dev/null",
+            "-o", "LogLevel=ERROR",
+            "-o", f"ConnectTimeout={int(self._connect_timeout)}",
+            "-p", str(self._port),
+            *key_file,
+            f"{self._user}@{self._host_name}",
+            remote_command,
+        ]
+
+    def _run_remote(self, remote_command: str) -> bool:
+        try:
+            result = self._run(
+                self._ssh_command(remote_command),
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                timeout=self._connect_timeout * 2,
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return result.returncode == 0
+
+    def banner_received(self) -> bool:
+        """
+        Connects to the SSH port and checks if the server sends an SSH
+        banner. This includes the check whether the TCP port is reachable.
+        """
+        try:
+            with socket.create_connection(
+                    (self._host_name, self._port),
+                    timeout=self._connect_timeout) as connection:
+                return connection.recv(256).startswith(b"SSH-")
+        except OSError:
+            return False
+
+    def authenticated(self) -> bool:
+        return self._run_remote("true")
+
+    def cloud_init_done(self) -> bool:
+        return self._run_remote(f"test -f {CLOUD_INIT_BOOT_FINISHED}")
+
+    def is_ready(self) -> bool:
+        if not self.banner_received():
+            LOG.debug(f"No SSH banner from {self._host_name}:{self._port} yet.")
+            return False
+        if not self.authenticated():
+            LOG.debug(f"SSH authentication at {self._host_name} not possible yet.")
+            return False
+        if self._wait_for_cloud_init and not self.cloud_init_done():
+            LOG.debug(f"cloud-init on {self._host_name} not finished yet.")
+            return False
+        return True
+
+
+def wait_until_ssh_ready(
+        host_name: str,
+        key_file_location: Optional[str],
+        configuration: ConfigObject,
+        probe: Optional[SshReadinessProbe] = None,
+) -> None:
+    """
+    Waits until the host is ready for running Ansible.
+
+    If configuration.ssh_readiness_probe is false, then simply waits for
+    configuration.time_to_wait_for_polling. Otherwise, uses a
+    SshReadinessProbe until it succeeds or the deadline
+    configuration.ssh_readiness_timeout is exceeded.  In the latter case only
+    a warning is logged, leaving the error handling to Ansible.
+    """
+    if not configuration.ssh_readiness_probe:
+        time.sleep(configuration.time_to_wait_for_polling)
+        return
+    if probe is None:
+        probe = SshReadinessProbe(
+            host_name,
+            key_file_location,
+            wait_for_cloud_init=configuration.wait_for_cloud_init,
+        )
+    backoff = Backoff(BackoffConfig(
+        initial_delay=1.0,
+        max_delay=5.0,
+        timeout=configuration.ssh_readiness_timeout,
+    ))
+    LOG.info(f"Waiting for {host_name} to accept SSH connections.")
+    try:
+        poll(probe.is_ready, until=lambda ready: ready, backoff=backoff)
+        LOG.info(f"Host {host_name} is ready.")
+    except PollingTimeout:
+        LOG.warning(
+            f"Host {host_name} did not become ready within"
+            f" {configuration.ssh_readiness_timeout} seconds.")
@@ -1,4 +1,8 @@
 DEFAULT_TAG_KEY = "exa_ai_lab_id"
+# content hash of the stages installed on a base AMI, see setup_ec2/base_ami.py
+BASE_AMI_TAG_KEY = "exa_ai_lab_base_hash"
+# salt and salted digest of the secrets installed on a base AMI
+BASE_AMI_SECRETS_TAG_KEY = "exa_ai_lab_base_secrets"
 
 
 def create_default_asset_tag(value: str) -> list:
@@ -1,6 +1,5 @@
 #! /usr/bin/env python3
 #
-import exasol.ds.sandbox.cli.commands
 from exasol.ds.sandbox.cli.cli import cli
 
 def main():
@@ -1,6 +1,11 @@
 import argparse
+import contextlib
+import fcntl
+import hashlib
+import json
 import logging
 import grp
+import itertools
 import os
 import pwd
 import re
@@ -9,11 +14,15 @@ import shutil
 import subprocess
 import stat
 import sys
+import threading
 import time
+import urllib.error
+import urllib.request
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from inspect import cleandoc
 from pathlib import Path
-from typing import List, TextIO
+from typing import Iterator, List, TextIO
 
 
 LOG = logging.getLogger(__name__)
@@ -79,6 +88,15 @@ def arg_parser():
         "--jupyter-logfile", type=Path,
         help="Path to write Jupyter server log messages to",
     )
+    parser.add_argument(
+        "--readiness-probe", action="store_true",
+        help="""After Jupyter server reported to be running, additionally
+        wait until it responds to HTTP requests""",
+    )
+    parser.add_argument(
+        "--timings-file", type=Path,
+        help="Path to write the durations of the startup phases to",
+    )
     parser.add_argument(
         "--warning-as-error", action="store_true",
         help="treat warning as error",
@@ -86,6 +104,35 @@ def arg_parser():
     return parser
 
 
+class StartupTimings:
+    """
+    Measures the durations of the phases of starting the container and
+    reports them as a single JSON line.
+    """
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._start = clock()
+        self.phases: dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(self._clock() - start, 3)
+
+    def report(self, file: Path | None = None) -> str:
+        line = json.dumps({
+            "startup_timings": self.phases,
+            "total": round(self._clock() - self._start, 3),
+        })
+        print(line, flush=True)
+        if file:
+            file.write_text(line + "\n")
+        return line
+
+
 def jupyter_env(home: str, venv: Path | None) -> dict[str, str]:
     env = os.environ.copy() | {"HOME": home}
     if not venv:
@@ -98,16 +145,44 @@ def jupyter_env(home: str, venv: Path | None) -> dict[str, str]:
     return env
 
 
-def change_jupyter_password(
-    jupyter_core: str,
-    new_password: str,
+# Hashes the password read from stdin like jupyter_server.auth.passwd()
+# unless the current hash in the second line of stdin already matches.
+ARGON2_HELPER = """
+import sys
+import argon2
+
+password, current = sys.stdin.read().split("\\n", 1)
+hasher = argon2.PasswordHasher(memory_cost=10240, time_cost=10, parallelism=8)
+algorithm, _, digest = current.strip().partition(":")
+if algorithm == "argon2":
+    try:
+        hasher.verify(digest, password)
+        sys.exit(0)
+    except argon2.exceptions.Argon2Error:
+        pass
+print("argon2:" + hasher.hash(password))
+"""
+
+
+def jupyter_config_file(env: dict[str, str]) -> Path:
+    config_dir = env.get("JUPYTER_CONFIG_DIR") or Path(env["HOME"]) / ".jupyter"
+    return Path(config_dir) / "jupyter_server_config.json"
+
+
+def run_password_command(
+    command: list[str],
+    input: str,
     env: dict[str, str],
-) -> None:
+) -> str:
+    """
+    Run the command and return its stdout. Stderr is captured separately,
+    as stdout may be the password hash, and is logged only on failure.
+    """
     p = subprocess.run(
-        [jupyter_core, "server", "password"],
-        input=f"{new_password}\n{new_password}\n",
+        command,
+        input=input,
         stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
+        stderr=subprocess.PIPE,
         encoding="utf-8",
         env=env,
     )
@@ -116,12 +191,59 @@ def change_jupyter_password(
         LOG.error(
             "Failed to change password.\n"
             "%s exited with return code %d and output:\n"
-            "%s",
-            jupyter_core,
+            "%s%s",
+            command[0],
             rc,
             p.stdout,
+            p.stderr,
         )
         sys.exit(rc)
+    return p.stdout
+
+
+def change_jupyter_password(
+    jupyter_core: str,
+    new_password: str,
+    env: dict[str, str],
+) -> None:
+    """
+    If there is a Python interpreter next to the Jupyter core executable,
+    then use it only for hashing the password with argon2 and write the
+    hash to the config file of Jupyter server, skipping the update if the
+    config file already contains a matching hash. This avoids importing
+    jupyter_server.  Otherwise use command "jupyter server password".
+    """
+    python = Path(jupyter_core).parent / "python"
+    if not python.exists():
+        run_password_command(
+            [jupyter_core, "server", "password"],
+            f"{new_password}\n{new_password}\n",
+            env,
+        )
+        LOG.info("Successfully changed the password of Jupyter server.")
+        return
+
+    config_file = jupyter_config_file(env)
+    config = json.loads(config_file.read_text()) if config_file.exists() else {}
+    identity = config.setdefault("IdentityProvider", {})
+    current = identity.get("hashed_password", "")
+    hashed = run_password_command(
+        [str(python), "-c", ARGON2_HELPER],
+        f"{new_password}\n{current}",
+        env,
+    ).strip()
+    if not hashed:
+        LOG.info("Password of Jupyter server is already up to date.")
+        return
+    if not re.fullmatch(r"argon2:\S+", hashed):
+        LOG.error("Failed to change password, invalid hash: %s", hashed)
+        sys.exit(1)
+    identity["hashed_password"] = hashed
+    config_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = config_file.with_suffix(".tmp")
+    tmp.touch(mode=0o600)
+    tmp.write_text(json.dumps(config, indent=2))
+    tmp.replace(config_file)
     LOG.info("Successfully changed the password of Jupyter server.")
 
 
@@ -162,11 +284,81 @@ def success_message(args: argparse.Namespace, alternate_password: str|None) -> s
     return message + "\n\n" + password_instructions
 
 
-def start_jupyter_server(args: argparse.Namespace, poll_sleep: float = 1) -> None:
+JUPYTER_RUNNING = re.compile("Jupyter Server .* is running at:")
+
+
+class JupyterOutput:
+    """
+    Copies the output of Jupyter server line by line to the logfile in a
+    separate thread and detects when Jupyter server reports to be running.
+    """
+    def __init__(self, stream: TextIO, logfile: TextIO):
+        self._stream = stream
+        self._logfile = logfile
+        self._event = threading.Event()
+        self.running = False
+        self._thread = threading.Thread(target=self._tee, daemon=True)
+
+    def start(self) -> "JupyterOutput":
+        self._thread.start()
+        return self
+
+    def _tee(self):
+        try:
+            for line in self._stream:
+                self._logfile.write(line)
+                self._logfile.flush()
+                if not self.running and JUPYTER_RUNNING.search(line):
+                    self.running = True
+                    self._event.set()
+        finally:
+            self._event.set()
+
+    def wait_until_running(self) -> bool:
+        """
+        Returns True as soon as Jupyter server reports to be running or False
+        if its output ended before.
+        """
+        self._event.wait()
+        return self.running
+
+    def join(self):
+        self._thread.join()
+
+
+def wait_for_http(
+    port: int,
+    process: subprocess.Popen,
+    interval: float = 0.05,
+) -> bool:
+    """
+    Polls the REST API of Jupyter server until it responds. Any HTTP
+    response counts, as /api/status requires authentication. Returns False
+    if the process terminated before.
+    """
+    url = f"http://localhost:{port}/api/status"
+    while process.poll() is None:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return True
+        except urllib.error.HTTPError:
+            return True
+        except OSError:
+            time.sleep(interval)
+    return False
+
+
+def start_jupyter_server(
+    args: argparse.Namespace,
+    timings: StartupTimings | None = None,
+) -> None:
     """
-    :param poll_sleep: specifies the waiting time in seconds before
-    reading a line from the logfile.
+    Starts Jupyter server, copies its output to the logfile, and logs a
+    success message as soon as the server reports to be running.
+
+    The startup timings are reported after the success message.
     """
+    timings = timings or StartupTimings()
     logfile = args.jupyter_logfile
 
     def exit_on_error(rc):
@@ -183,7 +375,8 @@ def start_jupyter_server(args: argparse.Namespace, poll_sleep: float = 1) -> Non
 
     alternate_password = os.getenv(PASSWORD_ENV)
     if alternate_password and args.jupyter_core:
-        change_jupyter_password(args.jupyter_core, alternate_password, env)
+        with timings.phase("change_jupyter_password"):
+            change_jupyter_password(args.jupyter_core, alternate_password, env)
 
     with open(logfile, "w") as f:
         cmd = [
@@ -192,36 +385,91 @@ def start_jupyter_server(args: argparse.Namespace, poll_sleep: float = 1) -> Non
             "--no-browser",
             "--allow-root",
         ]
-        process = subprocess.Popen(cmd, stdout=f, stderr=f, env=env)
-
-    with open(logfile, "r") as f:
-        regexp = re.compile("Jupyter Server .* is running at:")
-        while True:
-            time.sleep(poll_sleep)
-            line = f.readline()
-            if regexp.search(line):
-                message = success_message(args, alternate_password)
-                LOG.info(message + "\n")
-                break
-            exit_on_error(process.poll())
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            encoding="utf-8",
+            errors="replace",
+        )
+        output = JupyterOutput(process.stdout, f).start()
+        with timings.phase("start_jupyter_server"):
+            running = output.wait_until_running() and (
+                not args.readiness_probe
+                or wait_for_http(args.port, process)
+            )
+        if running:
+            message = success_message(args, alternate_password)
+            LOG.info(message + "\n")
+            timings.report(args.timings_file)
+        output.join()
         exit_on_error(process.wait())
 
 
+SEED_MANIFEST = ".ai_lab_seeded_defaults.json"
+
+# ioctl creating a reflink, see man ioctl_ficlone
+FICLONE = 0x40049409
+
+
+def scan_rec(dir: Path, prefix: str = "") -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yields the relative path and the os.DirEntry of each file and directory
+    below dir, directories before their content.
+    """
+    with os.scandir(dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        relative = prefix + entry.name
+        yield relative, entry
+        if entry.is_dir(follow_symlinks=False):
+            yield from scan_rec(Path(entry.path), relative + "/")
+
+
+def file_hash(path: Path | str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def copy_file(src: Path | str, dst: Path):
+    """
+    Creates a reflink if supported by the file system, otherwise falls
+    back to shutil.copyfile() using efficient kernel functions for copying.
+    Hard links are not used, as changes of the user would modify the
+    defaults, too.
+    """
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return
+    except OSError:
+        pass
+    shutil.copyfile(src, dst)
+
+
 def copy_rec(src: Path, dst: Path, warning_as_error: bool = False):
     """
-    Copy missing files and directories from src to dst and set permission
-    666 for files and 777 for directories.  If directory src does not exist
-    then do not copy anything.
+    Copy new and changed files and directories from src to dst and set
+    permission 666 for files and 777 for directories.  If directory src
+    does not exist then do not copy anything.
+
+    The copied files are recorded in a manifest file in dst together with
+    their content hash. A file copied before is only copied again, if it
+    was changed in src and is still unmodified in dst. Files the user
+    deleted from dst are not copied again.
     """
     def ensure_dir(dir: Path):
         if not dir.exists():
             dir.mkdir()
             dir.chmod(0o777)
 
-    def ensure_file(src: Path, dst: Path):
-        if not dst.exists():
-            shutil.copyfile(src, dst)
-            dst.chmod(0o666)
+    def copy(src: str, dst: Path):
+        copy_file(src, dst)
+        dst.chmod(0o666)
 
     if not src.exists():
         msg = f"Source directory not found: {src}"
@@ -231,15 +479,56 @@ def copy_rec(src: Path, dst: Path, warning_as_error: bool = False):
             LOG.warning(msg)
         return
 
+    start = time.monotonic()
     ensure_dir(dst)
-
-    for root, dirs, files in os.walk(src):
-        root = Path(root)
-        copy = dst / root.relative_to(src)
-        for name in files:
-            ensure_file(root / name, copy / name)
-        for name in dirs:
-            ensure_dir(copy / name)
+    manifest_file = dst / SEED_MANIFEST
+    try:
+        previous = json.loads(manifest_file.read_text())
+    except (OSError, ValueError):
+        previous = {}
+
+    manifest = {}
+    copied = 0
+    for relative, entry in scan_rec(src):
+        target = dst / relative
+        if entry.is_dir(follow_symlinks=False):
+            ensure_dir(target)
+            continue
+        file_stat = entry.stat()
+        seeded = previous.get(relative)
+        if (
+            seeded
+            and seeded["size"] == file_stat.st_size
+            and seeded["mtime_ns"] == file_stat.st_mtime_ns
+        ):
+            manifest[relative] = seeded
+            continue
+        sha256 = file_hash(entry.path)
+        manifest[relative] = {
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+            "sha256": sha256,
+        }
+        if seeded is None:
+            if not target.exists():
+                copy(entry.path, target)
+                copied += 1
+        elif (
+            seeded["sha256"] != sha256
+            and target.exists()
+            and file_hash(target) == seeded["sha256"]
+        ):
+            copy(entry.path, target)
+            copied += 1
+
+    if manifest != previous:
+        tmp = manifest_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, indent=1))
+        tmp.replace(manifest_file)
+    LOG.info(
+        f"Copied {copied} of {len(manifest)} files from {src} to {dst}"
+        f" in {time.monotonic() - start:.3f} seconds"
+    )
 
 
 def disable_core_dumps():
@@ -328,6 +617,73 @@ class GroupAccess:
             return self._group
 
 
+OWNER_MARKER = ".ai_lab_owner"
+OWNER_SAMPLE_SIZE = 100
+
+
+def is_owned_by(path: Path, uid: int, gid: int) -> bool:
+    """
+    Checks whether chown_tree() was already completed for path with the
+    same uid and gid by checking the owner of path, the marker file
+    written after the last completed walk, and a sample of the direct
+    children of path. Files created later by the user running Jupyter
+    server are owned by this user anyway.
+    """
+    def owned(stat_result) -> bool:
+        return (stat_result.st_uid, stat_result.st_gid) == (uid, gid)
+
+    try:
+        if not owned(path.stat()):
+            return False
+        if (path / OWNER_MARKER).read_text() != f"{uid}:{gid}":
+            return False
+        with os.scandir(path) as it:
+            sample = itertools.islice(it, OWNER_SAMPLE_SIZE)
+            return all(
+                owned(entry.stat(follow_symlinks=False))
+                for entry in sample
+                if entry.name != OWNER_MARKER
+            )
+    except OSError:
+        return False
+
+
+def write_owner_marker(path: Path, uid: int, gid: int):
+    try:
+        (path / OWNER_MARKER).write_text(f"{uid}:{gid}")
+    except OSError as ex:
+        LOG.warning(f"Could not write {path / OWNER_MARKER}: {ex}")
+
+
+def chown_tree(path: Path, uid: int, gid: int, max_workers: int = 8) -> int:
+    """
+    Change the owner of all files and directories below path. Directories
+    are scanned in parallel, as most of the time is spent in system calls.
+    Returns the number of changed files and directories.
+    """
+    def chown_dir(dir: str) -> tuple[int, list[str]]:
+        count = 0
+        subdirs = []
+        with os.scandir(dir) as it:
+            for entry in it:
+                os.chown(entry.path, uid, gid)
+                count += 1
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        return count, subdirs
+
+    total = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(chown_dir, str(path))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                count, subdirs = future.result()
+                total += count
+                pending.update(executor.submit(chown_dir, d) for d in subdirs)
+    return total
+
+
 class User:
     def __init__(self, user_name: str, group: Group, docker_group: Group):
         self.name = user_name
@@ -350,16 +706,26 @@ class User:
         return self._id
 
     def chown_recursive(self, path: Path):
+        """
+        Change the owner of all files and directories below path, unless
+        a previous call already did so for the same user and group.
+        """
         uid = self.id
         gid = self.group.id
+        start = time.monotonic()
+        if is_owned_by(path, uid, gid):
+            LOG.info(
+                f"Skipped chown -R {self.name}:{self.group.name} {path},"
+                " owner is already correct"
+            )
+            return
         os.chown(path, uid, gid)
-        for root, dirs, files in os.walk(path):
-            root = Path(root)
-            for name in files:
-                os.chown(root / name, uid, gid)
-            for name in dirs:
-                os.chown(root / name, uid, gid)
-        LOG.info(f"Did chown -R {self.name}:{self.group.name} {path}")
+        count = chown_tree(path, uid, gid)
+        write_owner_marker(path, uid, gid)
+        LOG.info(
+            f"Did chown -R {self.name}:{self.group.name} {path}"
+            f" for {count} files in {time.monotonic() - start:.3f} seconds"
+        )
 
     def enable_group_access(self, path: Path):
         file = FileInspector(path)
@@ -389,17 +755,22 @@ class User:
 
 def main():
     args = arg_parser().parse_args()
+    timings = StartupTimings()
     user = User(args.user, Group(args.group), Group(args.docker_group))
     if user.is_specified:
         if args.notebooks:
-            user.chown_recursive(args.notebooks)
-        user.enable_group_access(Path("/var/run/docker.sock")).switch_to()
+            with timings.phase("chown_notebooks"):
+                user.chown_recursive(args.notebooks)
+        with timings.phase("enable_group_access"):
+            user.enable_group_access(Path("/var/run/docker.sock"))
+        user.switch_to()
     if args.notebook_defaults and args.notebooks:
-        copy_rec(
-            args.notebook_defaults,
-            args.notebooks,
-            args.warning_as_error,
-        )
+        with timings.phase("copy_notebooks"):
+            copy_rec(
+                args.notebook_defaults,
+                args.notebooks,
+                args.warning_as_error,
+            )
         LOG.info(
             "Copied notebooks from"
             f" {args.notebook_defaults} to {args.notebooks}")
@@ -412,8 +783,9 @@ def main():
         and args.home
         and args.password
     ):
-        start_jupyter_server(args)
+        start_jupyter_server(args, timings)
     else:
+        timings.report(args.timings_file)
         sleep_infinity()
 
 
@@ -81,11 +81,11 @@ def get_snapshot_mock_data():
     })
 
 
-def get_export_image_task_mock_data(in_progress: bool):
+def get_export_image_task_mock_data(in_progress: bool, task_id: str = 'export-ami-123'):
     if in_progress:
         return ExportImageTask({
             'Description': 'VM Description',
-            'ExportImageTaskId': 'export-ami-123',
+            'ExportImageTaskId': task_id,
             'S3ExportLocation':
                 {
                     'S3Bucket': TEST_BUCKET_ID,
@@ -99,7 +99,7 @@ def get_export_image_task_mock_data(in_progress: bool):
     else:
         return ExportImageTask({
             'Description': 'VM Description',
-            'ExportImageTaskId': 'export-ami-123',
+            'ExportImageTaskId': task_id,
             'S3ExportLocation':
                 {
                     'S3Bucket': TEST_BUCKET_ID,
@@ -84,7 +84,7 @@ def new_ec2_from_ami(test_ec2_instance_type):
     )
 
     # Use the ami_name to find the AMI id (alternatively we could use the tag here)
-    amis = aws_access.list_amis(filters=[{'Name': 'name', 'Values': [asset_id.ami_name]}])
+    amis = list(aws_access.list_amis(filters=[{'Name': 'name', 'Values': [asset_id.ami_name]}]))
     assert len(amis) == 1
     ami = amis[0]
 
@@ -117,8 +117,8 @@ def new_ec2_from_ami(test_ec2_instance_type):
         # (the rest was removed automatically by deleting the cloudformation stack)
         aws_access.deregister_ami(ami.id)
         # Find snapshot by the tag
-        snapshots = aws_access.list_snapshots(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}',
-                                                        'Values': [asset_id.tag_value]}])
+        snapshots = list(aws_access.list_snapshots(filters=[{'Name': f'tag:{DEFAULT_TAG_KEY}',
+                                                             'Values': [asset_id.tag_value]}]))
         assert len(snapshots) == 1
         aws_access.remove_snapshot(snapshots[0].id)
 
@@ -46,6 +46,7 @@ def test_s3_transfer_multipart(sample_file):
             source=s3_key,
             dest=s3_key2,
             progress=progress,
+            part_size="5 MB",
         )
     finally:
         aws.delete_s3_object(bucket, s3_key)
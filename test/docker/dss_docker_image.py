@@ -5,6 +5,7 @@ import stat
 
 from exasol.ds.sandbox.lib.dss_docker import (
     DssDockerImage,
+    Wheelhouse,
     USER_ENV,
     PASSWORD_ENV,
 )
@@ -31,6 +32,10 @@ def pytest_addoption(parser):
         "--keep-dss-docker-image", action="store_true", default=False,
         help="Keep the created dss docker image for inspection or reuse."
     )
+    parser.addoption(
+        "--wheel-cache", action="store_true", default=False,
+        help="Install the Jupyter venv of the dss docker image from cached wheels.",
+    )
     add_options_for_docker_image("notebook-test", "Notebook testing")
     add_options_for_docker_image("ai-lab-with-additional-group")
     parser.addoption(
@@ -70,6 +75,8 @@ def dss_docker_image(request):
         version=DssDockerImage.timestamp(),
         keep_container=False,
     )
+    if request.config.getoption("--wheel-cache"):
+        testee.wheelhouse = Wheelhouse()
     testee.create()
     try:
         yield testee
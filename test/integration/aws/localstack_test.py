@@ -1,3 +1,5 @@
+import os
+
 import botocore
 import pytest
 
@@ -142,3 +144,22 @@ def test_cloudformation_access_with_local_stack(
 def test_user_with_local_stack(local_stack_aws_access):
     user_name = local_stack_aws_access.get_user()
     assert user_name == "default_user"
+
+
+def test_copy_large_s3_object_with_local_stack(local_stack_aws_access):
+    """
+    This test uses localstack to copy an S3 object server-side in multiple
+    parts.
+    """
+    aws = local_stack_aws_access
+    bucket = "test-copy-large-s3-object"
+    s3 = aws._get_aws_client("s3")
+    s3.create_bucket(
+        Bucket=bucket,
+        CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+    )
+    content = os.urandom(12 * 1024 * 1024)
+    s3.put_object(Bucket=bucket, Key="source", Body=content)
+    aws.copy_large_s3_object(bucket, "source", "dest", part_size="5 MB")
+    copied = s3.get_object(Bucket=bucket, Key="dest")["Body"].read()
+    assert copied == content
@@ -131,6 +131,38 @@ def test_import_notebook_connector(dss_docker_container):
     assert_exec_run(dss_docker_container, command, user=JUPYTER_USER)
 
 
+def test_benchmark_first_import(dss_docker_container):
+    """
+    Compares the duration of the first import of the notebook connector
+    using the precompiled bytecode with compiling the modules from
+    scratch. Setting PYTHONPYCACHEPREFIX to an empty directory hides the
+    precompiled bytecode.
+    """
+    command = (
+        "/home/jupyter/jupyterenv/bin/python -c"
+        " 'import time; start = time.perf_counter();"
+        " import exasol.nb_connector.secret_store;"
+        " print(time.perf_counter() - start)'"
+    )
+
+    def first_import(environment: dict) -> float:
+        output = assert_exec_run(
+            dss_docker_container,
+            command,
+            user=JUPYTER_USER,
+            environment={"PYTHONDONTWRITEBYTECODE": "1", **environment},
+        )
+        return float(output.splitlines()[-1])
+
+    precompiled = first_import({})
+    from_source = first_import({"PYTHONPYCACHEPREFIX": "/tmp/empty-pycache"})
+    _logger.info(
+        f"First import of exasol.nb_connector: from source {from_source:.2f} s,"
+        f" precompiled {precompiled:.2f} s"
+    )
+    assert precompiled < from_source
+
+
 def test_install_notebooks(dss_docker_container):
     def filename_set(string: str) -> Set[str]:
         return set(re.split(r'\s+', string.strip()))
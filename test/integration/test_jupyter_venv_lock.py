@@ -0,0 +1,51 @@
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from exasol.ds.sandbox.lib.setup_ec2.jupyter_venv_lock import (
+    PYTHON_VERSION,
+    generate_lock_files,
+    role_files,
+)
+
+pytestmark = pytest.mark.skipif(
+    f"{sys.version_info.major}.{sys.version_info.minor}" != PYTHON_VERSION
+    or platform.system() != "Linux" or platform.machine() != "x86_64",
+    reason="Lock files are generated for the platform of the Jupyter venv",
+)
+
+
+def pip_install(tmp_path: Path, name: str, *args) -> float:
+    """
+    Create a new venv and return the duration of installing the
+    specified requirements into it.
+    """
+    venv = tmp_path / name
+    subprocess.run([sys.executable, "-m", "venv", str(venv)], check=True)
+    start = time.perf_counter()
+    subprocess.run([str(venv / "bin" / "pip"), "install", "--quiet", *args], check=True)
+    return time.perf_counter() - start
+
+
+def test_benchmark_locked_install(tmp_path):
+    """
+    Compares installing the requirements of the Jupyter venv with
+    resolving open version ranges and with the lock file.  The first
+    installation fills pip's cache, hence both timed installations
+    download nothing and mainly differ by the time for resolving.
+    """
+    requirements = str(Path(str(role_files())) / "jupyter_requirements.txt")
+    lock = str(generate_lock_files("benchmark", tmp_path)[0])
+    pip_install(tmp_path, "warm-up", "--requirement", requirements)
+    resolving = pip_install(tmp_path, "resolving", "--requirement", requirements)
+    locked = pip_install(
+        tmp_path, "locked", "--no-deps", "--require-hashes", "--requirement", lock)
+    print(
+        f"\nInstalling jupyter_requirements.txt: resolving {resolving:.1f} s,"
+        f" from lock file {locked:.1f} s"
+    )
+    assert locked < resolving
@@ -105,3 +105,19 @@ def test_push_tag(sample_docker_image, docker_registry):
         docker_registry.push(tagged.repository, spec.tag)
     assert repo in docker_registry.repositories
     assert spec.tag in docker_registry.images(repo)["tags"]
+
+
+def test_push_tags(sample_docker_image, docker_registry):
+    repo = "org/sample_repo"
+    spec = DockerImageSpec(
+        docker_registry.host_and_port + "/" + repo,
+        "999.9.8",
+    )
+    with tagged_image(sample_docker_image, spec) as tagged:
+        docker.from_env().images.get(spec.name).tag(tagged.repository, "latest")
+        try:
+            progress = docker_registry.push_tags(tagged.repository, [spec.tag, "latest"])
+        finally:
+            docker.from_env().images.remove(f"{tagged.repository}:latest")
+    assert {spec.tag, "latest"} <= set(docker_registry.images(repo)["tags"])
+    assert all(p.layers for p in progress)
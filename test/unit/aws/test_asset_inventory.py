@@ -0,0 +1,247 @@
+import sqlite3
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from exasol.ds.sandbox.lib.aws_access.asset_inventory import (
+    AssetInventory,
+    CachedAwsAccess,
+    InventoryEntry,
+    InventoryPartition,
+)
+from exasol.ds.sandbox.lib.tags import DEFAULT_TAG_KEY
+
+TTL = 100.0
+PARTITION = InventoryPartition("111111111111", "eu-central-1")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def tag_filter(value: str) -> list:
+    return [{"Name": f"tag:{DEFAULT_TAG_KEY}", "Values": [value]}]
+
+
+def ami(image_id: str, tag_value: str, state: str = "available"):
+    return {
+        "ImageId": image_id,
+        "State": state,
+        "Tags": [{"Key": DEFAULT_TAG_KEY, "Value": tag_value}],
+    }
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def inventory(tmp_path, clock):
+    return AssetInventory(tmp_path / "inventory.sqlite", ttl=TTL, clock=clock)
+
+
+@pytest.fixture
+def pages():
+    """
+    Maps the name of a paginated operation to the pages returned for it.
+    """
+    return {}
+
+
+def aws_client(pages, account: str = PARTITION.account):
+    client = MagicMock()
+    client.get_caller_identity.return_value = {"Account": account}
+    client.meta.region_name = PARTITION.region
+
+    def get_paginator(operation):
+        paginator = MagicMock()
+        paginator.paginate.side_effect = lambda **kwargs: pages[operation]
+        return paginator
+
+    client.get_paginator.side_effect = get_paginator
+    return client
+
+
+@pytest.fixture
+def client(pages):
+    return aws_client(pages)
+
+
+def cached_aws_access(inventory, client, monkeypatch, refresh=False):
+    aws = CachedAwsAccess(None, inventory, refresh=refresh)
+    monkeypatch.setattr(aws, "_get_aws_client", lambda service_name: client)
+    return aws
+
+
+def test_inventory_round_trip(inventory):
+    created = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    entry = InventoryEntry("id-1", "1.0.0", False, {"Id": "id-1", "StartTime": created})
+    inventory.replace("snapshot", "", [entry])
+    assert inventory.entries("snapshot") == [entry]
+    assert inventory.entries("ami") == []
+
+
+def test_inventory_ttl(inventory, clock):
+    assert not inventory.is_fresh("ami")
+    inventory.replace("ami", "", [])
+    assert inventory.is_fresh("ami")
+    clock.now += TTL
+    assert not inventory.is_fresh("ami")
+
+
+def test_inventory_invalidate(inventory):
+    inventory.replace("ami", "", [])
+    inventory.replace("snapshot", "", [])
+    inventory.invalidate("ami")
+    assert (inventory.is_fresh("ami"), inventory.is_fresh("snapshot")) == (False, True)
+
+
+def test_inventory_partitions(inventory):
+    prod = PARTITION
+    dev = InventoryPartition("222222222222", PARTITION.region)
+    entry = InventoryEntry("ami-1", "1.0.0", False, ami("ami-1", "1.0.0"))
+    inventory.replace("ami", "", [entry], prod)
+    inventory.replace("ami", "", [], InventoryPartition("111111111111", "us-east-1"))
+    assert inventory.entries("ami", "", prod) == [entry]
+    assert inventory.entries("ami", "", dev) == []
+    assert not inventory.is_fresh("ami", "", dev)
+    inventory.invalidate("ami", prod)
+    assert not inventory.is_fresh("ami", "", prod)
+    assert inventory.is_fresh("ami", "", InventoryPartition("111111111111", "us-east-1"))
+
+
+def test_inventory_drops_tables_of_older_version(tmp_path):
+    path = tmp_path / "inventory.sqlite"
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE assets (asset_type TEXT, scope TEXT)")
+    AssetInventory(path).replace("ami", "", [])
+
+
+def test_list_amis_from_inventory(inventory, client, pages, monkeypatch):
+    pages["describe_images"] = [{"Images": [ami("ami-1", "1.0.0"), ami("ami-2", "2.0.0")]}]
+    first = cached_aws_access(inventory, client, monkeypatch)
+    assert [a.id for a in first.list_amis(tag_filter("1.*"))] == ["ami-1"]
+
+    second = cached_aws_access(inventory, client, monkeypatch)
+    assert [a.id for a in second.list_amis(tag_filter("*"))] == ["ami-1", "ami-2"]
+    assert client.get_paginator.call_count == 1
+
+
+def test_profiles_of_other_accounts_do_not_share_assets(inventory, monkeypatch):
+    prod_client = aws_client({"describe_images": [{"Images": [ami("ami-1", "1.0.0")]}]})
+    dev_client = aws_client({"describe_images": [{"Images": [ami("ami-2", "1.0.0")]}]},
+                            account="222222222222")
+    prod = cached_aws_access(inventory, prod_client, monkeypatch)
+    assert [a.id for a in prod.list_amis(tag_filter("*"))] == ["ami-1"]
+    dev = cached_aws_access(inventory, dev_client, monkeypatch)
+    assert [a.id for a in dev.list_amis(tag_filter("*"))] == ["ami-2"]
+    assert [a.id for a in prod.list_amis(tag_filter("*"))] == ["ami-1"]
+    assert prod_client.get_paginator.call_count == 1
+
+
+def test_instantiate_for_region(inventory):
+    aws = CachedAwsAccess("dev", inventory, refresh=True)
+    regional = aws.instantiate_for_region("us-east-1")
+    assert isinstance(regional, CachedAwsAccess)
+    assert (regional.aws_profile, regional._region) == ("dev", "us-east-1")
+    assert (regional._inventory, regional._refresh) == (inventory, True)
+    assert regional._client_cache is aws._client_cache
+
+
+def test_expired_ttl_refreshes_all(inventory, client, pages, clock, monkeypatch):
+    pages["describe_images"] = [{"Images": [ami("ami-1", "1.0.0")]}]
+    cached_aws_access(inventory, client, monkeypatch).list_amis(tag_filter("*"))
+    pages["describe_images"] = [{"Images": [ami("ami-2", "2.0.0")]}]
+    clock.now += TTL
+    amis = cached_aws_access(inventory, client, monkeypatch).list_amis(tag_filter("*"))
+    assert [a.id for a in amis] == ["ami-2"]
+
+
+def test_refresh_ignores_inventory(inventory, client, pages, monkeypatch):
+    pages["describe_images"] = [{"Images": [ami("ami-1", "1.0.0")]}]
+    cached_aws_access(inventory, client, monkeypatch).list_amis(tag_filter("*"))
+    pages["describe_images"] = [{"Images": [ami("ami-2", "2.0.0")]}]
+    aws = cached_aws_access(inventory, client, monkeypatch, refresh=True)
+    assert [a.id for a in aws.list_amis(tag_filter("*"))] == ["ami-2"]
+    # only the first listing within the same process is refreshed
+    pages["describe_images"] = []
+    assert [a.id for a in aws.list_amis(tag_filter("*"))] == ["ami-2"]
+
+
+def test_incremental_refresh_of_pending_ami(inventory, client, pages, monkeypatch):
+    pages["describe_images"] = [{"Images": [
+        ami("ami-1", "1.0.0"),
+        ami("ami-2", "2.0.0", state="pending"),
+    ]}]
+    cached_aws_access(inventory, client, monkeypatch).list_amis(tag_filter("*"))
+
+    pages["describe_images"] = [{"Images": [ami("ami-2", "2.0.0", state="available")]}]
+    amis = list(cached_aws_access(inventory, client, monkeypatch).list_amis(tag_filter("*")))
+    assert {a.id: a.state for a in amis} == {"ami-1": "available", "ami-2": "available"}
+
+
+def test_incremental_refresh_filters_by_id(inventory, client, monkeypatch):
+    inventory.replace("ami", "", [
+        InventoryEntry("ami-1", "1.0.0", False, ami("ami-1", "1.0.0")),
+        InventoryEntry("ami-2", "2.0.0", True, ami("ami-2", "2.0.0", state="pending")),
+    ], PARTITION)
+    client.get_paginator.side_effect = None
+    client.get_paginator.return_value.paginate.return_value = []
+    amis = cached_aws_access(inventory, client, monkeypatch).list_amis(tag_filter("*"))
+    # the pending AMI was deregistered meanwhile
+    assert [a.id for a in amis] == ["ami-1"]
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        PaginationConfig={}, Filters=[{"Name": "image-id", "Values": ["ami-2"]}])
+
+
+def test_other_filters_bypass_inventory(inventory, client, pages, monkeypatch):
+    pages["describe_images"] = [{"Images": [ami("ami-1", "1.0.0")]}]
+    filters = [{"Name": "name", "Values": ["ai-lab-1.0.0"]}]
+    amis = cached_aws_access(inventory, client, monkeypatch).list_amis(filters)
+    assert [a.id for a in amis] == ["ami-1"]
+    assert not inventory.is_fresh("ami", "", PARTITION)
+
+
+def test_s3_objects_by_prefix(inventory, monkeypatch):
+    objects = [
+        {"Key": "ai_lab/1.0.0/vm.vmdk", "Size": 1},
+        {"Key": "ai_lab/2.0.0/vm.vmdk", "Size": 2},
+    ]
+    client = aws_client({})
+    client.get_paginator.side_effect = None
+    paginate = client.get_paginator.return_value.paginate
+    paginate.side_effect = lambda Bucket, Prefix, **kwargs: [
+        {"Contents": [o for o in objects if o["Key"].startswith(Prefix)]}
+    ]
+    aws = cached_aws_access(inventory, client, monkeypatch)
+    assert [o.key for o in aws.list_s3_objects("bucket", "ai_lab/2")] == ["ai_lab/2.0.0/vm.vmdk"]
+    assert [o.size for o in aws.list_s3_objects("bucket", "ai_lab/")] == [1, 2]
+    assert [o.key for o in aws.list_s3_objects("bucket", "ai_lab/2")] == ["ai_lab/2.0.0/vm.vmdk"]
+    assert [c.kwargs["Prefix"] for c in paginate.call_args_list] == ["ai_lab/2", "ai_lab/"]
+
+
+def test_stack_in_progress_is_refreshed(inventory, client, pages, monkeypatch):
+    created = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    pages["describe_stacks"] = [{"Stacks": [
+        {"StackName": "stack", "StackStatus": "CREATE_IN_PROGRESS", "CreationTime": created},
+    ]}]
+    cached_aws_access(inventory, client, monkeypatch).describe_stacks()
+    pages["describe_stacks"] = [{"Stacks": [
+        {"StackName": "stack", "StackStatus": "CREATE_COMPLETE", "CreationTime": created},
+    ]}]
+    stacks = list(cached_aws_access(inventory, client, monkeypatch).describe_stacks())
+    assert [(s.status, s.creation_time) for s in stacks] == [("CREATE_COMPLETE", created)]
+
+
+def test_modifying_ami_invalidates_inventory(inventory, client, pages, monkeypatch):
+    pages["describe_images"] = [{"Images": [ami("ami-1", "1.0.0")]}]
+    aws = cached_aws_access(inventory, client, monkeypatch)
+    aws.list_amis(tag_filter("*"))
+    aws.modify_image_launch_permission("ami-1", {"Add": [{"Group": "all"}]})
+    assert not inventory.is_fresh("ami", "", aws.partition)
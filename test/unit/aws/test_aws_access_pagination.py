@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+
+
+@pytest.fixture
+def client():
+    return MagicMock()
+
+
+@pytest.fixture
+def aws_access(client, monkeypatch):
+    aws = AwsAccess(None)
+    monkeypatch.setattr(aws, "_get_aws_client", lambda service_name: client)
+    return aws
+
+
+def s3_page(*keys):
+    return {"Contents": [{"Key": key, "Size": 1} for key in keys]}
+
+
+def test_list_s3_objects_all_pages(aws_access, client):
+    client.get_paginator.return_value.paginate.return_value = [
+        s3_page("a", "b"),
+        s3_page("c"),
+        {},
+    ]
+    objects = aws_access.list_s3_objects(bucket="bucket", prefix="ai_lab/1.0")
+    assert [o.key for o in objects] == ["a", "b", "c"]
+    client.get_paginator.assert_called_once_with("list_objects_v2")
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        PaginationConfig={}, Bucket="bucket", Prefix="ai_lab/1.0")
+
+
+def test_list_s3_objects_is_lazy(aws_access, client):
+    def pages():
+        yield s3_page("a")
+        raise AssertionError("Second page must not be retrieved")
+
+    client.get_paginator.return_value.paginate.return_value = pages()
+    objects = aws_access.list_s3_objects(bucket="bucket", prefix="")
+    assert next(objects).key == "a"
+
+
+def test_max_results_and_page_size(aws_access, client):
+    client.get_paginator.return_value.paginate.return_value = [s3_page("a", "b")]
+    objects = aws_access.list_s3_objects(bucket="bucket", prefix="", max_results=2, page_size=100)
+    assert [o.key for o in objects] == ["a", "b"]
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        PaginationConfig={"MaxItems": 2, "PageSize": 100}, Bucket="bucket", Prefix="")
+
+
+FILTERS = [{"Name": "tag:exa_data_science_sandbox", "Values": ["*"]}]
+
+
+@pytest.mark.parametrize("method, operation, key, id_key", [
+    ("list_amis", "describe_images", "Images", "ImageId"),
+    ("list_snapshots", "describe_snapshots", "Snapshots", "SnapshotId"),
+    ("list_export_image_tasks", "describe_export_image_tasks", "ExportImageTasks", "ExportImageTaskId"),
+])
+def test_list_ec2_assets_all_pages(aws_access, client, method, operation, key, id_key):
+    client.get_paginator.return_value.paginate.return_value = [
+        {key: [{id_key: "id-1"}, {id_key: "id-2"}]},
+        {key: [{id_key: "id-3"}]},
+    ]
+    assets = getattr(aws_access, method)(filters=FILTERS, page_size=2)
+    assert [a.id for a in assets] == ["id-1", "id-2", "id-3"]
+    client.get_paginator.assert_called_once_with(operation)
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        PaginationConfig={"PageSize": 2}, Filters=FILTERS)
+
+
+def test_list_amis_owners(aws_access, client):
+    client.get_paginator.return_value.paginate.return_value = [{"Images": []}]
+    list(aws_access.list_amis(filters=FILTERS, owners=["self"]))
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        PaginationConfig={}, Filters=FILTERS, Owners=["self"])
+
+
+def test_describe_stacks_all_pages(aws_access, client):
+    client.get_paginator.return_value.paginate.return_value = [
+        {"Stacks": [{"StackName": "stack-1"}]},
+        {"Stacks": [{"StackName": "stack-2"}]},
+    ]
+    stacks = aws_access.describe_stacks()
+    assert [s.name for s in stacks] == ["stack-1", "stack-2"]
+    client.get_paginator.assert_called_once_with("describe_stacks")
+
+
+def test_stack_resources_all_pages(aws_access, client):
+    client.get_paginator.return_value.paginate.return_value = [
+        {"StackResourceSummaries": [{"PhysicalResourceId": "r-1"}]},
+        {"StackResourceSummaries": [{"PhysicalResourceId": "r-2"}]},
+    ]
+    resources = aws_access.get_all_stack_resources("stack")
+    assert [r.physical_id for r in resources] == ["r-1", "r-2"]
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        PaginationConfig={}, StackName="stack")
+
+
+def test_list_ec2_key_pairs_max_results(aws_access, client):
+    client.describe_key_pairs.return_value = {
+        "KeyPairs": [{"KeyPairId": f"key-{i}"} for i in range(3)]
+    }
+    key_pairs = aws_access.list_ec2_key_pairs(filters=FILTERS, max_results=2)
+    assert [k.id for k in key_pairs] == ["key-0", "key-1"]
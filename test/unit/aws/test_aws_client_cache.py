@@ -0,0 +1,78 @@
+import time
+import tracemalloc
+
+import boto3
+import pytest
+
+from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+from exasol.ds.sandbox.lib.aws_access.client_cache import AwsClientCache
+
+REGION = "eu-central-1"
+
+
+@pytest.fixture(autouse=True)
+def dummy_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+
+
+def test_client_is_reused():
+    cache = AwsClientCache()
+    client = cache.client(None, REGION, "ec2")
+    assert cache.client(None, REGION, "ec2") is client
+
+
+def test_clients_differ_by_region_and_service():
+    cache = AwsClientCache()
+    ec2 = cache.client(None, REGION, "ec2")
+    assert cache.client(None, "us-east-1", "ec2") is not ec2
+    assert cache.client(None, REGION, "s3") is not ec2
+
+
+def test_max_pool_connections():
+    cache = AwsClientCache(max_pool_connections=25)
+    client = cache.client(None, REGION, "s3")
+    assert client.meta.config.max_pool_connections == 25
+
+
+def test_instantiate_for_region_shares_cache():
+    aws = AwsAccess(None, region=REGION)
+    other = aws.instantiate_for_region("us-east-1")
+    assert other._client_cache is aws._client_cache
+    assert other._get_aws_client("ec2").meta.region_name == "us-east-1"
+    assert aws._get_aws_client("ec2").meta.region_name == REGION
+
+
+def measure(func, repetitions: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        func()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration / repetitions, peak
+
+
+def test_benchmark_cached_client_creation():
+    """
+    Compares creating a fresh session and client per call (former
+    behavior of AwsAccess._get_aws_client()) with retrieving the client
+    from the cache. Creating a client does not contact AWS, so no server is
+    required.
+    """
+    repetitions = 3
+
+    def uncached():
+        boto3.session.Session().client("ec2", region_name=REGION)
+
+    aws = AwsAccess(None, region=REGION)
+    aws._get_aws_client("ec2")
+    uncached_time, uncached_memory = measure(uncached, repetitions)
+    cached_time, cached_memory = measure(lambda: aws._get_aws_client("ec2"), repetitions)
+    print(
+        f"\nclient creation: uncached {uncached_time * 1000:.3f} ms, {uncached_memory} bytes"
+        f" / cached {cached_time * 1000:.3f} ms, {cached_memory} bytes")
+    assert cached_time * 10 < uncached_time
+    assert cached_memory < uncached_memory
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from exasol.ds.sandbox.lib.aws_access.aws_access import (
+    AwsAccess,
+    Progress,
+    S3_MIN_PART_SIZE,
+    s3_copy_part_ranges,
+)
+
+MB = 1024 * 1024
+BUCKET = "bucket"
+
+
+@pytest.mark.parametrize("size, part_size, expected", [
+    (0, 5 * MB, []),
+    (3 * MB, 5 * MB, [(1, 0, 3 * MB - 1)]),
+    (10 * MB, 5 * MB, [(1, 0, 5 * MB - 1), (2, 5 * MB, 10 * MB - 1)]),
+    (11 * MB, 5 * MB, [(1, 0, 5 * MB - 1), (2, 5 * MB, 10 * MB - 1), (3, 10 * MB, 11 * MB - 1)]),
+])
+def test_s3_copy_part_ranges(size, part_size, expected):
+    assert s3_copy_part_ranges(size, part_size) == expected
+
+
+def test_s3_copy_part_ranges_max_parts():
+    parts = s3_copy_part_ranges(100_000 * S3_MIN_PART_SIZE, S3_MIN_PART_SIZE)
+    assert len(parts) == 10000
+    assert parts[-1][2] == 100_000 * S3_MIN_PART_SIZE - 1
+
+
+def test_s3_copy_part_ranges_invalid_part_size():
+    with pytest.raises(ValueError):
+        s3_copy_part_ranges(10 * MB, MB)
+
+
+@pytest.fixture
+def s3_client():
+    client = MagicMock()
+    client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    client.upload_part_copy.side_effect = lambda **kwargs: {
+        "CopyPartResult": {"ETag": f"etag-{kwargs['PartNumber']}"}
+    }
+    return client
+
+
+@pytest.fixture
+def aws_access(s3_client, monkeypatch):
+    aws = AwsAccess(None)
+    monkeypatch.setattr(aws, "_get_aws_client", lambda service_name: s3_client)
+    return aws
+
+
+def test_copy_small_object(aws_access, s3_client):
+    s3_client.head_object.return_value = {"ContentLength": 3 * MB}
+    aws_access.copy_large_s3_object(BUCKET, "src", "dest", part_size="5 MB")
+    s3_client.copy_object.assert_called_once_with(
+        Bucket=BUCKET, CopySource={"Bucket": BUCKET, "Key": "src"}, Key="dest")
+    s3_client.create_multipart_upload.assert_not_called()
+
+
+def test_copy_multipart(aws_access, s3_client):
+    s3_client.head_object.return_value = {"ContentLength": 12 * MB}
+    progress = Progress("1 MB")
+    aws_access.copy_large_s3_object(BUCKET, "src", "dest", progress=progress, part_size="5 MB")
+    ranges = sorted(c.kwargs["CopySourceRange"] for c in s3_client.upload_part_copy.call_args_list)
+    assert ranges == [
+        f"bytes=0-{5 * MB - 1}",
+        f"bytes={10 * MB}-{12 * MB - 1}",
+        f"bytes={5 * MB}-{10 * MB - 1}",
+    ]
+    s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket=BUCKET,
+        Key="dest",
+        UploadId="upload-1",
+        MultipartUpload={"Parts": [
+            {"PartNumber": i, "ETag": f"etag-{i}"} for i in (1, 2, 3)
+        ]},
+    )
+    assert progress._processed == 12 * MB
+    s3_client.download_file.assert_not_called()
+    s3_client.abort_multipart_upload.assert_not_called()
+
+
+def test_copy_multipart_failure_aborts_upload(aws_access, s3_client):
+    s3_client.head_object.return_value = {"ContentLength": 12 * MB}
+    s3_client.upload_part_copy.side_effect = RuntimeError("copy failed")
+    with pytest.raises(RuntimeError, match="copy failed"):
+        aws_access.copy_large_s3_object(BUCKET, "src", "dest", part_size="5 MB")
+    s3_client.complete_multipart_upload.assert_not_called()
+    assert s3_client.abort_multipart_upload.call_args == call(
+        Bucket=BUCKET, Key="dest", UploadId="upload-1")
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+from exasol.ds.sandbox.lib.aws_access.deployer import (
+    Deployer,
+    template_fingerprint,
+)
+from exasol.ds.sandbox.lib.tags import create_default_asset_tag
+
+TEMPLATE = "Resources:\n  Bucket:\n    Type: AWS::S3::Bucket\n"
+TAGS = create_default_asset_tag("1.0.0")
+
+
+def cf_client(template=TEMPLATE, tags=TAGS, status="CREATE_COMPLETE"):
+    client = MagicMock()
+    client.describe_stacks.return_value = {"Stacks": [{
+        "StackName": "stack",
+        "StackStatus": status,
+        "Tags": tags,
+    }]}
+    client.get_template.return_value = {"TemplateBody": template}
+    return client
+
+
+def test_fingerprint_ignores_order():
+    tags = [{"Key": "a", "Value": "1"}, {"Key": "b", "Value": "2"}]
+    assert template_fingerprint(TEMPLATE, [], tags) == \
+        template_fingerprint(TEMPLATE, [], list(reversed(tags)))
+
+
+@pytest.mark.parametrize("client, expected", [
+    (cf_client(), True),
+    (cf_client(template=TEMPLATE + "\n"), False),
+    (cf_client(tags=create_default_asset_tag("2.0.0")), False),
+    (cf_client(status="UPDATE_ROLLBACK_COMPLETE"), False),
+    (cf_client(template={"Resources": {}}), False),
+])
+def test_is_up_to_date(client, expected):
+    assert Deployer(client).is_up_to_date("stack", TEMPLATE, [], TAGS) == expected
+
+
+def test_is_up_to_date_without_stack():
+    client = cf_client()
+    client.describe_stacks.return_value = {"Stacks": []}
+    assert not Deployer(client).is_up_to_date("stack", TEMPLATE, [], TAGS)
+    client.get_template.assert_not_called()
+
+
+@pytest.fixture
+def aws_access(monkeypatch):
+    def testee(client):
+        aws = AwsAccess(None)
+        monkeypatch.setattr(aws, "_get_aws_client", lambda service_name: client)
+        return aws
+    return testee
+
+
+def test_upload_skips_unchanged_stack(aws_access):
+    client = cf_client()
+    aws_access(client).upload_cloudformation_stack(TEMPLATE, "stack", tags=TAGS)
+    client.create_change_set.assert_not_called()
+    client.execute_change_set.assert_not_called()
+
+
+def test_upload_deploys_changed_stack(aws_access):
+    client = cf_client(template="Resources: {}\n")
+    client.get_template_summary.return_value = {"Parameters": []}
+    aws_access(client).upload_cloudformation_stack(TEMPLATE, "stack", tags=TAGS)
+    assert client.create_change_set.call_args.kwargs["TemplateBody"] == TEMPLATE
+    client.execute_change_set.assert_called_once()
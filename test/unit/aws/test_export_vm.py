@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+
 from unittest.mock import call, create_autospec, MagicMock
 
 import pytest
@@ -56,6 +58,14 @@ def get_ami_side_effect(counter: int, ami_id: str) -> Ami:
         raise ValueError(f"Unexpect parameter: {ami_id}")
 
 
+def export_image_task_id(disk_format: VmDiskImageFormat) -> str:
+    return f"export-ami-{disk_format.value.lower()}"
+
+
+def get_export_image_tasks_side_effect(export_image_task_ids):
+    return [get_export_image_task_mock_data(False, task_id) for task_id in export_image_task_ids]
+
+
 @pytest.fixture
 def aws_vm_export_mock():
     """
@@ -64,8 +74,12 @@ def aws_vm_export_mock():
     1. the mocked VM Bucket Cloudformation stack when calling
        get_all_stack_resources()
     2. TEST_AMI_ID when calling create_image_from_ec2_instance()
-    3. the mocked ExportImageTask object when calling get_export_image_task()
-    4. the mocked Ami object when calling get_ami()
+    3. a separate export image task id per disk format when calling
+       export_ami_image_to_vm()
+    4. the mocked active ExportImageTask object when calling
+       get_export_image_task() and the completed ones when calling
+       get_export_image_tasks()
+    5. the mocked Ami object when calling get_ami()
        (see method get_ami_side_effect() for details)
     """
     aws: AwsAccess | MagicMock = create_autospec(AwsAccess, spec_set=True)
@@ -73,7 +87,11 @@ def aws_vm_export_mock():
         get_s3_cloudformation_mock_data() + \
         get_waf_cloudformation_mock_data()
     mock_cast(aws.create_image_from_ec2_instance).return_value = TEST_AMI_ID
-    mock_cast(aws.get_export_image_task).return_value = get_export_image_task_mock_data(False)
+    mock_cast(aws.export_ami_image_to_vm).side_effect = \
+        lambda disk_format, **kwargs: export_image_task_id(disk_format)
+    mock_cast(aws.get_export_image_task).side_effect = \
+        lambda task_id: get_export_image_task_mock_data(True, task_id)
+    mock_cast(aws.get_export_image_tasks).side_effect = get_export_image_tasks_side_effect
     mock_cast(aws.get_ami).side_effect = get_ami_side_effect
     return aws
 
@@ -108,6 +126,7 @@ def test_export_vm(aws_vm_export_mock, default_asset_id, vm_formats_to_test, tes
             name=default_asset_id.ami_name,
             tag_value=default_asset_id.tag_value,
             description="Image Description",
+            extra_tags=None,
         )
 
     expected_calls = [
@@ -126,7 +145,7 @@ def test_export_vm(aws_vm_export_mock, default_asset_id, vm_formats_to_test, tes
     for disk_format in vm_formats_to_test:
         source = build_image_source(
             prefix=default_asset_id.bucket_prefix,
-            export_image_task_id="export-ami-123",
+            export_image_task_id=export_image_task_id(disk_format),
             vm_image_format=disk_format,
         )
         dest = build_image_destination(
@@ -137,5 +156,85 @@ def test_export_vm(aws_vm_export_mock, default_asset_id, vm_formats_to_test, tes
         expected_calls_copy.append(call(bucket=TEST_BUCKET_ID, source=source, dest=dest))
         expected_calls_delete.append(call(bucket=TEST_BUCKET_ID, source=source))
 
-    assert mock_cast(aws.copy_large_s3_object).call_args_list == expected_calls_copy
-    assert mock_cast(aws.delete_s3_object).call_args_list == expected_calls_delete
+    # renaming runs in parallel, hence the order of the calls is not deterministic
+    assert sorted(mock_cast(aws.copy_large_s3_object).call_args_list, key=str) == \
+        sorted(expected_calls_copy, key=str)
+    assert sorted(mock_cast(aws.delete_s3_object).call_args_list, key=str) == \
+        sorted(expected_calls_delete, key=str)
+    mock_cast(aws.cancel_export_task).assert_not_called()
+
+
+def test_export_vm_failure_cancels_active_tasks(aws_vm_export_mock, default_asset_id, test_config):
+    """
+    Test that all export image tasks which are still active are cancelled,
+    if one of the export image tasks failed.
+    """
+    aws = aws_vm_export_mock
+    vmdk_id = export_image_task_id(VmDiskImageFormat.VMDK)
+    vhd_id = export_image_task_id(VmDiskImageFormat.VHD)
+
+    def failed_vmdk_task(task_ids):
+        failed = get_export_image_task_mock_data(False, vmdk_id)
+        failed._aws_object["Status"] = "deleted"
+        return [
+            failed if task_id == vmdk_id else get_export_image_task_mock_data(True, task_id)
+            for task_id in task_ids
+        ]
+
+    mock_cast(aws.get_export_image_tasks).side_effect = failed_vmdk_task
+    with pytest.raises(RuntimeError, match="Export failed"):
+        export_vm(
+            aws_access=aws,
+            instance_id=INSTANCE_ID,
+            vm_image_formats=(VmDiskImageFormat.VMDK.value, VmDiskImageFormat.VHD.value),
+            asset_id=default_asset_id,
+            configuration=test_config,
+        )
+    mock_cast(aws.get_export_image_tasks).assert_called_once_with([vmdk_id, vhd_id])
+    mock_cast(aws.cancel_export_task).assert_called_once_with(vhd_id)
+    mock_cast(aws.copy_large_s3_object).assert_not_called()
+
+
+def test_export_vm_failure_cancels_tasks_before_waiting_for_renames(
+        aws_vm_export_mock, default_asset_id, test_config):
+    """
+    Test that the active export image tasks are cancelled while the S3
+    object of a completed export image task is still being renamed.
+    """
+    aws = aws_vm_export_mock
+    vmdk_id = export_image_task_id(VmDiskImageFormat.VMDK)
+    raw_id = export_image_task_id(VmDiskImageFormat.RAW)
+    vhd_id = export_image_task_id(VmDiskImageFormat.VHD)
+    cancelled = threading.Event()
+    cancelled_during_rename = []
+
+    def export_image_tasks(task_ids):
+        if vmdk_id in task_ids:
+            return [get_export_image_task_mock_data(task_id != vmdk_id, task_id) for task_id in task_ids]
+        failed = get_export_image_task_mock_data(False, raw_id)
+        failed._aws_object["Status"] = "deleted"
+        return [
+            failed if task_id == raw_id else get_export_image_task_mock_data(True, task_id)
+            for task_id in task_ids
+        ]
+
+    def copy_large_s3_object(**kwargs):
+        cancelled_during_rename.append(cancelled.wait(timeout=5))
+
+    mock_cast(aws.get_export_image_tasks).side_effect = export_image_tasks
+    mock_cast(aws.copy_large_s3_object).side_effect = copy_large_s3_object
+    mock_cast(aws.cancel_export_task).side_effect = lambda task_id: cancelled.set()
+    with pytest.raises(RuntimeError, match="Export failed"):
+        export_vm(
+            aws_access=aws,
+            instance_id=INSTANCE_ID,
+            vm_image_formats=(
+                VmDiskImageFormat.VMDK.value,
+                VmDiskImageFormat.RAW.value,
+                VmDiskImageFormat.VHD.value,
+            ),
+            asset_id=default_asset_id,
+            configuration=test_config,
+        )
+    mock_cast(aws.cancel_export_task).assert_called_once_with(vhd_id)
+    assert cancelled_during_rename == [True]
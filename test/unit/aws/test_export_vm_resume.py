@@ -0,0 +1,173 @@
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from exasol.ds.sandbox.lib.asset_id import AssetId
+from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+from exasol.ds.sandbox.lib.aws_access.export_image_task import ExportImageTask
+from exasol.ds.sandbox.lib.checkpoints import (
+    AMI_CREATED,
+    Checkpoints,
+    export_started,
+    image_renamed,
+)
+from exasol.ds.sandbox.lib.export_vm.rename_s3_objects import (
+    build_image_destination,
+    build_image_source,
+)
+from exasol.ds.sandbox.lib.export_vm.run_export_vm import (
+    export_vm_images,
+    resumable_ami,
+)
+from exasol.ds.sandbox.lib.export_vm.vm_disk_image_format import VmDiskImageFormat
+from exasol.ds.sandbox.lib.run_create_vm import run_create_vm
+
+REGION = "eu-central-1"
+BUCKET = "vm-bucket"
+ROLE = "vmimport-role"
+
+# moto does not support export image tasks, hence the tests simulate them
+# while AMIs and S3 objects are managed by moto.
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SECURITY_TOKEN", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", REGION)
+    with mock_aws():
+        boto3.client("s3", region_name=REGION).create_bucket(
+            Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": REGION})
+        yield AwsAccess(None, region=REGION)
+
+
+@pytest.fixture
+def asset_id():
+    return AssetId("resume-test")
+
+
+@pytest.fixture
+def checkpoints(tmp_path, asset_id):
+    return Checkpoints(str(asset_id), tmp_path / "checkpoints.json")
+
+
+@pytest.fixture
+def ami_id(aws):
+    ec2 = boto3.client("ec2", region_name=REGION)
+    source_ami = ec2.describe_images(Owners=["amazon"])["Images"][0]["ImageId"]
+    instance = ec2.run_instances(ImageId=source_ami, MinCount=1, MaxCount=1)["Instances"][0]
+    return ec2.create_image(InstanceId=instance["InstanceId"], Name="ai-lab")["ImageId"]
+
+
+def prefix(asset_id: AssetId) -> str:
+    return f"{asset_id.bucket_prefix}/"
+
+
+def put_object(key: str):
+    boto3.client("s3", region_name=REGION).put_object(Bucket=BUCKET, Key=key, Body=b"image")
+
+
+def s3_keys() -> set[str]:
+    response = boto3.client("s3", region_name=REGION).list_objects_v2(Bucket=BUCKET)
+    return {o["Key"] for o in response.get("Contents", [])}
+
+
+def export_image_task(task_id: str, asset_id: AssetId, status: str = "completed") -> ExportImageTask:
+    return ExportImageTask({
+        "ExportImageTaskId": task_id,
+        "S3ExportLocation": {"S3Bucket": BUCKET, "S3Prefix": prefix(asset_id)},
+        "Status": status,
+    })
+
+
+def test_resumable_ami(aws, checkpoints, ami_id):
+    checkpoints.record(AMI_CREATED, ami_id)
+    assert resumable_ami(aws, checkpoints) == ami_id
+
+
+def test_resumable_ami_deregistered(aws, checkpoints, ami_id):
+    checkpoints.record(AMI_CREATED, ami_id)
+    checkpoints.record(export_started("VMDK"), "export-ami-1")
+    checkpoints.record(image_renamed("VMDK"), "ai_lab/resume-test/exasol-ai-lab-resume-test.vmdk")
+    aws.deregister_ami(ami_id)
+    assert resumable_ami(aws, checkpoints) is None
+    assert checkpoints.stages() == {}
+
+
+def test_export_vm_images_resume(aws, asset_id, checkpoints, ami_id, tmp_path, test_config):
+    """
+    VMDK: renamed S3 object exists, the format is skipped.
+    VHD: the export image task has completed, only the rename is repeated.
+    RAW: no checkpoint, a new export image task is started.
+    """
+    vmdk = build_image_destination(prefix(asset_id), asset_id, VmDiskImageFormat.VMDK)
+    put_object(vmdk)
+    put_object(build_image_source(prefix(asset_id), "export-vhd", VmDiskImageFormat.VHD))
+    put_object(build_image_source(prefix(asset_id), "export-raw", VmDiskImageFormat.RAW))
+    checkpoints.record(image_renamed("VMDK"), vmdk)
+    checkpoints.record(export_started("VHD"), "export-vhd")
+
+    resumed = Checkpoints(str(asset_id), tmp_path / "checkpoints.json", resume=True)
+    tasks = {
+        "export-vhd": export_image_task("export-vhd", asset_id),
+        "export-raw": export_image_task("export-raw", asset_id),
+    }
+    with patch.object(aws, "export_ami_image_to_vm", return_value="export-raw") as export, \
+            patch.object(aws, "get_export_image_task", side_effect=lambda i: tasks[i]), \
+            patch.object(aws, "get_export_image_tasks", side_effect=lambda ids: [tasks[i] for i in ids]):
+        export_vm_images(aws, ("VMDK", "VHD", "RAW"), asset_id.tag_value, ami_id, ROLE, BUCKET,
+                         asset_id, test_config, resumed)
+
+    assert [c.kwargs["disk_format"] for c in export.call_args_list] == [VmDiskImageFormat.RAW]
+    expected = {
+        build_image_destination(prefix(asset_id), asset_id, f)
+        for f in (VmDiskImageFormat.VMDK, VmDiskImageFormat.VHD, VmDiskImageFormat.RAW)
+    }
+    assert s3_keys() == expected
+    stages = Checkpoints(str(asset_id), tmp_path / "checkpoints.json", resume=True).stages()
+    assert stages[export_started("RAW")] == "export-raw"
+    assert stages[image_renamed("VHD")] == build_image_destination(
+        prefix(asset_id), asset_id, VmDiskImageFormat.VHD)
+
+
+def test_export_vm_images_restarts_cancelled_task(aws, asset_id, checkpoints, ami_id, test_config):
+    checkpoints.record(export_started("VHD"), "export-old")
+    put_object(build_image_source(prefix(asset_id), "export-new", VmDiskImageFormat.VHD))
+    tasks = {
+        "export-old": export_image_task("export-old", asset_id, status="deleted"),
+        "export-new": export_image_task("export-new", asset_id),
+    }
+    with patch.object(aws, "export_ami_image_to_vm", return_value="export-new") as export, \
+            patch.object(aws, "get_export_image_task", side_effect=lambda i: tasks[i]), \
+            patch.object(aws, "get_export_image_tasks", side_effect=lambda ids: [tasks[i] for i in ids]):
+        export_vm_images(aws, ("VHD",), asset_id.tag_value, ami_id, ROLE, BUCKET,
+                         asset_id, test_config, checkpoints)
+    export.assert_called_once()
+    assert checkpoints.get(export_started("VHD")) == "export-new"
+
+
+@patch("exasol.ds.sandbox.lib.run_create_vm.export_ami")
+@patch("exasol.ds.sandbox.lib.run_create_vm.run_lifecycle_for_ec2")
+def test_run_create_vm_resume_skips_ec2(
+        run_lifecycle_mock, export_ami_mock, aws, asset_id, ami_id, tmp_path, test_config):
+    checkpoint_file = tmp_path / "checkpoints.json"
+    Checkpoints(str(asset_id), checkpoint_file).record(AMI_CREATED, ami_id)
+    run_create_vm(
+        aws_access=aws,
+        ec2_instance_type="t2.medium",
+        ec2_source_ami=None,
+        ec2_key_file=None,
+        ec2_key_name=None,
+        default_password="secret",
+        vm_image_formats=("VMDK",),
+        asset_id=asset_id,
+        configuration=test_config,
+        user_name=None,
+        make_ami_public=False,
+        resume=True,
+        checkpoint_file=checkpoint_file,
+    )
+    run_lifecycle_mock.assert_not_called()
+    assert export_ami_mock.call_args.args[1] == ami_id
@@ -83,3 +83,33 @@ def test_latest_success(test_config):
 def test_latest_failure(finder_without_amis):
     with pytest.raises(FindAmiError):
         finder_without_amis.find(None)
+
+
+def test_by_tag(test_config):
+    specs = [
+        AmiSpec("2024-01-10", "ami-older"),
+        AmiSpec("2024-02-10", "ami-newer"),
+    ]
+    aws = aws_mock(specs)
+    testee = AmiFinder(aws, test_config.source_ami_filters)
+    ami = testee.by_tag("exa_ai_lab_base_hash", "abc")
+    assert ami.id == "ami-newer"
+    assert aws.list_amis.call_args.kwargs["filters"] == [
+        {"Name": "tag:exa_ai_lab_base_hash", "Values": ["abc"]},
+        {"Name": "state", "Values": ["available"]},
+    ]
+    assert aws.list_amis.call_args.kwargs["owners"] == ["self"]
+
+
+def test_by_tag_accept(test_config):
+    specs = [
+        AmiSpec("2024-01-10", "ami-older"),
+        AmiSpec("2024-02-10", "ami-newer"),
+    ]
+    testee = AmiFinder(aws_mock(specs), test_config.source_ami_filters)
+    ami = testee.by_tag("exa_ai_lab_base_hash", "abc", lambda a: a.id != "ami-newer")
+    assert ami.id == "ami-older"
+
+
+def test_by_tag_not_found(finder_without_amis):
+    assert finder_without_amis.by_tag("exa_ai_lab_base_hash", "abc") is None
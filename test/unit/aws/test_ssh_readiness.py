@@ -0,0 +1,131 @@
+import socket
+import subprocess
+import threading
+from copy import copy
+from unittest.mock import MagicMock
+
+import pytest
+
+from exasol.ds.sandbox.lib.setup_ec2 import ssh_readiness
+from exasol.ds.sandbox.lib.setup_ec2.ssh_readiness import (
+    CLOUD_INIT_BOOT_FINISHED,
+    SshReadinessProbe,
+    wait_until_ssh_ready,
+)
+
+
+@pytest.fixture
+def banner_server():
+    """
+    Simulates the SSH port of a host: accepts connections and sends an SSH
+    banner.
+    """
+    server = socket.create_server(("localhost", 0))
+    port = server.getsockname()[1]
+
+    def serve():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            with connection:
+                connection.sendall(b"SSH-2.0-OpenSSH_8.9\r\n")
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield port
+    server.close()
+
+
+@pytest.fixture
+def unused_port():
+    with socket.create_server(("localhost", 0)) as s:
+        return s.getsockname()[1]
+
+
+def ssh_run(returncodes):
+    """
+    Fake for subprocess.run() returning the given return code per remote
+    command.
+    """
+    def run(command, **kwargs):
+        return subprocess.CompletedProcess(command, returncodes[command[-1]])
+    return MagicMock(side_effect=run)
+
+
+def test_banner_received(banner_server):
+    probe = SshReadinessProbe("localhost", None, port=banner_server)
+    assert probe.banner_received()
+
+
+def test_port_not_reachable(unused_port):
+    probe = SshReadinessProbe("localhost", None, port=unused_port, connect_timeout=1)
+    assert not probe.banner_received()
+    assert not probe.is_ready()
+
+
+def test_ssh_command_uses_key_file():
+    run = ssh_run({"true": 0})
+    probe = SshReadinessProbe("my-host", "/path/key.pem", run=run)
+    assert probe.authenticated()
+    command = run.call_args.args[0]
+    assert command[0] == "ssh"
+    assert command[-2:] == ["ubuntu@my-host", "true"]
+    assert "BatchMode=yes" in command
+    assert command[command.index("-i") + 1] == "/path/key.pem"
+
+
+@pytest.mark.parametrize("auth, cloud_init, wait_for_cloud_init, expected", [
+    (255, 1, True, False),
+    (0, 1, True, False),
+    (0, 0, True, True),
+    (0, 1, False, True),
+])
+def test_is_ready(banner_server, auth, cloud_init, wait_for_cloud_init, expected):
+    run = ssh_run({
+        "true": auth,
+        f"test -f {CLOUD_INIT_BOOT_FINISHED}": cloud_init,
+    })
+    probe = SshReadinessProbe(
+        "localhost", None,
+        port=banner_server,
+        wait_for_cloud_init=wait_for_cloud_init,
+        run=run,
+    )
+    assert probe.is_ready() == expected
+
+
+@pytest.fixture
+def config(test_config):
+    config = copy(test_config)
+    config.ssh_readiness_timeout = 10.0
+    return config
+
+
+def test_wait_until_ready(config, monkeypatch):
+    sleep = MagicMock()
+    monkeypatch.setattr(ssh_readiness.time, "sleep", sleep)
+    probe = MagicMock()
+    probe.is_ready.side_effect = [False, False, True]
+    wait_until_ssh_ready("my-host", None, config, probe)
+    assert probe.is_ready.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_wait_until_ready_fallback(config, monkeypatch):
+    config.ssh_readiness_probe = False
+    sleep = MagicMock()
+    monkeypatch.setattr(ssh_readiness.time, "sleep", sleep)
+    probe = MagicMock()
+    wait_until_ssh_ready("my-host", None, config, probe)
+    sleep.assert_called_once_with(config.time_to_wait_for_polling)
+    probe.is_ready.assert_not_called()
+
+
+def test_wait_until_ready_timeout(config, caplog):
+    config.ssh_readiness_timeout = 0.0
+    probe = MagicMock()
+    probe.is_ready.return_value = False
+    wait_until_ssh_ready("my-host", None, config, probe)
+    assert "did not become ready" in caplog.text
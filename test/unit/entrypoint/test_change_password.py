@@ -1,4 +1,11 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
 from inspect import cleandoc
+from pathlib import Path
 from test.unit.entrypoint.entrypoint_mock import entrypoint_method
 from unittest.mock import (
     Mock,
@@ -22,7 +29,7 @@ def test_failure(mocker, caplog):
     mocker.patch(entrypoint_method("subprocess.run"))
     mocker.patch(entrypoint_method("sys.exit"))
     rc = 123
-    entrypoint.subprocess.run.return_value = Mock(returncode=rc, stdout="some error")
+    entrypoint.subprocess.run.return_value = Mock(returncode=rc, stdout="", stderr="some error")
     entrypoint.change_jupyter_password("jcore", "new-pwd", env={})
     entrypoint.sys.exit.call_args == call(rc)
     expected = cleandoc(
@@ -33,3 +40,87 @@ def test_failure(mocker, caplog):
         """
     )
     assert expected in caplog.text
+
+
+@pytest.fixture
+def venv_jupyter(tmp_path):
+    """
+    Jupyter core executable with a Python interpreter next to it.
+    """
+    bin = tmp_path / "venv" / "bin"
+    bin.mkdir(parents=True)
+    (bin / "python").touch()
+    return str(bin / "jupyter")
+
+
+def test_hash_written_to_config(mocker, caplog, tmp_path, venv_jupyter):
+    config_file = tmp_path / ".jupyter" / "jupyter_server_config.json"
+    config_file.parent.mkdir()
+    config_file.write_text(json.dumps({
+        "ServerApp": {"port": 1},
+        "IdentityProvider": {"hashed_password": "argon2:old"},
+    }))
+    mocker.patch(entrypoint_method("subprocess.run"))
+    entrypoint.subprocess.run.return_value = Mock(returncode=0, stdout="argon2:new\n")
+    entrypoint.change_jupyter_password(venv_jupyter, "new-pwd", env={"HOME": str(tmp_path)})
+    call_args = entrypoint.subprocess.run.call_args
+    assert call_args.args[0][:2] == [str(Path(venv_jupyter).parent / "python"), "-c"]
+    assert call_args.kwargs["input"] == "new-pwd\nargon2:old"
+    assert json.loads(config_file.read_text()) == {
+        "ServerApp": {"port": 1},
+        "IdentityProvider": {"hashed_password": "argon2:new"},
+    }
+    assert "Successfully changed the password" in caplog.text
+
+
+def test_stderr_not_written_to_config(mocker, tmp_path, venv_jupyter):
+    mocker.patch(entrypoint_method("subprocess.run"))
+    entrypoint.subprocess.run.return_value = Mock(
+        returncode=0, stdout="argon2:new\n", stderr="DeprecationWarning: something\n")
+    entrypoint.change_jupyter_password(venv_jupyter, "new-pwd", env={"HOME": str(tmp_path)})
+    assert entrypoint.subprocess.run.call_args.kwargs["stderr"] == subprocess.PIPE
+    config_file = tmp_path / ".jupyter" / "jupyter_server_config.json"
+    assert json.loads(config_file.read_text()) == {
+        "IdentityProvider": {"hashed_password": "argon2:new"},
+    }
+
+
+def test_invalid_hash_not_written(mocker, caplog, tmp_path, venv_jupyter):
+    mocker.patch(entrypoint_method("subprocess.run"))
+    mocker.patch(entrypoint_method("sys.exit"), side_effect=SystemExit)
+    entrypoint.subprocess.run.return_value = Mock(returncode=0, stdout="warning\nargon2:new\n")
+    with pytest.raises(SystemExit):
+        entrypoint.change_jupyter_password(venv_jupyter, "new-pwd", env={"HOME": str(tmp_path)})
+    assert not (tmp_path / ".jupyter").exists()
+    assert "invalid hash" in caplog.text
+
+
+def test_matching_hash_not_rewritten(mocker, caplog, tmp_path, venv_jupyter):
+    mocker.patch(entrypoint_method("subprocess.run"))
+    entrypoint.subprocess.run.return_value = Mock(returncode=0, stdout="")
+    env = {"JUPYTER_CONFIG_DIR": str(tmp_path / "config")}
+    entrypoint.change_jupyter_password(venv_jupyter, "new-pwd", env=env)
+    assert not (tmp_path / "config").exists()
+    assert "already up to date" in caplog.text
+
+
+def test_argon2_helper(tmp_path):
+    """
+    Runs the helper with the current interpreter, requiring argon2-cffi.
+    """
+    pytest.importorskip("argon2")
+
+    def run_helper(current: str) -> str:
+        p = subprocess.run(
+            [sys.executable, "-c", entrypoint.ARGON2_HELPER],
+            input=f"new-pwd\n{current}",
+            stdout=subprocess.PIPE,
+            encoding="utf-8",
+            check=True,
+        )
+        return p.stdout.strip()
+
+    hashed = run_helper("")
+    assert hashed.startswith("argon2:")
+    assert run_helper(hashed) == ""
+    assert run_helper("sha1:abc:def").startswith("argon2:")
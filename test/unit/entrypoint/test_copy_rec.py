@@ -1,4 +1,6 @@
 import contextlib
+import json
+import re
 import pytest
 
 from exasol.ds.sandbox.runtime.ansible.roles.entrypoint.files import entrypoint
@@ -65,3 +67,73 @@ def test_dir(tmp_path):
     assert copy.exists()
     assert copy.read_text() == testee.read_text()
     assert oct(copy.stat().st_mode).endswith("666")
+
+
+def test_manifest(tmp_path):
+    root = tmp_path
+    with directory(root / "src") as src:
+        create_file(src / "file.txt")
+        dst = root / "dst"
+        entrypoint.copy_rec(src, dst)
+    manifest = json.loads((dst / entrypoint.SEED_MANIFEST).read_text())
+    assert list(manifest) == ["file.txt"]
+    assert manifest["file.txt"]["sha256"] == entrypoint.file_hash(src / "file.txt")
+
+
+def test_unchanged_files_not_touched(tmp_path, mocker):
+    root = tmp_path
+    with directory(root / "src") as src:
+        create_file(src / "file.txt")
+        dst = root / "dst"
+        entrypoint.copy_rec(src, dst)
+    copy_file = mocker.patch.object(entrypoint, "copy_file")
+    file_hash = mocker.spy(entrypoint, "file_hash")
+    entrypoint.copy_rec(src, dst)
+    assert not copy_file.called
+    assert not file_hash.called
+
+
+def test_deleted_file_not_copied_again(tmp_path):
+    root = tmp_path
+    with directory(root / "src") as src:
+        create_file(src / "file.txt")
+        dst = root / "dst"
+        entrypoint.copy_rec(src, dst)
+    (dst / "file.txt").unlink()
+    entrypoint.copy_rec(src, dst)
+    assert not (dst / "file.txt").exists()
+
+
+@pytest.mark.parametrize("modified_by_user, expected", [
+    (False, "new default"),
+    (True, "user content"),
+])
+def test_changed_default(tmp_path, modified_by_user, expected):
+    root = tmp_path
+    with directory(root / "src") as src:
+        create_file(src / "file.txt")
+        dst = root / "dst"
+        entrypoint.copy_rec(src, dst)
+    if modified_by_user:
+        (dst / "file.txt").write_text("user content")
+    (src / "file.txt").write_text("new default")
+    entrypoint.copy_rec(src, dst)
+    assert (dst / "file.txt").read_text() == expected
+
+
+def test_existing_file_not_overwritten(tmp_path):
+    root = tmp_path
+    with directory(root / "src") as src:
+        create_file(src / "file.txt")
+        with directory(root / "dst") as dst:
+            (dst / "file.txt").write_text("user content")
+        entrypoint.copy_rec(src, dst)
+    assert (dst / "file.txt").read_text() == "user content"
+
+
+def test_timing_logged(tmp_path, caplog):
+    root = tmp_path
+    with directory(root / "src") as src:
+        create_file(src / "file.txt")
+        entrypoint.copy_rec(src, root / "dst")
+    assert re.search(r"Copied 1 of 1 files from .* in [0-9.]+ seconds", caplog.text)
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 from test.unit.entrypoint.entrypoint_mock import entrypoint_method
 from unittest.mock import (
@@ -105,3 +106,27 @@ def test_jupyter(mocker):
     entrypoint.main()
     assert entrypoint.start_jupyter_server.called
     assert not entrypoint.sleep_infinity.called
+
+
+def test_timings(mocker, tmp_path):
+    timings_file = tmp_path / "timings.json"
+    mocker.patch("sys.argv", [
+        "app",
+        "--user", "jennifer",
+        "--group", "users",
+        "--docker-group", "docker",
+        "--notebook-defaults", "source",
+        "--notebooks", "destination",
+        "--timings-file", str(timings_file),
+    ])
+    mocker.patch(entrypoint_method("User"))
+    mocker.patch(entrypoint_method("copy_rec"))
+    mocker.patch(entrypoint_method("sleep_infinity"))
+    entrypoint.main()
+    timings = json.loads(timings_file.read_text())
+    assert set(timings["startup_timings"]) == {
+        "chown_notebooks",
+        "enable_group_access",
+        "copy_notebooks",
+    }
+    assert timings["total"] >= 0
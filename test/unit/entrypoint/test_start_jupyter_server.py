@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import json
 import os
 import re
+import socket
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from inspect import cleandoc
 from pathlib import Path
 from test.matchers import re_search
@@ -54,19 +60,26 @@ class Testee:
             """
         )
 
-    def run(self):
+    def run(
+        self,
+        port: int = 123,
+        readiness_probe: bool = False,
+        timings_file: Path | None = None,
+    ):
         args = Mock(
             home="home",
             jupyter_server=self.server,
             jupyter_core=self.core,
-            port=123,
+            port=port,
             notebooks="notebooks",
             jupyter_logfile=self.logfile,
             user="user",
             password="default-pwd",
             venv=Path("venv"),
+            readiness_probe=readiness_probe,
+            timings_file=timings_file,
         )
-        entrypoint.start_jupyter_server(args, poll_sleep = 0.1)
+        entrypoint.start_jupyter_server(args)
         return self
 
 
@@ -112,3 +125,73 @@ def test_late_error(tmp_path, caplog):
     assert "Changed environment variable PATH to venv/bin:" in caplog.text
     assert entrypoint.SUCCESS_MESSAGE in caplog.text
     assert "Jupyter server terminated with error code 23" in caplog.text
+
+
+def success_record(caplog):
+    return next(
+        r for r in caplog.records
+        if entrypoint.SUCCESS_MESSAGE in r.getMessage()
+    )
+
+
+def test_logfile_contains_output(tmp_path):
+    testee = Testee(tmp_path).server_script().core_script().run()
+    lines = testee.logfile.read_text().splitlines()
+    assert lines[0] == "first log message"
+    assert lines[-1] == "last log message"
+
+
+def test_time_to_ready(tmp_path, caplog):
+    """
+    The server script reports to be running after 0.2 seconds and
+    terminates 0.4 seconds later.
+    """
+    start = time.time()
+    Testee(tmp_path).server_script().core_script().run()
+    time_to_ready = success_record(caplog).created - start
+    assert time_to_ready < 0.4
+
+
+class ForbiddenHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        # /api/status requires authentication
+        self.send_response(403)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = HTTPServer(("localhost", 0), ForbiddenHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_readiness_probe(tmp_path, caplog, http_server):
+    port = http_server.server_address[1]
+    Testee(tmp_path).server_script().core_script().run(port, readiness_probe=True)
+    assert entrypoint.SUCCESS_MESSAGE in caplog.text
+
+
+def test_readiness_probe_terminated_process():
+    with socket.create_server(("localhost", 0)) as s:
+        unused_port = s.getsockname()[1]
+    process = subprocess.Popen(["sleep", "0.2"])
+    assert not entrypoint.wait_for_http(unused_port, process)
+
+
+def test_timings(tmp_path, capsys):
+    timings_file = tmp_path / "timings.json"
+    with patch.dict(os.environ, {entrypoint.PASSWORD_ENV: "new-pwd"}):
+        Testee(tmp_path).server_script().core_script().run(timings_file=timings_file)
+    timings = json.loads(timings_file.read_text())
+    assert set(timings["startup_timings"]) == {
+        "change_jupyter_password",
+        "start_jupyter_server",
+    }
+    assert json.dumps(timings) in capsys.readouterr().out
@@ -1,6 +1,7 @@
 import grp
 import os
 import pwd
+import time
 import pytest
 import unittest
 
@@ -67,10 +68,80 @@ def test_chown_recursive(mocker, user, tmp_path):
     passwd_struct = MagicMock(pw_uid=444)
     mocker.patch("pwd.getpwnam", return_value=passwd_struct)
     user.chown_recursive(tmp_path)
-    expected = [ mocker.call(f, user.id, user.group.id) for f in (
-        tmp_path, child, sub, grand_child,
-    )]
-    assert expected == os.chown.call_args_list
+    expected = {
+        (str(f), user.id, user.group.id)
+        for f in (tmp_path, child, sub, grand_child)
+    }
+    actual = {(str(c.args[0]),) + c.args[1:] for c in os.chown.call_args_list}
+    assert expected == actual
+    assert len(os.chown.call_args_list) == len(expected)
+
+
+@pytest.fixture
+def current_user():
+    """
+    User with the uid and gid of the current process, as changing the
+    owner to these ids requires no privileges.
+    """
+    testee = entrypoint.User(
+        "current",
+        entrypoint.Group("current", os.getgid()),
+        entrypoint.Group("docker", 902),
+    )
+    testee._id = os.getuid()
+    return testee
+
+
+def test_chown_recursive_skipped(mocker, current_user, tmp_path):
+    (tmp_path / "child").touch()
+    current_user.chown_recursive(tmp_path)
+    assert (tmp_path / entrypoint.OWNER_MARKER).exists()
+    chown = mocker.patch("os.chown")
+    current_user.chown_recursive(tmp_path)
+    assert not chown.called
+
+
+def test_chown_recursive_other_marker(mocker, current_user, tmp_path):
+    (tmp_path / "child").touch()
+    (tmp_path / entrypoint.OWNER_MARKER).write_text("1:1")
+    chown = mocker.patch("os.chown")
+    current_user.chown_recursive(tmp_path)
+    assert chown.called
+
+
+def test_benchmark_chown_recursive(current_user, tmp_path):
+    """
+    Compares the former sequential os.walk() with the parallel walk and
+    the fast path for a synthetic tree of 100k files.
+    """
+    uid, gid = current_user.id, current_user.group.id
+    for d in range(1000):
+        dir = tmp_path / f"dir-{d}"
+        dir.mkdir()
+        for f in range(100):
+            (dir / f"file-{f}").touch()
+
+    def sequential():
+        os.chown(tmp_path, uid, gid)
+        for root, dirs, files in os.walk(tmp_path):
+            for name in files + dirs:
+                os.chown(os.path.join(root, name), uid, gid)
+
+    def measure(func) -> float:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    sequential_time = measure(sequential)
+    parallel_time = measure(lambda: entrypoint.chown_tree(tmp_path, uid, gid))
+    full_time = measure(lambda: current_user.chown_recursive(tmp_path))
+    skipped_time = measure(lambda: current_user.chown_recursive(tmp_path))
+    print(
+        f"\nchown 100k files: sequential {sequential_time:.3f} s,"
+        f" parallel {parallel_time:.3f} s, chown_recursive {full_time:.3f} s,"
+        f" skipped {skipped_time * 1000:.3f} ms"
+    )
+    assert skipped_time * 100 < sequential_time
 
 
 def test_enable_file_absent(mocker, user):
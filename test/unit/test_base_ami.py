@@ -0,0 +1,178 @@
+from unittest.mock import MagicMock, patch
+
+import threading
+
+import exasol.ansible as ansible
+import importlib_resources
+import pytest
+
+import exasol.ds.sandbox.lib.setup_ec2.base_ami as base_ami_module
+from exasol.ds.sandbox.lib.asset_id import AssetId
+from exasol.ds.sandbox.lib.aws_access.ami import Ami
+from exasol.ds.sandbox.lib.cancellation import Cancelled
+from exasol.ds.sandbox.lib.run_create_vm import run_create_vm
+from exasol.ds.sandbox.lib.setup_ec2.base_ami import (
+    BASE_STAGES,
+    REMAINING_STAGES,
+    base_ami_hash,
+    has_current_secrets,
+    secrets_tag_value,
+    with_build_stages,
+)
+from exasol.ds.sandbox.lib.tags import (
+    BASE_AMI_SECRETS_TAG_KEY,
+    BASE_AMI_TAG_KEY,
+)
+
+MODULE = "exasol.ds.sandbox.lib.run_create_vm"
+
+
+def test_base_ami_hash_depends_on_source_ami():
+    assert base_ami_hash("ami-1") == base_ami_hash("ami-1")
+    assert base_ami_hash("ami-1") != base_ami_hash("ami-2")
+
+
+def test_base_ami_hash_excludes_secrets(monkeypatch):
+    before = base_ami_hash("ami-1")
+    monkeypatch.setenv("JUPYTER_LAB_PASSWORD", "other")
+    assert base_ami_hash("ami-1") == before
+
+
+def test_base_stage_inputs_exist():
+    ansible_files = importlib_resources.files("exasol.ds.sandbox.runtime.ansible")
+    missing = [
+        p for s in BASE_STAGES for p in s.inputs
+        if not (ansible_files.joinpath(p).exists() or p.endswith(".lock"))
+    ]
+    assert missing == []
+    assert "ai_lab_docker_playbook.yml" not in BASE_STAGES[0].inputs
+
+
+def ami_with_secrets(value: str) -> Ami:
+    return Ami({"Tags": [{"Key": BASE_AMI_SECRETS_TAG_KEY, "Value": value}]})
+
+
+def test_secrets_tag(monkeypatch):
+    monkeypatch.setattr(base_ami_module, "SECRETS_ITERATIONS", 1)
+    monkeypatch.setenv("JUPYTER_LAB_PASSWORD", "secret")
+    value = secrets_tag_value()
+    assert "secret" not in value
+    assert value != secrets_tag_value()
+    assert has_current_secrets(ami_with_secrets(value))
+    monkeypatch.setenv("JUPYTER_LAB_PASSWORD", "other")
+    assert not has_current_secrets(ami_with_secrets(value))
+    assert not has_current_secrets(Ami({}))
+
+
+def test_base_stages_exclude_notebooks():
+    names = [s.name for s in BASE_STAGES]
+    assert names == ["system", "jupyter", "docker"]
+    assert not set(names) & set(REMAINING_STAGES)
+
+
+def test_with_build_stages():
+    playbook = ansible.Playbook("ec2_playbook.yml", {"a": 1})
+    assert with_build_stages(playbook, ("notebook", "final")) == ansible.Playbook(
+        "ec2_playbook.yml", {"a": 1, "build_stages": ["notebook", "final"]})
+    assert playbook.vars == {"a": 1}
+
+
+def ami(ami_id: str) -> MagicMock:
+    result = MagicMock()
+    result.id = ami_id
+    return result
+
+
+@pytest.fixture
+def pipeline():
+    with patch(f"{MODULE}.AmiFinder") as finder, \
+            patch(f"{MODULE}.run_lifecycle_for_ec2") as lifecycle, \
+            patch(f"{MODULE}.EC2StackLifecycleContextManager") as context, \
+            patch(f"{MODULE}.wait_until_ssh_ready"), \
+            patch(f"{MODULE}.run_install_dependencies") as install, \
+            patch(f"{MODULE}.run_reset_password"), \
+            patch(f"{MODULE}.export_vm"), \
+            patch(f"{MODULE}.create_base_ami") as create_base_ami:
+        finder.return_value.find.return_value = ami("ami-source")
+        context.return_value.__enter__.return_value = (MagicMock(is_running=True, id="i-1"), "key-file")
+        yield finder.return_value, lifecycle, install, create_base_ami
+
+
+def create_vm(tmp_path, test_config, base_ami_cache: bool, cancelled=None):
+    run_create_vm(
+        aws_access=MagicMock(),
+        ec2_instance_type="t2.medium",
+        ec2_source_ami=None,
+        ec2_key_file=None,
+        ec2_key_name=None,
+        default_password="secret",
+        vm_image_formats=(),
+        asset_id=AssetId("base-ami-test"),
+        configuration=test_config,
+        user_name=None,
+        make_ami_public=False,
+        checkpoint_file=tmp_path / "checkpoints.json",
+        base_ami_cache=base_ami_cache,
+        cancelled=cancelled,
+    )
+
+
+def installed_stages(install) -> list:
+    return [c.args[2].vars.get("build_stages") for c in install.call_args_list]
+
+
+def test_existing_base_ami(pipeline, tmp_path, test_config):
+    finder, lifecycle, install, create_base_ami = pipeline
+    finder.by_tag.return_value = ami("ami-base")
+    create_vm(tmp_path, test_config, base_ami_cache=True)
+    finder.by_tag.assert_called_once_with(
+        BASE_AMI_TAG_KEY, base_ami_hash("ami-source"), has_current_secrets)
+    assert lifecycle.call_args.kwargs["ami_id"] == "ami-base"
+    assert installed_stages(install) == [list(REMAINING_STAGES)]
+    create_base_ami.assert_not_called()
+
+
+def test_missing_base_ami(pipeline, tmp_path, test_config):
+    finder, lifecycle, install, create_base_ami = pipeline
+    finder.by_tag.return_value = None
+    create_vm(tmp_path, test_config, base_ami_cache=True)
+    assert lifecycle.call_args.kwargs["ami_id"] == "ami-source"
+    assert installed_stages(install) == [
+        [s.name for s in BASE_STAGES],
+        list(REMAINING_STAGES),
+    ]
+    assert create_base_ami.call_args.args[2] == base_ami_hash("ami-source")
+
+
+def test_without_base_ami_cache(pipeline, tmp_path, test_config):
+    finder, lifecycle, install, create_base_ami = pipeline
+    create_vm(tmp_path, test_config, base_ami_cache=False)
+    finder.by_tag.assert_not_called()
+    assert installed_stages(install) == [None]
+
+
+def test_cancelled_before_setup(pipeline, tmp_path, test_config):
+    finder, lifecycle, install, create_base_ami = pipeline
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(Cancelled, match="setup of EC2 instance"):
+        create_vm(tmp_path, test_config, base_ami_cache=False, cancelled=cancelled)
+    lifecycle.assert_not_called()
+
+
+def test_cancelled_before_installation(pipeline, tmp_path, test_config):
+    finder, lifecycle, install, create_base_ami = pipeline
+    cancelled = threading.Event()
+    with patch(f"{MODULE}.wait_until_ssh_ready", side_effect=lambda *args: cancelled.set()):
+        with pytest.raises(Cancelled, match="installation of dependencies"):
+            create_vm(tmp_path, test_config, base_ami_cache=False, cancelled=cancelled)
+    install.assert_not_called()
+
+
+def test_invalid_templates_before_setup(pipeline, tmp_path, test_config):
+    finder, lifecycle, install, create_base_ami = pipeline
+    with patch(f"{MODULE}.precompile_templates", side_effect=RuntimeError("Invalid templates")):
+        with pytest.raises(RuntimeError, match="Invalid templates"):
+            create_vm(tmp_path, test_config, base_ami_cache=False)
+    finder.find.assert_not_called()
+    lifecycle.assert_not_called()
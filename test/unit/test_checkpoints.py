@@ -0,0 +1,51 @@
+import json
+
+from exasol.ds.sandbox.lib.checkpoints import (
+    AMI_CREATED,
+    Checkpoints,
+    export_started,
+)
+
+
+def test_record_persists(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    Checkpoints("a1", path).record(AMI_CREATED, "ami-1")
+    assert Checkpoints("a1", path, resume=True).get(AMI_CREATED) == "ami-1"
+
+
+def test_no_resume_discards_previous_run(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    Checkpoints("a1", path).record(AMI_CREATED, "ami-1")
+    assert Checkpoints("a1", path).get(AMI_CREATED) is None
+    assert Checkpoints("a1", path, resume=True).get(AMI_CREATED) is None
+
+
+def test_other_asset_ids_are_kept(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    Checkpoints("a1", path).record(AMI_CREATED, "ami-1")
+    Checkpoints("a2", path).record(AMI_CREATED, "ami-2")
+    assert json.loads(path.read_text()) == {
+        "a1": {AMI_CREATED: "ami-1"},
+        "a2": {AMI_CREATED: "ami-2"},
+    }
+
+
+def test_discard(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    checkpoints = Checkpoints("a1", path)
+    checkpoints.record(AMI_CREATED, "ami-1")
+    checkpoints.record(export_started("VMDK"), "export-1")
+    checkpoints.discard(AMI_CREATED)
+    assert Checkpoints("a1", path, resume=True).stages() == {export_started("VMDK"): "export-1"}
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    path.write_text("{")
+    assert Checkpoints("a1", path, resume=True).stages() == {}
+
+
+def test_in_memory(tmp_path):
+    checkpoints = Checkpoints("a1", path=None, resume=True)
+    checkpoints.record(AMI_CREATED, "ami-1")
+    assert checkpoints.get(AMI_CREATED) == "ami-1"
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import (
     Mock,
@@ -184,4 +186,21 @@ def test_create_vm_command(
         configuration=default_config_object,
         user_name="user-name",
         make_ami_public=True,
+        resume=False,
+        base_ami_cache=False,
     )
+
+
+def test_resolved_command_is_bound_in_package():
+    """
+    Resolving a command via the CLI group imports its module, which must
+    not hide the command behind the module in package commands.
+    """
+    script = (
+        "import click\n"
+        "from exasol.ds.sandbox.cli.cli import cli\n"
+        "command = cli.get_command(click.Context(cli), 'start-ec2')\n"
+        "from exasol.ds.sandbox.cli.commands import start_ec2\n"
+        "assert start_ec2 is command, start_ec2\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
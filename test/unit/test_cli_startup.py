@@ -0,0 +1,55 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Regression threshold for the cumulative time of importing the CLI, which
+# takes about 30 ms. The margin accounts for slow and busy CI runners.
+MAX_IMPORT_SECONDS = 0.5
+
+HEAVY_MODULES = [
+    "boto3",
+    "docker",
+    "exasol.ansible",
+    "git",
+    "jinja2",
+    "pandas",
+    "rich",
+]
+
+IMPORT_TIME = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$")
+
+
+def imported_modules(*args: str) -> dict[str, float]:
+    """
+    Run the CLI with option -X importtime and return the cumulative import
+    time in seconds of each top-level import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            modules[match.group(3)] = int(match.group(1)) / 1e6
+    return modules
+
+
+def test_import_time():
+    modules = imported_modules("-c", "import exasol.ds.sandbox.main")
+    assert modules["exasol.ds.sandbox.main"] < MAX_IMPORT_SECONDS
+
+
+@pytest.mark.parametrize("args", [
+    ("--help",),
+    ("create-vm", "--help"),
+    ("show-aws-assets", "--help"),
+    ("create-docker-image", "--help"),
+    ("release", "notes", "--help"),
+])
+def test_help_does_not_import_heavy_modules(args):
+    modules = imported_modules("-m", "exasol.ds.sandbox.main", *args)
+    assert not [m for m in HEAVY_MODULES if m in modules]
@@ -0,0 +1,117 @@
+import threading
+from unittest.mock import MagicMock
+
+import docker
+import importlib_resources
+import pytest
+
+from exasol.ds.sandbox.lib.cancellation import Cancelled
+from exasol.ds.sandbox.lib.dss_docker.build_stages import (
+    STAGES,
+    StageImages,
+    stage_hashes,
+)
+from exasol.ds.sandbox.lib.dss_docker.create_image import DssDockerImage
+
+
+@pytest.fixture
+def docker_file(tmp_path):
+    file = tmp_path / "Dockerfile"
+    file.write_text("FROM ubuntu:22.04\n")
+    return file
+
+
+def test_stage_inputs_exist():
+    ansible_files = importlib_resources.files("exasol.ds.sandbox.runtime.ansible")
+    missing = [
+        p for s in STAGES for p in s.inputs
+        if not (ansible_files.joinpath(p).exists() or p.endswith(".lock"))
+    ]
+    assert missing == []
+
+
+def test_hashes_are_chained(docker_file, monkeypatch):
+    before = stage_hashes(docker_file)
+    monkeypatch.setenv("JUPYTER_LAB_PASSWORD", "other")
+    after = stage_hashes(docker_file)
+    changed = [s.name for s in STAGES if before[s.name] != after[s.name]]
+    assert changed == ["jupyter", "notebook", "docker"]
+
+
+def test_hashes_without_secrets(docker_file, monkeypatch):
+    before = stage_hashes(docker_file, include_secrets=False)
+    monkeypatch.setenv("JUPYTER_LAB_PASSWORD", "other")
+    assert stage_hashes(docker_file, include_secrets=False) == before
+
+
+def test_optimization_levels_change_notebook_hash(docker_file):
+    before = stage_hashes(docker_file)
+    after = stage_hashes(
+        docker_file,
+        extra_vars={"jupyterlab_bytecode_optimization_levels": [0, 1]},
+    )
+    changed = [s.name for s in STAGES if before[s.name] != after[s.name]]
+    assert changed == ["notebook", "docker"]
+
+
+def test_dockerfile_changes_all_hashes(docker_file):
+    before = stage_hashes(docker_file)
+    docker_file.write_text("FROM ubuntu:24.04\n")
+    after = stage_hashes(docker_file)
+    assert all(before[s.name] != after[s.name] for s in STAGES)
+
+
+def docker_client(existing: list[str]):
+    def get(name):
+        if name not in existing:
+            raise docker.errors.ImageNotFound(name)
+        return MagicMock()
+
+    client = MagicMock()
+    client.images.get.side_effect = get
+    return client
+
+
+def test_resume_from_newest_stage(docker_file):
+    stage_images = StageImages(docker_client([]), "org/repo", docker_file)
+    existing = [stage_images.image_name(s) for s in STAGES[:2]]
+    testee = StageImages(docker_client(existing), "org/repo", docker_file)
+    assert testee.resume_point() == (existing[1], STAGES[2:])
+
+
+def test_resume_without_images(docker_file):
+    testee = StageImages(docker_client([]), "org/repo", docker_file)
+    assert testee.resume_point() == (None, STAGES)
+
+
+def test_layered_install_commits_remaining_stages(mocker, docker_file):
+    run = mocker.patch(
+        "exasol.ds.sandbox.lib.dss_docker.create_image.run_install_dependencies",
+        return_value={},
+    )
+    testee = DssDockerImage("org/repo", "1.2.3", layered=True)
+    testee._stage_images = StageImages(docker_client([]), "org/repo", docker_file)
+    testee._remaining_stages = STAGES[2:]
+    container = MagicMock()
+    testee._install_dependencies(container)
+    stages = [c.kwargs["playbook"].vars["build_stages"] for c in run.call_args_list]
+    assert stages == [["notebook"], ["docker"], ["final"]]
+    assert [c.kwargs for c in container.commit.call_args_list] == [
+        {"repository": "org/repo-build-cache", "tag": testee._stage_images.tag(s)}
+        for s in STAGES[2:]
+    ]
+
+
+def test_layered_install_stops_when_cancelled(mocker, docker_file):
+    cancelled = threading.Event()
+    run = mocker.patch(
+        "exasol.ds.sandbox.lib.dss_docker.create_image.run_install_dependencies",
+        side_effect=lambda **kwargs: cancelled.set() or {},
+    )
+    testee = DssDockerImage("org/repo", "1.2.3", layered=True)
+    testee._stage_images = StageImages(docker_client([]), "org/repo", docker_file)
+    testee._remaining_stages = STAGES[2:]
+    testee.cancelled = cancelled
+    with pytest.raises(Cancelled, match="stage docker"):
+        testee._install_dependencies(MagicMock())
+    assert run.call_count == 1
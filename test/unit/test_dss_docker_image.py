@@ -108,12 +108,8 @@ def test_push_called(mocker, mocked_docker_image):
     testee = mocked_docker_image
     testee.registry = create_autospec(DockerRegistry)
     testee.create()
-    assert testee.registry.push.called
-    expected = [
-        mocker.call(testee.repository, testee.version),
-        mocker.call(testee.repository, "latest"),
-    ]
-    assert testee.registry.push.call_args_list == expected
+    testee.registry.push_tags.assert_called_once_with(
+        testee.repository, [testee.version, "latest"])
 
 
 @patch("exasol.ds.sandbox.lib.dss_docker.create_image.run_install_dependencies")
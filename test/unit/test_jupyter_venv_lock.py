@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from exasol.ds.sandbox.lib.setup_ec2 import jupyter_venv_lock as lib
+
+
+@pytest.fixture
+def role_files(tmp_path):
+    (tmp_path / "jupyter_requirements.txt").write_text("jupyterlab >=4,<5\n")
+    (tmp_path / "notebook_requirements.txt").write_text(
+        "--extra-index-url https://example.com/simple\n"
+        "exasol-notebook-connector ==3.0.0\n"
+    )
+    return tmp_path
+
+
+def write_lock(files: Path, requirements: str, hash: str):
+    lock = files / lib.lock_file_name(requirements)
+    lock.write_text(f"# lock file\n{lib.HASH_HEADER}{hash}\nsix==1.0\n")
+
+
+def test_no_lock_files(role_files):
+    assert lib.current_lock_files(role_files) == {}
+
+
+def test_current_lock_files(role_files, caplog):
+    for requirements in lib.LOCKED_REQUIREMENTS:
+        write_lock(role_files, requirements, lib.requirements_hash(requirements, role_files))
+    (role_files / "jupyter_requirements.txt").write_text("jupyterlab >=4.5,<5\n")
+    assert lib.current_lock_files(role_files) == {}
+    assert "Ignoring outdated lock file jupyter_requirements.lock" in caplog.text
+
+
+def test_notebook_lock_depends_on_jupyter_requirements(role_files):
+    before = lib.requirements_hash("notebook_requirements.txt", role_files)
+    (role_files / "jupyter_requirements.txt").write_text("jupyterlab >=4.5,<5\n")
+    assert lib.requirements_hash("notebook_requirements.txt", role_files) != before
+
+
+def test_current_lock_file(role_files):
+    requirements = "jupyter_requirements.txt"
+    write_lock(role_files, requirements, lib.requirements_hash(requirements, role_files))
+    assert lib.current_lock_files(role_files) == {requirements: "jupyter_requirements.lock"}
+
+
+def pip_report(command: list[str], check: bool):
+    report = Path(command[command.index("--report") + 1])
+    report.write_text(json.dumps({"install": [
+        {
+            "metadata": {"name": "six", "version": "1.16.0"},
+            "download_info": {"archive_info": {"hash": "sha256=abc"}},
+        },
+        {
+            "metadata": {"name": "Jinja2", "version": "3.1.4"},
+            "download_info": {"archive_info": {"hashes": {"sha256": "def"}}},
+        },
+    ]}))
+
+
+def test_generate_with_pip(role_files, tmp_path, monkeypatch):
+    monkeypatch.setattr(lib, "role_files", lambda: role_files)
+    monkeypatch.setattr(lib.shutil, "which", lambda name: None)
+    target = tmp_path / "target"
+    target.mkdir()
+    lib.generate_lock_files("1.2.3", target, run=pip_report)
+    lock = (target / "notebook_requirements.lock").read_text()
+    assert lock == (
+        "# Generated by command lock-jupyter-venv for AI Lab 1.2.3\n"
+        f"{lib.HASH_HEADER}{lib.requirements_hash('notebook_requirements.txt', role_files)}\n"
+        "--extra-index-url https://example.com/simple\n"
+        "Jinja2==3.1.4 \\\n"
+        "    --hash=sha256:def\n"
+        "six==1.16.0 \\\n"
+        "    --hash=sha256:abc\n"
+    )
+
+
+def test_generate_with_uv(role_files, tmp_path, monkeypatch):
+    def uv_compile(command: list[str], check: bool):
+        assert command[:3] == ["/bin/uv", "pip", "compile"]
+        output = Path(command[command.index("--output-file") + 1])
+        output.write_text(
+            "--index-url https://pypi.org/simple\n"
+            "six==1.16.0 \\\n"
+            "    --hash=sha256:abc\n"
+        )
+
+    monkeypatch.setattr(lib, "role_files", lambda: role_files)
+    monkeypatch.setattr(lib.shutil, "which", lambda name: "/bin/uv")
+    lib.generate_lock_files("1.2.3", run=uv_compile)
+    assert lib.current_lock_files(role_files) == {
+        r: lib.lock_file_name(r) for r in lib.LOCKED_REQUIREMENTS
+    }
+    lock = (role_files / "jupyter_requirements.lock").read_text()
+    assert lock.endswith("six==1.16.0 \\\n    --hash=sha256:abc\n")
+    assert "--index-url" not in lock
+
+
+def test_ensure_generates_missing_lock_files(role_files, monkeypatch):
+    def generate(ai_lab_version, run):
+        for requirements in lib.LOCKED_REQUIREMENTS:
+            write_lock(
+                role_files, requirements,
+                lib.requirements_hash(requirements, role_files),
+            )
+
+    monkeypatch.setattr(lib, "role_files", lambda: role_files)
+    monkeypatch.setattr(lib, "generate_lock_files", generate)
+    assert lib.ensure_lock_files("1.2.3") == {
+        r: lib.lock_file_name(r) for r in lib.LOCKED_REQUIREMENTS
+    }
+
+
+def test_ensure_keeps_current_lock_files(role_files, monkeypatch):
+    def generate(ai_lab_version, run):
+        raise AssertionError("lock files are current")
+
+    for requirements in lib.LOCKED_REQUIREMENTS:
+        write_lock(role_files, requirements, lib.requirements_hash(requirements, role_files))
+    monkeypatch.setattr(lib, "role_files", lambda: role_files)
+    monkeypatch.setattr(lib, "generate_lock_files", generate)
+    assert len(lib.ensure_lock_files("1.2.3")) == len(lib.LOCKED_REQUIREMENTS)
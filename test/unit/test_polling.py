@@ -0,0 +1,107 @@
+from copy import copy
+
+import pytest
+
+from exasol.ds.sandbox.lib.polling import (
+    Backoff,
+    BackoffConfig,
+    PollingTimeout,
+    poll,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def no_jitter() -> float:
+    return 0.5
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def backoff(clock, **kwargs) -> Backoff:
+    config = BackoffConfig(initial_delay=1, max_delay=10, factor=2, **kwargs)
+    return Backoff(config, clock, rand=no_jitter)
+
+
+def test_exponential_backoff_with_cap(clock):
+    testee = backoff(clock)
+    for _ in range(6):
+        testee.sleep()
+    assert clock.sleeps == [1, 2, 4, 8, 10, 10]
+
+
+def test_progress_resets_delay(clock):
+    testee = backoff(clock)
+    for progressed in (False, False, False, True, False):
+        testee.sleep(progressed)
+    assert clock.sleeps == [1, 2, 4, 1, 2]
+
+
+@pytest.mark.parametrize("rand, expected", [(0.0, 0.9), (1.0, 1.1)])
+def test_jitter(clock, rand, expected):
+    config = BackoffConfig(initial_delay=1, max_delay=10, jitter=0.1)
+    Backoff(config, clock, rand=lambda: rand).sleep()
+    assert clock.sleeps == [pytest.approx(expected)]
+
+
+def test_deadline(clock):
+    testee = backoff(clock, timeout=5)
+    testee.sleep()
+    testee.sleep()
+    # only 2 seconds remaining instead of the delay of 4 seconds
+    testee.sleep()
+    assert clock.sleeps == [1, 2, 2]
+    with pytest.raises(PollingTimeout):
+        testee.sleep()
+
+
+def test_poll_until_condition(clock):
+    results = iter(["pending", "pending", "pending", "done"])
+    pending = []
+    result = poll(
+        lambda: next(results),
+        until=lambda r: r == "done",
+        backoff=backoff(clock),
+        on_pending=pending.append,
+    )
+    assert result == "done"
+    assert pending == ["pending"] * 3
+    assert clock.sleeps == [1, 2, 4]
+
+
+def test_poll_with_progress(clock):
+    results = iter(["10%", "10%", "10%", "50%", "50%", "100%"])
+    poll(
+        lambda: next(results),
+        until=lambda r: r == "100%",
+        backoff=backoff(clock),
+        progress=lambda r: r,
+    )
+    assert clock.sleeps == [1, 2, 4, 1, 2]
+
+
+def test_config_from_configuration(test_config):
+    configuration = copy(test_config)
+    configuration.time_to_wait_for_polling = 60
+    configuration.polling_initial_delay = 5
+    config = BackoffConfig.from_config(configuration)
+    assert (config.initial_delay, config.max_delay) == (5, 60)
+
+
+def test_config_initial_delay_capped(test_config):
+    config = BackoffConfig.from_config(test_config)
+    assert config.initial_delay == config.max_delay == test_config.time_to_wait_for_polling
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 
 from io import StringIO
@@ -5,13 +8,14 @@ from typing import Union
 from unittest.mock import MagicMock, call, create_autospec, Mock
 
 from exasol.ds.sandbox.lib.asset_id import AssetId
+from exasol.ds.sandbox.lib.asset_printing.asset_types import AssetTypeNotFound
 from exasol.ds.sandbox.lib.asset_printing.print_assets import (
     print_with_printer,
     AssetTypes,
-    AssetTypeNotFound,
     print_assets,
 )
 from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
+from exasol.ds.sandbox.lib.aws_access.stack_resource import StackResource
 from test.aws.mock_data import (
     get_ami_image_mock_data,
     TEST_AMI_ID,
@@ -156,6 +160,25 @@ def test_printing_s3_object(
 
 
 
+@pytest.mark.parametrize("filter_value,expected_prefix", [
+    (None, "ai_lab"),
+    ("test", "ai_lab/test"),
+    ("te?t", "ai_lab/te"),
+    ("6.*", "ai_lab/6."),
+    ("*", "ai_lab/"),
+])
+def test_s3_prefix_passed_to_aws(printing_mocks, filter_value, expected_prefix):
+    table_printer_mock, text_printer_mock, printing_factory = printing_mocks
+
+    aws_access_mock: Union[AwsAccess, Mock] = create_autospec(AwsAccess, spec_set=True)
+    mock_cast(aws_access_mock.list_s3_objects).return_value = iter([])
+    mock_cast(aws_access_mock.describe_stacks).return_value = get_s3_cloudformation_mock_data()
+    asset_id = AssetId(filter_value) if filter_value else None
+    print_with_printer(aws_access_mock, asset_id, (AssetTypes.VM_S3,), "*", printing_factory)
+    mock_cast(aws_access_mock.list_s3_objects).assert_called_once_with(
+        bucket=TEST_BUCKET_ID, prefix=expected_prefix)
+
+
 # "test" comes from DEFAULT_ASSET_ID
 filter_for_cloudformation = [
     ("test", True),
@@ -243,6 +266,62 @@ def test_print_docker(default_asset_id):
     assert "docker pull exasol/ai-lab:test" in actual
 
 
+def test_assets_are_fetched_in_parallel(printing_mocks):
+    """
+    Both fetch functions wait for each other at a barrier, which only
+    succeeds if they run concurrently.
+    """
+    table_printer_mock, text_printer_mock, printing_factory = printing_mocks
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_at_barrier(result):
+        def side_effect(**kwargs):
+            barrier.wait()
+            return result
+        return side_effect
+
+    aws_mock = MagicMock()
+    aws_mock.list_amis.side_effect = wait_at_barrier([get_ami_image_mock_data("available")])
+    aws_mock.list_snapshots.side_effect = wait_at_barrier([get_snapshot_mock_data()])
+    print_with_printer(aws_mock, None, (AssetTypes.SNAPSHOT, AssetTypes.AMI), "*", printing_factory)
+
+    titles = [c.kwargs["title"] for c in printing_factory.create_table_printer.call_args_list]
+    assert titles == ["AMI Images (Filter=*)", "EC-2 Snapshots (Filter=*)"]
+
+
+def test_stack_resources_keep_order(printing_mocks):
+    """
+    Stack resources are fetched in parallel, the slowest one first, but
+    rows are printed in the order of the stacks.
+    """
+    table_printer_mock, text_printer_mock, printing_factory = printing_mocks
+    names = ["stack-1", "stack-2", "stack-3"]
+    stacks = []
+    for name in names:
+        stack = get_ec2_cloudformation_mock_data()
+        stack._aws_object["StackName"] = name
+        stacks.append(stack)
+
+    def get_all_stack_resources(stack_name):
+        time.sleep(0.1 * (len(names) - names.index(stack_name)))
+        return [StackResource({
+            "PhysicalResourceId": f"{stack_name}-resource",
+            "ResourceType": "AWS::EC2::Instance",
+        })]
+
+    aws_mock = MagicMock()
+    aws_mock.describe_stacks.return_value = stacks
+    aws_mock.get_all_stack_resources.side_effect = get_all_stack_resources
+    print_with_printer(aws_mock, None, (AssetTypes.CLOUDFORMATION,), "*", printing_factory)
+
+    rows = [c.args[0] or c.args[4] for c in table_printer_mock.add_row.call_args_list]
+    assert rows == [
+        "stack-1", "stack-1-resource",
+        "stack-2", "stack-2-resource",
+        "stack-3", "stack-3-resource",
+    ]
+
+
 def test_asset_type_from_name():
     assert AssetTypes.from_name("docker") == AssetTypes.DOCKER
 
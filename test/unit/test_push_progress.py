@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock
+
+from exasol.ds.sandbox.lib.dss_docker.push_image import (
+    DockerRegistry,
+    PushProgress,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def pushing(layer_id: str, current: int, total: int):
+    return {
+        "status": "Pushing",
+        "id": layer_id,
+        "progressDetail": {"current": current, "total": total},
+    }
+
+
+def test_aggregates_layers():
+    testee = PushProgress("repo:tag", clock=FakeClock(), on_report=MagicMock())
+    testee.update({"status": "The push refers to repository [repo]"})
+    testee.update({"status": "Preparing", "id": "a", "progressDetail": {}})
+    testee.update(pushing("a", 500, 1000))
+    testee.update(pushing("b", 100, 3000))
+    testee.update({"status": "Layer already exists", "id": "c"})
+    assert (testee.current, testee.total) == (600, 4000)
+    testee.update({"status": "Pushed", "id": "a", "progressDetail": {}})
+    assert testee.current == 1100
+
+
+def test_reports_throttled():
+    clock = FakeClock()
+    on_report = MagicMock()
+    testee = PushProgress("repo:tag", interval=5, clock=clock, on_report=on_report)
+    for i in range(1, 11):
+        clock.now = i
+        testee.update(pushing("a", i * 1000, 10000))
+    assert on_report.call_count == 2
+    assert on_report.call_args.args[0] == (
+        "repo:tag: pushed 10 KB of 10 KB at 1 KB/s, ETA 0 seconds"
+    )
+
+
+def test_summary_eta():
+    clock = FakeClock()
+    testee = PushProgress("repo:tag", clock=clock, on_report=MagicMock())
+    clock.now = 2
+    testee.update(pushing("a", 2000, 10000))
+    assert testee.summary().endswith("at 1 KB/s, ETA 8 seconds")
+
+
+def test_final_report():
+    clock = FakeClock()
+    testee = PushProgress("repo:tag", clock=clock, on_report=MagicMock())
+    testee.update(pushing("a", 2000, 2000))
+    testee.update({"status": "Pushed", "id": "a", "progressDetail": {}})
+    testee.update({"status": "Layer already exists", "id": "b"})
+    clock.now = 3
+    assert testee.final_report() == (
+        "Pushed repo:tag in 3 seconds:\n"
+        "- layer a: 2 KB (Pushed)\n"
+        "- layer b: 0 bytes (Layer already exists)\n"
+        "Total: 2 KB"
+    )
+
+
+def test_push_tags_shares_client(mocker):
+    from_env = mocker.patch("docker.from_env")
+    client = from_env.return_value
+    client.images.push.side_effect = lambda **kwargs: iter([
+        pushing("a", 1000, 1000),
+        {"status": "Pushed", "id": "a", "progressDetail": {}},
+    ])
+    testee = DockerRegistry("user", "password")
+    result = testee.push_tags("repo", ["1.0.0", "latest"])
+    assert from_env.call_count == 1
+    assert sorted(c.kwargs["tag"] for c in client.images.push.call_args_list) \
+        == ["1.0.0", "latest"]
+    assert [p.name for p in result] == ["repo:1.0.0", "repo:latest"]
+    assert [p.current for p in result] == [1000, 1000]
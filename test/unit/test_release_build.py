@@ -2,6 +2,8 @@ from unittest.mock import patch
 
 import pytest
 
+from exasol.ds.sandbox.lib.cancellation import check_cancelled
+
 from exasol.ds.sandbox.lib.asset_id import AssetId
 from exasol.ds.sandbox.lib.aws_access.aws_access import AwsAccess
 from exasol.ds.sandbox.lib.dss_docker import DEFAULT_ORG_AND_REPOSITORY
@@ -9,6 +11,15 @@ from exasol.ds.sandbox.lib.release_build.run_release_build import (
     RELEASE_PASSWORD_ENV,
     run_start_release_build,
 )
+from exasol.ds.sandbox.lib.release_build.task_graph import TaskGraphError
+
+
+@pytest.fixture(autouse=True)
+def ensure_lock_files_mock():
+    with patch(
+        "exasol.ds.sandbox.lib.release_build.run_release_build.ensure_lock_files"
+    ) as mock:
+        yield mock
 
 
 @patch("exasol.ds.sandbox.lib.release_build.run_release_build.run_create_vm")
@@ -121,3 +132,66 @@ def test_release_build_publish_requires_registry_credentials(
 
     run_create_vm_mock.assert_not_called()
     dss_docker_image_mock.return_value.create.assert_not_called()
+
+
+@patch("exasol.ds.sandbox.lib.release_build.run_release_build.run_create_vm")
+@patch("exasol.ds.sandbox.lib.release_build.run_release_build.DssDockerImage")
+def test_docker_failure_cancels_vm_build(
+        dss_docker_image_mock,
+        run_create_vm_mock,
+        test_config,
+        monkeypatch,
+):
+    def create_vm(cancelled, **kwargs):
+        cancelled.wait(timeout=5)
+        check_cancelled(cancelled, "export")
+
+    monkeypatch.setenv(RELEASE_PASSWORD_ENV, "release-default-password")
+    run_create_vm_mock.side_effect = create_vm
+    creator = dss_docker_image_mock.return_value
+    creator.create.side_effect = RuntimeError("docker failed")
+    with pytest.raises(TaskGraphError, match="Failed tasks: docker"):
+        run_start_release_build(test_config, AwsAccess(None))
+    assert creator.cancelled is run_create_vm_mock.call_args.kwargs["cancelled"]
+    assert creator.cancelled.is_set()
+
+
+@patch("exasol.ds.sandbox.lib.release_build.run_release_build.run_create_vm")
+@patch("exasol.ds.sandbox.lib.release_build.run_release_build.DssDockerImage")
+def test_release_build_generates_lock_files_first(
+        dss_docker_image_mock,
+        run_create_vm_mock,
+        ensure_lock_files_mock,
+        test_config,
+        monkeypatch,
+):
+    calls = []
+    ensure_lock_files_mock.side_effect = lambda version: calls.append("lock")
+    run_create_vm_mock.side_effect = lambda **kwargs: calls.append("vm")
+    creator = dss_docker_image_mock.return_value
+    creator.create.side_effect = lambda: calls.append("docker")
+    monkeypatch.setenv(RELEASE_PASSWORD_ENV, "release-default-password")
+    run_start_release_build(test_config, AwsAccess(None))
+    ensure_lock_files_mock.assert_called_once_with(test_config.ai_lab_version)
+    assert calls[0] == "lock"
+    assert sorted(calls[1:]) == ["docker", "vm"]
+
+
+@patch("exasol.ds.sandbox.lib.release_build.run_release_build.run_create_vm")
+@patch("exasol.ds.sandbox.lib.release_build.run_release_build.DssDockerImage")
+@patch("exasol.ds.sandbox.lib.release_build.run_release_build.precompile_templates")
+def test_release_build_fails_on_invalid_templates(
+        precompile_templates_mock,
+        dss_docker_image_mock,
+        run_create_vm_mock,
+        ensure_lock_files_mock,
+        test_config,
+        monkeypatch,
+):
+    monkeypatch.setenv(RELEASE_PASSWORD_ENV, "release-default-password")
+    precompile_templates_mock.side_effect = RuntimeError("Invalid templates")
+    with pytest.raises(RuntimeError, match="Invalid templates"):
+        run_start_release_build(test_config, AwsAccess(None))
+    ensure_lock_files_mock.assert_not_called()
+    run_create_vm_mock.assert_not_called()
+    dss_docker_image_mock.return_value.create.assert_not_called()
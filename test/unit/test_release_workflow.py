@@ -46,7 +46,9 @@ def test_load_context_rejects_v_prefixed_tag(monkeypatch):
 
 def test_run_check_routes_by_mode(monkeypatch):
     validate_release = Mock()
+    precompile_templates = Mock()
     monkeypatch.setattr("exasol.ds.sandbox.lib.release_workflow.validate_release", validate_release)
+    monkeypatch.setattr("exasol.ds.sandbox.lib.release_workflow.precompile_templates", precompile_templates)
     manual_context = ReleaseContext(
         mode="workflow_dispatch",
         release_tag="feature-branch",
@@ -72,6 +74,7 @@ def test_run_check_routes_by_mode(monkeypatch):
     run_check(tag_context)
 
     assert validate_release.call_args_list == [call(""), call("6.0.0")]
+    assert precompile_templates.call_count == 2
 
 
 def test_run_build_uses_asset_id(monkeypatch):
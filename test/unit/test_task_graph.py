@@ -0,0 +1,133 @@
+import logging
+import threading
+
+import pytest
+
+from exasol.ds.sandbox.lib.cancellation import check_cancelled
+from exasol.ds.sandbox.lib.release_build.task_graph import (
+    FailurePolicy,
+    Task,
+    TaskGraph,
+    TaskGraphError,
+    TaskStatus,
+)
+
+
+def failing():
+    raise RuntimeError("boom")
+
+
+def statuses(graph: TaskGraph) -> dict[str, TaskStatus]:
+    return {name: r.status for name, r in graph.results.items()}
+
+
+def test_independent_tasks_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    graph = TaskGraph([Task("vm", barrier.wait), Task("docker", barrier.wait)])
+    graph.run()
+    assert statuses(graph) == {
+        "vm": TaskStatus.SUCCEEDED,
+        "docker": TaskStatus.SUCCEEDED,
+    }
+
+
+def test_dependencies_respected():
+    order = []
+    graph = TaskGraph([
+        Task("export", lambda: order.append("export"), depends_on=("ami",)),
+        Task("ami", lambda: order.append("ami")),
+    ])
+    graph.run()
+    assert order == ["ami", "export"]
+
+
+def test_fail_fast():
+    cancelled = threading.Event()
+    started = threading.Event()
+
+    def docker():
+        started.set()
+        cancelled.wait(timeout=5)
+        check_cancelled(cancelled, "push")
+
+    def vm():
+        started.wait(timeout=5)
+        failing()
+
+    graph = TaskGraph(
+        [
+            Task("vm", vm),
+            Task("export", lambda: None, depends_on=("vm",)),
+            Task("docker", docker),
+        ],
+        policy=FailurePolicy.FAIL_FAST,
+        cancelled=cancelled,
+    )
+    with pytest.raises(TaskGraphError, match="Failed tasks: vm") as ex:
+        graph.run()
+    assert str(ex.value.failed["vm"]) == "boom"
+    assert statuses(graph) == {
+        "vm": TaskStatus.FAILED,
+        "export": TaskStatus.SKIPPED,
+        "docker": TaskStatus.CANCELLED,
+    }
+    assert "not started" not in graph.summary()
+
+
+def test_cancelled_by_caller():
+    cancelled = threading.Event()
+    cancelled.set()
+    graph = TaskGraph(
+        [Task("docker", lambda: check_cancelled(cancelled, "push"))],
+        cancelled=cancelled,
+    )
+    with pytest.raises(TaskGraphError, match="Failed tasks: docker"):
+        graph.run()
+    assert statuses(graph) == {"docker": TaskStatus.CANCELLED}
+
+
+def test_fail_late():
+    docker = []
+    graph = TaskGraph(
+        [
+            Task("vm", failing),
+            Task("export", lambda: None, depends_on=("vm",)),
+            Task("docker", lambda: docker.append(True), depends_on=("base",)),
+            Task("base", lambda: None),
+        ],
+        policy=FailurePolicy.FAIL_LATE,
+    )
+    with pytest.raises(TaskGraphError):
+        graph.run()
+    assert docker == [True]
+    assert statuses(graph) == {
+        "vm": TaskStatus.FAILED,
+        "export": TaskStatus.SKIPPED,
+        "base": TaskStatus.SUCCEEDED,
+        "docker": TaskStatus.SUCCEEDED,
+    }
+
+
+def test_unknown_dependency():
+    with pytest.raises(ValueError, match="depends on unknown tasks"):
+        TaskGraph([Task("a", lambda: None, depends_on=("b",))])
+
+
+def test_cyclic_dependencies():
+    graph = TaskGraph([
+        Task("a", lambda: None, depends_on=("b",)),
+        Task("b", lambda: None, depends_on=("a",)),
+    ])
+    with pytest.raises(ValueError, match="Cyclic dependencies"):
+        graph.run()
+
+
+def test_branch_logs_and_summary(caplog):
+    caplog.set_level(logging.INFO)
+    logger = logging.getLogger("ai-lab-docker_image")
+    graph = TaskGraph([Task("docker", lambda: logger.info("pushing"))])
+    graph.run()
+    assert "[docker] pushing" in caplog.messages
+    summary = caplog.messages[-1]
+    assert summary.startswith("Timing summary:\n- docker: succeeded after")
+    assert "Total: " in summary
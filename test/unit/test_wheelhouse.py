@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from exasol.ds.sandbox.lib.dss_docker import wheelhouse
+from exasol.ds.sandbox.lib.dss_docker.create_image import DssDockerImage
+from exasol.ds.sandbox.lib.dss_docker.wheelhouse import (
+    CONTAINER_PATH,
+    REQUIREMENTS,
+    Wheelhouse,
+)
+
+
+@pytest.fixture
+def testee(tmp_path):
+    return Wheelhouse(tmp_path / "wheelhouse")
+
+
+def test_directories(testee):
+    directories = testee.directories()
+    assert list(directories) == list(REQUIREMENTS)
+    assert directories["jupyter_requirements.txt"].startswith("jupyter_requirements-")
+    assert directories == Wheelhouse().directories()
+
+
+def test_directory_changes_with_requirements(testee, mocker):
+    before = testee.directories()
+    content = MagicMock()
+    content.read_bytes.return_value = b"numpy\n"
+    mocker.patch.object(wheelhouse, "_requirements_file", return_value=content)
+    after = testee.directories()
+    assert all(before[r] != after[r] for r in REQUIREMENTS)
+
+
+def test_volumes_and_extra_vars(testee):
+    assert testee.volumes() == {
+        str(testee.path): {"bind": CONTAINER_PATH, "mode": "rw"},
+    }
+    assert testee.path.is_dir()
+    dirs = testee.extra_vars()["pip_wheelhouse"]
+    assert dirs["notebook_requirements.txt"] == \
+        f"{CONTAINER_PATH}/{testee.directories()['notebook_requirements.txt']}"
+
+
+def test_report(testee, caplog):
+    directories = testee.directories()
+    cached = testee.path / directories["jupyter_requirements.txt"]
+    cached.mkdir(parents=True)
+    (cached / "a-1.0-py3-none-any.whl").write_bytes(b"x" * 2000)
+    assert testee.cached() == {"jupyter_requirements.txt"}
+    built = testee.path / directories["notebook_requirements.txt"]
+    built.mkdir()
+    (built / "b-1.0-py3-none-any.whl").write_bytes(b"x" * 1000)
+    testee.report({"jupyter_requirements.txt"})
+    assert "Wheel cache hit for jupyter_requirements.txt:" \
+        " installed 1 wheels, saved downloading 2 KB" in caplog.text
+    assert "Wheel cache miss for notebook_requirements.txt:" \
+        " built 1 wheels with 1 KB" in caplog.text
+
+
+def test_docker_image_uses_wheelhouse(testee, mocker):
+    run = mocker.patch(
+        "exasol.ds.sandbox.lib.dss_docker.create_image.run_install_dependencies",
+        return_value={},
+    )
+    image = DssDockerImage("org/repo", "1.2.3")
+    image.wheelhouse = testee
+    image._install_dependencies(MagicMock())
+    playbook = run.call_args.kwargs["playbook"]
+    assert playbook.vars["pip_wheelhouse"] == testee.extra_vars()["pip_wheelhouse"]